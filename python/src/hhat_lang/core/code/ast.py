@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC
-from typing import Iterable
+from typing import Any, Iterable
 
 
 class AST(ABC):
@@ -12,10 +12,17 @@ class AST(ABC):
 
     All the AST code should inherit from this class, including Node
     and Terminal child classes.
+
+    AST classes use `__slots__` and are compared structurally, i.e. two ASTs
+    are equal if they have the same class, name and value, so they can be
+    used as dictionary keys. The hash is computed once and then cached.
     """
 
+    __slots__ = ("_name", "_value", "_hash")
+
     _name: str
     _value: tuple[str | AST | tuple[AST, ...], ...] | tuple[str]
+    _hash: int
 
     @property
     def name(self) -> str:
@@ -28,14 +35,44 @@ class AST(ABC):
     def __iter__(self) -> Iterable:
         yield from self._value
 
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+
+        if other.__class__ is self.__class__:
+            return hash(self) == hash(other) and (
+                self._name == other._name and self._value == other._value
+            )
+
+        return False
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+
+        except AttributeError:
+            self._hash = hash((self.__class__, self._name, self._value))
+            return self._hash
+
+    def __getstate__(self) -> tuple:
+        # the cached hash is not kept, since `str` hashes change between processes
+        return self._name, self._value
+
+    def __setstate__(self, state: tuple) -> None:
+        self._name, self._value = state
+
 
 class Node(AST):
+    __slots__ = ()
+
     def __repr__(self) -> str:
         res = " ".join(str(k) for k in self.value)
         return f"{self.name}({res})"
 
 
 class Terminal(AST):
+    __slots__ = ()
+
     def __repr__(self) -> str:
         res = f"[{self.name}]" if self.name != self.value[0] else ""
         return f"{self.__class__.__name__}{res}{self.value[0]}"
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator, Type
 from abc import ABC, abstractmethod
 
 from hhat_lang.core import DataParadigm
 from hhat_lang.core.code.utils import InstrStatus
+from hhat_lang.core.data.core import Symbol
 
 
 class BaseInstr(ABC):
@@ -59,3 +60,44 @@ class CInstr(BaseInstr, ABC):
     @property
     def paradigm(self) -> DataParadigm:
         return DataParadigm.CLASSICAL
+
+
+class InstrRegistry:
+    """
+    Instructions supported by a low-level language, by name. Each language
+    keeps its own registry, filled once when its instructions module is
+    imported, by decorating the instruction classes::
+
+        QASM_INSTRS = InstrRegistry()
+
+        @QASM_INSTRS.register
+        class QRedim(QInstr):
+            name = "@redim"
+            ...
+
+    Third-party code can register (or replace) instructions the same way.
+    Each instruction class is instantiated once and reused.
+    """
+
+    __slots__ = ("_instrs",)
+
+    _instrs: dict[str, BaseInstr]
+
+    def __init__(self):
+        self._instrs = dict()
+
+    def register(self, instr: Type[BaseInstr]) -> Type[BaseInstr]:
+        self._instrs[instr.name] = instr()
+        return instr
+
+    def get(self, name: str | Symbol) -> BaseInstr | None:
+        return self._instrs.get(name.value if isinstance(name, Symbol) else name)
+
+    def __contains__(self, name: str | Symbol) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._instrs)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._instrs
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from enum import Enum, auto
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
+from weakref import WeakValueDictionary
 
 ACCEPTABLE_VALUES: dict = {
     "int": (int,),
@@ -34,6 +35,8 @@ class WorkingData:
     or a type name.
     """
 
+    __slots__ = ("_value", "_type", "_is_quantum", "_suppress_type", "__weakref__")
+
     _value: str
     _type: str
     _is_quantum: bool
@@ -136,13 +139,57 @@ class CompositeWorkingData:
 class Symbol(WorkingData):
     """
     It can be a variable, a function, a type, an argument or a parameter name.
+
+    Symbols are interned: creating a symbol with the same value and type as an
+    existing one gives back the same object (`Symbol.intern` does the same).
+    Their hash is computed once and comparing two symbols of the same class
+    and type is an identity check.
     """
 
-    def __init__(self, value: str, symbol_type: str | None = None):
-        self._value = value
-        self._type = symbol_type or "str"
-        self._is_quantum = True if value.startswith("@") else False
-        self._suppress_type = True
+    __slots__ = ("_hash",)
+
+    _hash: int
+
+    _interned: WeakValueDictionary[tuple[type, str, str], Symbol] = WeakValueDictionary()
+
+    def __new__(cls, value: str, symbol_type: str | None = None) -> Symbol:
+        symbol_type = symbol_type or "str"
+
+        if (obj := cls._interned.get((cls, value, symbol_type), None)) is None:
+            obj = super().__new__(cls)
+            obj._value = value
+            obj._type = symbol_type
+            obj._is_quantum = True if value.startswith("@") else False
+            obj._suppress_type = True
+            obj._hash = hash((value, symbol_type))
+            cls._interned[(cls, value, symbol_type)] = obj
+
+        return obj
+
+    @classmethod
+    def intern(cls, value: str, symbol_type: str | None = None) -> Symbol:
+        """Get the unique symbol for the value and type."""
+
+        return cls(value, symbol_type)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+
+        # interned: the same class and type with a different object is a different value
+        if other.__class__ is self.__class__ and other._type == self._type:
+            return False
+
+        return self._op_bitwise("__eq__", other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self._value, self._type)
 
 
 class CompositeSymbol(CompositeWorkingData):
@@ -163,15 +210,75 @@ class Atomic(Symbol):
     An atomic data.
     """
 
-    pass
+    __slots__ = ()
+
+
+def _to_bool(value: str) -> bool:
+    return value == "true"
+
+
+def _to_int_or_str(value: str) -> int | str:
+    try:
+        return int(value)
+
+    except ValueError:
+        return value
+
+
+LITERAL_CAST: dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "u16": int,
+    "u32": int,
+    "u64": int,
+    "float": float,
+    "bool": _to_bool,
+    "char": str,
+    "str": str,
+    "null": lambda x: None,
+}
+"""Python value of a literal for each type; quantum types use their classical counterpart"""
+
+SMALL_LITERAL_LEN = 6
+"""maximum literal value length to be kept on the shared small literals cache"""
+
+SMALL_LITERAL_CACHE_SIZE = 4096
+
+
+def literal_qsize(lit_type: str) -> int | None:
+    """
+    Number of qubits of a built-in quantum literal type, i.e. its `QSize`
+    minimum: `@bool` has 1 and `@uN` has N. Other types have no fixed size.
+    """
+
+    if lit_type == "@bool":
+        return 1
+
+    if lit_type.startswith("@u") and lit_type[2:].isdigit():
+        return int(lit_type[2:])
+
+    return None
 
 
 class CoreLiteral(WorkingData):
     """
     Any defined literal by the dialect.
+
+    Literals are immutable, so literals with short values are shared through a
+    cache. The typed Python value (`py_value`) and the bit form (`bin`) are
+    only computed when first used.
     """
 
-    def __init__(self, value: str, lit_type: str):
+    __slots__ = ("_py_value", "_bin_form")
+
+    _py_value: Any
+    _bin_form: str
+
+    _small: dict[tuple[str, str], CoreLiteral] = dict()
+
+    def __new__(cls, value: str, lit_type: str) -> CoreLiteral:
+        if (obj := cls._small.get((value, lit_type), None)) is not None:
+            return obj
+
         if (value.startswith("@") and not lit_type.startswith("@")) or (
             not value.startswith("@") and lit_type.startswith("@")
         ):
@@ -179,19 +286,60 @@ class CoreLiteral(WorkingData):
                 f"Literal got incompatible {value} value and type {lit_type}."
             )
 
-        self._value = value
-        self._type = lit_type
-        self._is_quantum = True if lit_type.startswith("@") else False
-        self._suppress_type = False
-        self._bin_form = bin(int(value.strip("@")))[2:]
+        obj = super().__new__(cls)
+        obj._value = value
+        obj._type = lit_type
+        obj._is_quantum = True if lit_type.startswith("@") else False
+        obj._suppress_type = False
+
+        if len(value) <= SMALL_LITERAL_LEN and len(cls._small) < SMALL_LITERAL_CACHE_SIZE:
+            cls._small[(value, lit_type)] = obj
+
+        return obj
 
     @property
     def value(self) -> str:
         return self._value
 
+    @property
+    def py_value(self) -> Any:
+        """The literal value as a Python object, e.g. `int` for `u64` literals."""
+
+        try:
+            return self._py_value
+
+        except AttributeError:
+            cast_fn = LITERAL_CAST.get(self._type.lstrip("@"), _to_int_or_str)
+            self._py_value = cast_fn(self._value.lstrip("@"))
+            return self._py_value
+
     @property
     def bin(self) -> str:
-        return self._bin_form
+        """
+        Bit form of the literal, most significant bit first, padded to the
+        type's quantum size when it has one.
+        """
+
+        try:
+            return self._bin_form
+
+        except AttributeError:
+            value = int(self.py_value)
+            size = literal_qsize(self._type) or value.bit_length() + (value < 0)
+            self._bin_form = format(value & ((1 << size) - 1), f"0{size}b") if size else "0"
+            return self._bin_form
+
+    def _op_bitwise(self, op: str, other: Any) -> bool:
+        if isinstance(other, self.__class__):
+            return getattr(self.value, op)(other.value)
+
+        if isinstance(other, ACCEPTABLE_VALUES.get(self._type, InvalidType)):
+            return getattr(self.py_value, op)(other)
+
+        return False
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self._value, self._type)
 
 
 class CompositeLiteral(CompositeWorkingData):
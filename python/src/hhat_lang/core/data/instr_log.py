@@ -0,0 +1,158 @@
+"""
+Append-only log of quantum data instructions.
+
+Quantum variables do not hold values, but the sequence of instructions (literals,
+instructions calls, other quantum variables) applied to them until a cast
+consumes them. `QInstrLog` keeps that sequence as compact arrays:
+
+- opcodes: one entry per appended item, indexing the table of distinct items
+- operands: the flattened operand indexes of all the entries, delimited by offsets
+
+Entries are never changed once appended, so a snapshot only needs to remember
+the log length; it shares the arrays with its log until it is appended to.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterable, Iterator
+
+
+class QInstrLog:
+    """Append-only instruction log for quantum data."""
+
+    __slots__ = ("_table", "_lookup", "_opcodes", "_operands", "_offsets", "_len", "_owner")
+
+    _table: list[Any]
+    """distinct items appended to the log; opcodes are positions in it"""
+
+    _lookup: dict[Any, int]
+    """item -> opcode, for hashable items"""
+
+    _opcodes: array
+    _operands: array
+    _offsets: array
+    """`_offsets[n]` and `_offsets[n + 1]` delimit entry `n` operands"""
+
+    _len: int
+    _owner: bool
+    """whether the arrays belong to this log, or are shared by a snapshot"""
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._table = []
+        self._lookup = {}
+        self._opcodes = array("I")
+        self._operands = array("I")
+        self._offsets = array("I", (0,))
+        self._len = 0
+        self._owner = True
+
+        for item in items:
+            self.append(item)
+
+    def _opcode(self, item: Any) -> int:
+        try:
+            return self._lookup[item]
+
+        except KeyError:
+            code = self._lookup[item] = len(self._table)
+
+        # unhashable items are not deduplicated
+        except TypeError:
+            code = len(self._table)
+
+        self._table.append(item)
+        return code
+
+    def _detach(self) -> None:
+        """Own a copy of the arrays, before appending to a snapshot."""
+
+        n = self._len
+        self._opcodes = self._opcodes[:n]
+        self._offsets = self._offsets[: n + 1]
+        self._operands = self._operands[: self._offsets[n]]
+        self._table = self._table[: max(self._opcodes, default=-1) + 1]
+        self._lookup = {
+            k: v for k, v in self._lookup.items() if v < len(self._table)
+        }
+        self._owner = True
+
+    def append(self, item: Any, operands: Iterable[int] = ()) -> int:
+        """
+        Append an item to the log in O(1).
+
+        Args:
+            item: literal, instruction or variable applied to the quantum data
+            operands: the quantum data indexes (relative to the variable) the item
+                acts on; empty means all of them
+
+        Returns:
+            The entry position in the log.
+        """
+
+        if not self._owner:
+            self._detach()
+
+        self._opcodes.append(self._opcode(item))
+        self._operands.extend(operands)
+        self._offsets.append(len(self._operands))
+        self._len += 1
+        return self._len - 1
+
+    def snapshot(self) -> QInstrLog:
+        """A read-only view of the log at this point, in O(1)."""
+
+        log = QInstrLog.__new__(QInstrLog)
+        log._table = self._table
+        log._lookup = self._lookup
+        log._opcodes = self._opcodes
+        log._operands = self._operands
+        log._offsets = self._offsets
+        log._len = self._len
+        log._owner = False
+        return log
+
+    copy = snapshot
+
+    def operands(self, n: int) -> tuple[int, ...]:
+        """Operand indexes of entry `n`."""
+
+        if not 0 <= n < self._len:
+            raise IndexError(n)
+
+        return tuple(self._operands[self._offsets[n] : self._offsets[n + 1]])
+
+    def stream(self, start: int = 0) -> Iterator[tuple[Any, tuple[int, ...]]]:
+        """Yield each entry as `(item, operands)`, from entry `start` onwards."""
+
+        table, opcodes, operands, offsets = self._table, self._opcodes, self._operands, self._offsets
+
+        for n in range(start, self._len):
+            yield table[opcodes[n]], tuple(operands[offsets[n] : offsets[n + 1]])
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, n: int) -> Any:
+        if not -self._len <= n < self._len:
+            raise IndexError(n)
+
+        return self._table[self._opcodes[n % self._len]]
+
+    def __iter__(self) -> Iterator[Any]:
+        table, opcodes = self._table, self._opcodes
+
+        for n in range(self._len):
+            yield table[opcodes[n]]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, QInstrLog):
+            return list(self.stream()) == list(other.stream())
+
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{list(self)}"
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from copy import copy
 from typing import Any, Iterable
 
 from hhat_lang.core.data.core import WorkingData, Symbol
+from hhat_lang.core.data.instr_log import QInstrLog
 from hhat_lang.core.data.utils import isquantum, VariableKind
 from hhat_lang.core.error_handlers.errors import (
     ContainerVarError,
@@ -13,24 +16,105 @@ from hhat_lang.core.error_handlers.errors import (
     VariableFreeingBorrowedError,
     VariableWrongMemberError,
 )
-from hhat_lang.core.utils import SymbolOrdered
+from hhat_lang.core.utils import FrozenSymbolOrdered, SymbolOrdered
+
+
+class DataLayout:
+    """
+    Members layout of a data structure, computed once per type. Containers
+    store member values in a fixed-size list, at each member's position
+    in the layout.
+    """
+
+    __slots__ = ("ds", "members", "index")
+
+    ds: FrozenSymbolOrdered
+    """ds: data from data structure, e.g. member types and names"""
+
+    members: tuple[Symbol, ...]
+    index: dict[Symbol, int]
+
+    def __init__(self, ds: Mapping):
+        self.ds = FrozenSymbolOrdered(ds)
+        self.members = tuple(self.ds)
+        self.index = {k: n for n, k in enumerate(self.members)}
+
+    @classmethod
+    def from_ds(cls, ds: DataLayout | Mapping) -> DataLayout:
+        return ds if isinstance(ds, DataLayout) else cls(ds)
+
+    def position(self, member: str | Symbol) -> int | None:
+        """member position in the layout, or `None` if it is not a member"""
+
+        return self.index.get(self.ds.symbol(member) if member.__class__ is str else member)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+
+class SharedData:
+    """
+    Data storage shared by data containers that borrow it. `refs` counts the
+    containers using it; a container copies it before changing it if it is
+    shared (copy-on-write). `None` marks a member without value.
+    """
+
+    __slots__ = ("values", "refs")
+
+    values: list[Any]
+    refs: int
+
+    def __init__(self, values: list[Any]):
+        self.values = values
+        self.refs = 1
+
+    @classmethod
+    def empty(cls, size: int) -> SharedData:
+        return cls([None] * size)
+
+    def copy(self) -> SharedData:
+        # quantum and array data are appended in place, so they are copied too;
+        # instruction logs copies are O(1) snapshots
+        return SharedData(
+            [v.copy() if isinstance(v, (list, QInstrLog)) else v for v in self.values]
+        )
 
 
 class BaseDataContainer(ABC):
-    """Data container for constant and variables definitions."""
+    """
+    Data container for constant and variables definitions.
+
+    Borrowing or transferring a container to another one (e.g. a function
+    argument) does not copy its data: both containers share it until one of
+    them changes it.
+    """
+
+    __slots__ = (
+        "_name",
+        "_type",
+        "_layout",
+        "_shared",
+        "_assigned",
+        "_is_quantum",
+        "_instr_counter",
+        "_transferred",
+        "_borrowed",
+        "_borrows",
+        "_lender",
+    )
 
     _name: Symbol
     _type: Symbol
-    _ds: SymbolOrdered
-    """_ds: data from data structure, e.g. member types and names"""
+    _layout: DataLayout
+    """_layout: members layout from the data structure, shared by all its containers"""
 
-    _data: SymbolOrdered
-    """_data: where data will actually be stored"""
+    _shared: SharedData
+    """_shared: where data will actually be stored, indexed by member position"""
 
     _assigned: bool
-    _is_constant: bool
-    _is_mutable: bool
-    _is_appendable: bool
+    _is_constant: bool = False
+    _is_mutable: bool = False
+    _is_appendable: bool = False
     _is_quantum: bool
 
     _instr_counter: int
@@ -48,6 +132,41 @@ class BaseDataContainer(ABC):
     _borrowed: bool
     """if the data is borrowed somewhere else"""
 
+    _borrows: int
+    """number of containers currently borrowing this container's data"""
+
+    _lender: BaseDataContainer | None
+    """the container this one borrowed the data from, if any"""
+
+    def _init_container(
+        self,
+        var_name: Symbol,
+        type_name: Symbol,
+        type_ds: DataLayout | SymbolOrdered,
+        is_quantum: bool = False,
+    ) -> None:
+        self._name = var_name
+        self._type = type_name
+        self._layout = DataLayout.from_ds(type_ds)
+        self._shared = SharedData.empty(len(self._layout))
+        self._assigned = False
+        self._is_quantum = is_quantum
+
+        self._transferred = False
+        self._borrowed = False
+        self._borrows = 0
+        self._lender = None
+
+        self._instr_counter = 0
+
+    @property
+    def _ds(self) -> SymbolOrdered:
+        return self._layout.ds
+
+    @property
+    def _data(self) -> list[Any]:
+        return self._shared.values
+
     @property
     def name(self) -> Symbol:
         """name of the variable"""
@@ -80,11 +199,13 @@ class BaseDataContainer(ABC):
 
     @property
     def data(self) -> SymbolOrdered:
-        return self._data
+        """the members with value, by name"""
+
+        return SymbolOrdered(self)
 
     @property
     def value(self) -> SymbolOrdered:
-        return self._data
+        return self.data
 
     @property
     def counter(self) -> int:
@@ -96,6 +217,18 @@ class BaseDataContainer(ABC):
 
         return self._instr_counter
 
+    @property
+    def is_shared(self) -> bool:
+        """whether the data is shared with other containers"""
+        return self._shared.refs > 1
+
+    def _own_data(self) -> None:
+        """Copy the data if it is shared, before changing it (copy-on-write)."""
+
+        if self._shared.refs > 1:
+            self._shared.refs -= 1
+            self._shared = self._shared.copy()
+
     @classmethod
     def _check_array_prop(cls, data: Any):
         """
@@ -108,11 +241,22 @@ class BaseDataContainer(ABC):
 
         return False
 
+    def _append_member(self, pos: int, value: Any, is_quantum: bool) -> None:
+        """
+        Append value to the member at `pos`: an instruction log for quantum
+        data, a list for array data structures.
+        """
+
+        if (values := self._data[pos]) is None:
+            values = self._data[pos] = QInstrLog() if is_quantum else []
+
+        values.append(value)
+        self._instr_counter += 1
+
     def _check_assign_ds_vals(
         self,
         data: Any,
-        attr_type: Symbol,
-        # tmp_container: SymbolOrdered
+        pos: int,
     ) -> bool:
         """
         Check data structure when passing values only (equivalent to `fn(*args)`) and
@@ -121,32 +265,24 @@ class BaseDataContainer(ABC):
 
         Args:
             - data: literal, data structure or variable to be added to the variable data.
-            - attr_type: The symbol that contains the type as attribute for the container.
+            - pos: The member position in the container's layout, the member name
+              being the type as attribute for the container.
 
         Returns:
             False if there is no attribute type. Otherwise, true.
         """
 
-        if data.type == attr_type:
+        if data.type == self._layout.members[pos]:
+            self._own_data()
 
             # is quantum or array data structure
             if data.is_quantum or self._check_array_prop(data):
 
-                if attr_type in self._ds:
-
-                    if attr_type in self._data:
-                        self._data[attr_type].append(data)
-
-                    else:
-                        self._data[attr_type] = [data]
-
-                    self._instr_counter += 1
-                    return True
-
-                return False
+                self._append_member(pos, data, data.is_quantum)
+                return True
 
             # not quantum
-            self._data[attr_type] = data
+            self._data[pos] = data
             return True
 
         return False
@@ -155,7 +291,6 @@ class BaseDataContainer(ABC):
         self,
         key: Symbol,
         value: Any,
-        # tmp_container: SymbolOrdered
     ) -> bool:
         """
         Check data structure when passing args and values, (equivalent to `fn(**args)`).
@@ -164,31 +299,33 @@ class BaseDataContainer(ABC):
         Args:
             - key: Symbol
             - value: literal, data structure or another variable to be added to the variable data.
-            - tmp_container: SymbolOrdered (temporary container)
         """
 
-        if key in self._ds:
+        if (pos := self._layout.position(key)) is not None:
+            self._own_data()
 
             # is quantum or array data structure
             if key.is_quantum or self._check_array_prop(value):
 
-                if key in self._data:
-                    self._data[key].append(value)
-
-                else:
-                    self._data[key] = [value]
-
-                self._instr_counter += 1
+                self._append_member(pos, value, key.is_quantum)
                 return True
 
             # not quantum
-            self._data[key] = value
+            self._data[pos] = value
 
             return True
 
         # key not in variable's attribute list
         return False
 
+    def _get_member(self, member: str | Symbol | None) -> Any | ErrorHandler:
+        pos = 0 if member is None else self._layout.position(member)
+
+        if pos is not None and (value := self._data[pos]) is not None:
+            return value
+
+        return VariableWrongMemberError(self.name)
+
     @abstractmethod
     def assign(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
         ...
@@ -205,15 +342,50 @@ class BaseDataContainer(ABC):
         return self.assign(*args, **kwargs)
 
     def __iter__(self) -> Iterable:
-        yield from self._data.items()
+        for member, value in zip(self._layout.members, self._data):
 
-    @abstractmethod
-    def borrow(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        ...
+            if value is not None:
+                yield member, value
 
-    @abstractmethod
-    def transfer(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        ...
+    def borrow(self, var_name: Symbol | None = None) -> BaseDataContainer | ErrorHandler:
+        """
+        Borrow the container's data into a new container named `var_name`, e.g.
+        a function argument. The data is shared, not copied, until one of the
+        containers changes it.
+        """
+
+        if self._transferred:
+            return ContainerVarError(self.name)
+
+        container = copy(self)
+        container._name = self._name if var_name is None else var_name
+        container._lender = self
+        container._borrows = 0
+        container._borrowed = False
+        self._shared.refs += 1
+        self._borrows += 1
+        self._borrowed = True
+        return container
+
+    def transfer(self, var_name: Symbol | None = None) -> BaseDataContainer | ErrorHandler:
+        """
+        Transfer the container's data to a new container named `var_name`, e.g.
+        a function returning it. The data is moved, not copied, and this
+        container is left without data.
+        """
+
+        if self._transferred:
+            return ContainerVarError(self.name)
+
+        if self._borrowed:
+            return VariableFreeingBorrowedError(self.name)
+
+        container = copy(self)
+        container._name = self._name if var_name is None else var_name
+        self._shared = SharedData.empty(len(self._layout))
+        self._lender = None
+        self._transferred = True
+        return container
 
     def free(self) -> None | ErrorHandler:
         """Freeing the container (program going out of container's scope)."""
@@ -222,7 +394,13 @@ class BaseDataContainer(ABC):
         if self._borrowed:
             return VariableFreeingBorrowedError(self.name)
 
-        del self
+        if (lender := self._lender) is not None:
+            lender._borrows -= 1
+            lender._borrowed = lender._borrows > 0
+            self._lender = None
+
+        self._shared.refs -= 1
+        self._shared = SharedData.empty(len(self._layout))
         return None
 
 
@@ -236,7 +414,7 @@ class VariableTemplate:
         cls,
         var_name: Symbol,
         type_name: Symbol,
-        type_ds: SymbolOrdered,
+        type_ds: DataLayout | SymbolOrdered,
         flag: VariableKind = VariableKind.IMMUTABLE,
     ) -> BaseDataContainer | ErrorHandler:
 
@@ -269,55 +447,25 @@ class VariableTemplate:
 
 
 class ConstantData(BaseDataContainer):
-    def __init__(self, var_name: Symbol, type_name: Symbol, type_ds: SymbolOrdered):
-        self._name = var_name
-        self._type = type_name
-        self._ds = type_ds
-        self._data = SymbolOrdered()
-        self._assigned = False
-        self._is_constant = True
-        self._is_mutable = False
-        self._is_appendable = False
-        self._is_quantum = False
+    __slots__ = ()
 
-        self._transferred = False
-        self._borrowed = False
+    _is_constant = True
 
-        self._instr_counter = 0
+    def __init__(self, var_name: Symbol, type_name: Symbol, type_ds: DataLayout | SymbolOrdered):
+        self._init_container(var_name, type_name, type_ds)
 
     def assign(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
         raise NotImplementedError()
 
     def get(self, member: Symbol | None = None) -> Any | ErrorHandler:
-        member = next(iter(self._ds.keys())) if member is None else member
-
-        if member in self._data:
-            return self._data[member]
-
-        return VariableWrongMemberError(self.name)
-
-    def borrow(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
-
-    def transfer(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
+        return self._get_member(member)
 
 
 class ImmutableVariable(BaseDataContainer):
-    def __init__(self, var_name: Symbol, type_name: Symbol, type_ds: SymbolOrdered):
-        self._name = var_name
-        self._type = type_name
-        self._ds = type_ds
-        self._data = SymbolOrdered()
-        self._assigned = False
-        self._is_constant = False
-        self._is_mutable = False
-        self._is_quantum = False
+    __slots__ = ()
 
-        self._transferred = False
-        self._borrowed = False
-
-        self._instr_counter = 0
+    def __init__(self, var_name: Symbol, type_name: Symbol, type_ds: DataLayout | SymbolOrdered):
+        self._init_container(var_name, type_name, type_ds)
 
     def assign(
         self,
@@ -327,14 +475,14 @@ class ImmutableVariable(BaseDataContainer):
 
         if not self._assigned:
 
-            if len(args) == len(self._ds):
+            if len(args) == len(self._layout):
 
-                for k, d in zip(args, self._ds):
+                for n, k in enumerate(args):
 
-                    if not self._check_assign_ds_vals(k, d):
+                    if not self._check_assign_ds_vals(k, n):
                         return ContainerVarError(self.name)
 
-            elif len(kwargs) == len(self._ds):
+            elif len(kwargs) == len(self._layout):
 
                 for k, v in kwargs.items():
 
@@ -347,53 +495,34 @@ class ImmutableVariable(BaseDataContainer):
         return ContainerVarIsImmutableError(self.name)
 
     def get(self, member: Symbol | None = None) -> Any | ErrorHandler:
-        member = next(iter(self._ds.keys())) if member is None else member
-
-        if member in self._data:
-            return self._data[member]
+        return self._get_member(member)
 
-        return VariableWrongMemberError(self.name)
 
-    def borrow(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
-
-    def transfer(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
+class MutableVariable(BaseDataContainer):
+    __slots__ = ()
 
+    _is_mutable = True
 
-class MutableVariable(BaseDataContainer):
     def __init__(
         self,
         var_name: Symbol,
         type_name: Symbol,
-        type_ds: SymbolOrdered,
+        type_ds: DataLayout | SymbolOrdered,
     ):
-        self._name = var_name
-        self._type = type_name
-        self._ds = type_ds
-        self._data = SymbolOrdered()
-        self._assigned = False
-        self._is_constant = False
-        self._is_mutable = True
-        self._is_quantum = False
-
-        self._transferred = False
-        self._borrowed = False
-
-        self._instr_counter = 0
+        self._init_container(var_name, type_name, type_ds)
 
     def assign(
         self, *args: Any, **kwargs: dict[WorkingData, WorkingData | BaseDataContainer]
     ) -> None | ErrorHandler:
 
-        if len(args) == len(self._ds):
+        if len(args) == len(self._layout):
 
-            for k, d in zip(args, self._ds):
+            for n, k in enumerate(args):
 
-                if not self._check_assign_ds_vals(k, d):
+                if not self._check_assign_ds_vals(k, n):
                     return ContainerVarError(self.name)
 
-        elif len(kwargs) == len(self._ds):
+        elif len(kwargs) == len(self._layout):
 
             for k, v in kwargs.items():
 
@@ -404,41 +533,23 @@ class MutableVariable(BaseDataContainer):
         return None
 
     def get(self, member: Symbol | None = None) -> Any | ErrorHandler:
-        member = next(iter(self._ds.keys())) if member is None else member
+        return self._get_member(member)
 
-        if member in self._data:
-            return self._data[member]
-
-        return VariableWrongMemberError(self.name)
 
-    def borrow(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
-
-    def transfer(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
+class AppendableVariable(BaseDataContainer):
+    __slots__ = ()
 
+    _is_mutable = True
+    _is_appendable = True
 
-class AppendableVariable(BaseDataContainer):
     def __init__(
         self,
         var_name: Symbol,
         type_name: Symbol,
-        type_ds: SymbolOrdered,
+        type_ds: DataLayout | SymbolOrdered,
         is_quantum: bool,
     ):
-        self._name = var_name
-        self._type = type_name
-        self._ds = type_ds
-        self._data = SymbolOrdered()
-        self._assigned = False
-        self._is_constant = False
-        self._is_mutable = True
-        self._is_quantum = is_quantum
-
-        self._transferred = False
-        self._borrowed = False
-
-        self._instr_counter = 0
+        self._init_container(var_name, type_name, type_ds, is_quantum)
 
     def assign(
         self,
@@ -446,14 +557,14 @@ class AppendableVariable(BaseDataContainer):
         **kwargs: SymbolOrdered[WorkingData, WorkingData | BaseDataContainer],
     ) -> None | ErrorHandler:
 
-        if len(args) == len(self._ds):
+        if len(args) == len(self._layout):
 
-            for k, d in zip(args, self._ds):
+            for n, k in enumerate(args):
 
-                if not self._check_assign_ds_vals(k, d):
+                if not self._check_assign_ds_vals(k, n):
                     return ContainerVarError(self.name)
 
-        elif len(kwargs) == len(self._ds):
+        elif len(kwargs) == len(self._layout):
 
             for k, v in kwargs.items():
 
@@ -464,15 +575,4 @@ class AppendableVariable(BaseDataContainer):
         return None
 
     def get(self, member: Symbol | None = None) -> Any | ErrorHandler:
-        member = next(iter(self._ds.keys())) if member is None else member
-
-        if member in self._data:
-            return self._data[member]
-
-        return VariableWrongMemberError(self.name)
-
-    def borrow(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
-
-    def transfer(self, *args: Any, **kwargs: Any) -> None | ErrorHandler:
-        raise NotImplementedError()
+        return self._get_member(member)
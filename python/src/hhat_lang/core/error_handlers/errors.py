@@ -42,6 +42,9 @@ class ErrorCodes(Enum):
     INSTR_NOTFOUND_ERROR = auto()
     INSTR_STATUS_ERROR = auto()
 
+    IMPORT_NOT_FOUND_ERROR = auto()
+    IMPORT_CYCLE_ERROR = auto()
+
 
 class ErrorHandler(ABC):
     def __init__(self, error_code: ErrorCodes):
@@ -346,3 +349,27 @@ class InstrStatusError(ErrorHandler):
         return (
             f"[[{self.__class__.__name__}]]: instr {self._name} has status error"
         )
+
+
+class ImportNotFoundError(ErrorHandler):
+    def __init__(self, name: str | tuple[str, ...], importer: str | None = None):
+        super().__init__(ErrorCodes.IMPORT_NOT_FOUND_ERROR)
+        self._name = name if isinstance(name, str) else ".".join(name)
+        self._importer = importer
+
+    def __call__(self) -> str:
+        importer = f" (imported by '{self._importer}')" if self._importer else ""
+        return (
+            f"[[{self.__class__.__name__}]]: import '{self._name}' not found{importer}."
+        )
+
+
+class ImportCycleError(ErrorHandler):
+    def __init__(self, cycle: tuple[str, ...]):
+        super().__init__(ErrorCodes.IMPORT_CYCLE_ERROR)
+        self._cycle = cycle
+
+    def __call__(self) -> str:
+        return (
+            f"[[{self.__class__.__name__}]]: import cycle found: {' -> '.join(self._cycle)}."
+        )
@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Any
 
+from hhat_lang.core.code.instructions import InstrRegistry
 from hhat_lang.core.data.core import WorkingData
 from hhat_lang.core.execution.abstract_base import BaseEvaluator
 from hhat_lang.core.memory.core import IndexManager
@@ -20,6 +21,8 @@ class BaseLowLevelQLang(ABC):
     _code: IRBlock
     _idx: IndexManager
     _executor: BaseEvaluator
+    _instrs: InstrRegistry
+    """the instructions supported by the language, see `InstrRegistry`"""
 
     def __init__(
         self,
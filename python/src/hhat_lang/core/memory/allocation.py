@@ -0,0 +1,348 @@
+"""
+Index (qubit) allocation for `IndexManager`: the `IndexSet` bitset that holds
+the indexes, and the strategies that choose which free indexes a variable gets.
+
+A strategy only picks indexes; the `IndexManager` keeps the bookkeeping. Use
+`ContiguousBlock` or `BestFit` to keep a variable's indexes next to each other,
+or `CouplingMapStrategy` to follow the device connectivity, so the backend
+transpiler needs fewer SWAPs. The indexes only reach the transpiler as the
+initial layout of a backend with the same coupling map, e.g. a `QiskitSession`
+given the strategy `edges` as the simulator `coupling_map`.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+class IndexSet:
+    """
+    Set of indexes stored as an integer bitset, where bit `k` set means index
+    `k` is in the set. Taking the lowest indexes and putting indexes back are
+    bitwise operations, and the size is kept as a counter.
+    """
+
+    _bits: int
+    _count: int
+
+    def __init__(self, bits: int = 0):
+        self._bits = bits
+        self._count = bits.bit_count()
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    @staticmethod
+    def mask(idxs: Iterable[int]) -> int:
+        """Bitset with the given indexes."""
+
+        res = 0
+
+        for k in idxs:
+            res |= 1 << k
+
+        return res
+
+    @staticmethod
+    def range_mask(start: int, num: int) -> int:
+        """Bitset with `num` indexes from `start` on."""
+
+        return ((1 << num) - 1) << start
+
+    def runs(self, num: int) -> int:
+        """Bitset of the indexes that start a run of `num` contiguous indexes in the set."""
+
+        res, size = self._bits, 1
+
+        while size < num and res:
+            shift = min(size, num - size)
+            res &= res >> shift
+            size += shift
+
+        return res if num > 0 else 0
+
+    def largest_run(self) -> int:
+        """Size of the largest run of contiguous indexes in the set."""
+
+        res, bits = 0, self._bits
+
+        while bits:
+            bits &= bits >> 1
+            res += 1
+
+        return res
+
+    def ranges(self) -> Iterator[tuple[int, int]]:
+        """Start and size of each run of contiguous indexes in the set, lowest first."""
+
+        bits = self._bits
+
+        while bits:
+            start = (bits & -bits).bit_length() - 1
+            rest = ~(bits >> start)
+            size = (rest & -rest).bit_length() - 1
+            yield start, size
+            bits &= ~IndexSet.range_mask(start, size)
+
+    def lowest(self, num: int) -> tuple[int, ...]:
+        """The `num` lowest indexes of the set."""
+
+        res = []
+        bits = self._bits
+
+        while bits and len(res) < num:
+            low = bits & -bits
+            res.append(low.bit_length() - 1)
+            bits ^= low
+
+        return tuple(res)
+
+    def add_mask(self, mask: int) -> None:
+        new = mask & ~self._bits
+        self._bits |= new
+        self._count += new.bit_count()
+
+    def remove_mask(self, mask: int) -> None:
+        old = mask & self._bits
+        self._bits ^= old
+        self._count -= old.bit_count()
+
+    def __contains__(self, idx: int) -> bool:
+        return bool(self._bits >> idx & 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        bits = self._bits
+
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def __repr__(self) -> str:
+        return f"IndexSet({list(self)})"
+
+
+class AllocationStrategy(ABC):
+    """
+    Chooses which of the available indexes are given to a new allocation.
+    """
+
+    @abstractmethod
+    def select(self, available: IndexSet, num_idxs: int) -> tuple[int, ...] | None:
+        """
+        Pick `num_idxs` indexes from `available`, or `None` if the strategy
+        cannot fit them.
+        """
+
+        ...
+
+    def max_fit(self, available: IndexSet) -> int:
+        """Largest number of indexes the strategy can currently allocate at once."""
+
+        return len(available)
+
+
+class LowestFirst(AllocationStrategy):
+    """Lowest available indexes, contiguous or not."""
+
+    def select(self, available: IndexSet, num_idxs: int) -> tuple[int, ...] | None:
+        if len(available) < num_idxs:
+            return None
+
+        return available.lowest(num_idxs)
+
+
+class ContiguousBlock(AllocationStrategy):
+    """First (lowest) range of contiguous indexes that fits the allocation."""
+
+    def select(self, available: IndexSet, num_idxs: int) -> tuple[int, ...] | None:
+        if not (runs := available.runs(num_idxs)):
+            return None
+
+        start = (runs & -runs).bit_length() - 1
+        return tuple(range(start, start + num_idxs))
+
+    def max_fit(self, available: IndexSet) -> int:
+        return available.largest_run()
+
+
+class BestFit(ContiguousBlock):
+    """
+    Smallest range of contiguous indexes that fits the allocation, leaving the
+    larger ranges for larger variables.
+    """
+
+    def select(self, available: IndexSet, num_idxs: int) -> tuple[int, ...] | None:
+        best: tuple[int, int] | None = None
+
+        for start, size in available.ranges():
+            if size >= num_idxs and (best is None or size < best[1]):
+                best = (start, size)
+
+                if size == num_idxs:
+                    break
+
+        if best is None:
+            return None
+
+        return tuple(range(best[0], best[0] + num_idxs))
+
+
+class CouplingMapStrategy(AllocationStrategy):
+    """
+    Connected indexes on the device coupling map, i.e. qubits linked by
+    two-qubit gates, preferring the most tightly linked group. When no connected
+    group fits, the indexes come from the most linked groups available.
+
+    The coupling map is a list of `[qubit, qubit]` edges, which can be
+    loaded from a local JSON file with `from_json`.
+    """
+
+    _neighbors: dict[int, frozenset[int]]
+
+    def __init__(self, edges: Iterable[tuple[int, int] | list[int]]):
+        neighbors: dict[int, set[int]] = dict()
+
+        for edge in edges:
+            if len(edge) != 2:
+                raise ValueError(f"invalid coupling map edge {edge}.")
+
+            a, b = int(edge[0]), int(edge[1])
+            neighbors.setdefault(a, set()).add(b)
+            neighbors.setdefault(b, set()).add(a)
+
+        self._neighbors = {k: frozenset(v) for k, v in neighbors.items()}
+
+    @classmethod
+    def from_json(cls, path: str | Path) -> CouplingMapStrategy:
+        """
+        Load the device coupling map from a JSON file, either a list of edges
+        or an object with a `coupling_map` (or `edges`) list of edges.
+        """
+
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        if isinstance(data, dict):
+            data = data.get("coupling_map", data.get("edges", None))
+
+        if not isinstance(data, list):
+            raise ValueError(f"no coupling map found on '{path}'.")
+
+        return cls(data)
+
+    @property
+    def neighbors(self) -> dict[int, frozenset[int]]:
+        return self._neighbors
+
+    @property
+    def edges(self) -> list[list[int]]:
+        """The coupling map edges, each one once, e.g. to set up a backend with it."""
+
+        return [[a, b] for a, ns in sorted(self._neighbors.items()) for b in sorted(ns) if a < b]
+
+    def _components(self, available: IndexSet) -> list[tuple[int, int]]:
+        """
+        Connected groups of available indexes, largest first, each as its most
+        linked index (the lowest on ties) and its size.
+        """
+
+        res: list[tuple[int, int]] = []
+        seen: set[int] = set()
+
+        for first in available:
+            if first in seen:
+                continue
+
+            seen.add(first)
+            size, start, start_links, queue = 0, first, -1, deque([first])
+
+            while queue:
+                k = queue.popleft()
+                size += 1
+                links = 0
+
+                for n in self._neighbors.get(k, ()):
+                    if n in available:
+                        links += 1
+
+                        if n not in seen:
+                            seen.add(n)
+                            queue.append(n)
+
+                if (links, -k) > (start_links, -start):
+                    start, start_links = k, links
+
+            res.append((start, size))
+
+        return sorted(res, key=lambda k: -k[1])
+
+    def _grow(self, start: int, available: IndexSet, num_idxs: int) -> tuple[list[int], int]:
+        """
+        Grow a connected group from `start`, adding the most linked neighbor each
+        time, up to `num_idxs` indexes. Return the group and its number of links.
+        """
+
+        group = [start]
+        chosen = {start}
+        links: dict[int, int] = dict()
+        total = 0
+
+        for k in self._neighbors.get(start, ()):
+            if k in available:
+                links[k] = 1
+
+        while len(group) < num_idxs and links:
+            nxt = max(links, key=lambda k: (links[k], -k))
+            total += links.pop(nxt)
+            group.append(nxt)
+            chosen.add(nxt)
+
+            for k in self._neighbors.get(nxt, ()):
+                if k not in chosen and k in available:
+                    links[k] = links.get(k, 0) + 1
+
+        return group, total
+
+    def select(self, available: IndexSet, num_idxs: int) -> tuple[int, ...] | None:
+        if len(available) < num_idxs:
+            return None
+
+        if num_idxs == 1 or not self._neighbors:
+            return available.lowest(num_idxs)
+
+        components = self._components(available)
+        best: list[int] | None = None
+        best_links = -1
+
+        # a single group is grown on each connected group that fits, from its
+        # most linked index
+        for start, size in components:
+            if size < num_idxs:
+                break
+
+            group, links = self._grow(start, available, num_idxs)
+
+            if links > best_links:
+                best, best_links = group, links
+
+        if best is None:
+            # the coupling map is a preference: with no connected group that
+            # fits, take the most linked groups from the largest ones on
+            best = []
+
+            for start, _ in components:
+                best += self._grow(start, available, num_idxs - len(best))[0]
+
+                if len(best) == num_idxs:
+                    break
+
+        return tuple(sorted(best))
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections import deque
-from queue import LifoQueue
+from typing import Iterable
 from uuid import UUID
 
 from hhat_lang.core.data.core import (
@@ -10,12 +10,20 @@ from hhat_lang.core.data.core import (
     WorkingData
 )
 from hhat_lang.core.data.variable import BaseDataContainer
+from hhat_lang.core.memory.allocation import (
+    AllocationStrategy,
+    ContiguousBlock,
+    IndexSet,
+    LowestFirst,
+)
 from hhat_lang.core.error_handlers.errors import (
     ErrorHandler,
     IndexAllocationError,
     IndexUnknownError,
     IndexVarHasIndexesError,
     HeapInvalidKeyError, IndexInvalidVarError,
+    StackEmptyError,
+    StackOverflowError,
 )
 
 
@@ -35,45 +43,66 @@ class IndexManager:
     """
     Holds and manages information about the indexes (qubits) availability and allocation.
 
+    Indexes are kept as bitsets (`IndexSet`), so freeing a variable's indexes is a
+    single bitwise operation no matter how many indexes are in use. Which free
+    indexes a variable gets is decided by an `AllocationStrategy`, by default
+    the lowest available ones.
+
     Properties
         - `max_number`: maximum number of allowed indexes
-        - `available`: deque with all the available indexes
-        - `allocated`: deque with all the allocated indexes
+        - `strategy`: the allocation strategy
+        - `available`: set with all the available indexes
+        - `allocated`: set with all the allocated indexes
         - `in_use_by`: dictionary containing the allocator variable as key and deque with allocated indexes as value
 
     Methods
         - `request`: given a variable (`Symbol`) and the number of indexes (`int`), allocate the number if it has enough space
         - `free`: given a variable (`Symbol`), free all the allocated indexes
+        - `recycle`: given a variable (`Symbol`) consumed by a cast within the current circuit, free its indexes to be reset and reused in it
+        - `resets`: given a variable (`Symbol`), the indexes it must reset before using them
+        - `end_circuit`: the current circuit ended, so no index needs a reset anymore
+        - `stats`: allocation statistics
     """
 
     _max_num_index: int
     _num_allocated: int
-    _available: deque
-    _allocated: deque
+    _available: IndexSet
+    _allocated: IndexSet
     _resources: dict[WorkingData, int]
     _in_use_by: dict[WorkingData, deque]
+    _masks: dict[WorkingData, int]
+    _stats: dict[str, int]
+    _strategy: AllocationStrategy
+    _dirty: IndexSet
+    _resets: dict[WorkingData, tuple[int, ...]]
 
-    def __init__(self, max_num_index: int):
+    def __init__(self, max_num_index: int, strategy: AllocationStrategy | None = None):
         self._max_num_index = max_num_index
+        self._strategy = LowestFirst() if strategy is None else strategy
         self._num_allocated = 0
-        self._available = deque(
-            iterable=tuple(k for k in range(0, self._max_num_index)),
-            maxlen=self._max_num_index,
-        )
-        self._allocated = deque(maxlen=self._max_num_index)
+        self._available = IndexSet(IndexSet.range_mask(0, max_num_index))
+        self._allocated = IndexSet()
         self._resources = dict()
         self._in_use_by = dict()
+        self._masks = dict()
+        self._stats = {"requests": 0, "frees": 0, "failed": 0, "peak": 0, "recycled": 0}
+        self._dirty = IndexSet()
+        self._resets = dict()
 
     @property
     def max_number(self) -> int:
         return self._max_num_index
 
     @property
-    def available(self) -> deque:
+    def strategy(self) -> AllocationStrategy:
+        return self._strategy
+
+    @property
+    def available(self) -> IndexSet:
         return self._available
 
     @property
-    def allocated(self) -> deque:
+    def allocated(self) -> IndexSet:
         return self._allocated
 
     @property
@@ -94,26 +123,28 @@ class IndexManager:
 
         return self._in_use_by
 
-    def _alloc_idxs(self, num_idxs: int) -> deque | IndexAllocationError:
-        available = (self._max_num_index - self._num_allocated)
-
-        if available >= num_idxs:
-            _data = tuple()
+    def _alloc_idxs(self, num_idxs: int, contiguous: bool = False) -> deque | IndexAllocationError:
+        strategy = ContiguousBlock() if contiguous else self._strategy
 
-            for _ in range(0, num_idxs):
-                _data += self._available.popleft(),
-                self._num_allocated += 1
+        if (idxs := strategy.select(self._available, num_idxs)) is not None:
+            return deque(idxs, maxlen=num_idxs)
 
-            return deque(
-                iterable=_data,
-                maxlen=num_idxs,
-            )
-
-        return IndexAllocationError(requested_idxs=num_idxs, max_idxs=available)
+        return IndexAllocationError(
+            requested_idxs=num_idxs, max_idxs=strategy.max_fit(self._available)
+        )
 
     def _alloc_var(self, var_name: WorkingData, idxs_deque: deque) -> None:
+        mask = IndexSet.mask(idxs_deque)
         self._in_use_by[var_name] = idxs_deque
-        self._allocated.extend(idxs_deque)
+        self._masks[var_name] = mask
+        self._available.remove_mask(mask)
+        self._allocated.add_mask(mask)
+        self._num_allocated += len(idxs_deque)
+        self._stats["peak"] = max(self._stats["peak"], self._num_allocated)
+
+        if dirty := mask & self._dirty.bits:
+            self._resets[var_name] = tuple(IndexSet(dirty))
+            self._dirty.remove_mask(dirty)
 
     def _has_var(self, var_name: WorkingData) -> bool:
         return var_name in self._resources
@@ -124,10 +155,8 @@ class IndexManager:
         """
 
         idxs = self._in_use_by.pop(var_name)
-
-        for k in idxs:
-            self._allocated.remove(k)
-
+        self._allocated.remove_mask(self._masks.pop(var_name))
+        self._resets.pop(var_name, None)
         return idxs
 
     def add(self, var_name: WorkingData, num_idxs: int) -> None | ErrorHandler:
@@ -146,16 +175,19 @@ class IndexManager:
 
         return IndexAllocationError(requested_idxs=num_idxs, max_idxs=self._num_allocated)
 
-    def request(self, var_name: WorkingData) -> deque | ErrorHandler:
+    def request(self, var_name: WorkingData, *, contiguous: bool = False) -> deque | ErrorHandler:
         """
         Request a number of indexes given by the `resources` property for
-        a variable `var_name`.
+        a variable `var_name`. With `contiguous`, the indexes are a single
+        range of consecutive indexes.
         """
 
         if not (num_idxs := self._resources.get(var_name, False)):
             return IndexInvalidVarError(var_name)
 
-        match x := self._alloc_idxs(num_idxs):
+        self._stats["requests"] += 1
+
+        match x := self._alloc_idxs(num_idxs, contiguous):
 
             case deque():
                 if not self._has_var(var_name):
@@ -165,6 +197,7 @@ class IndexManager:
                 return x
 
             case IndexAllocationError():
+                self._stats["failed"] += 1
                 return x
 
         return IndexUnknownError()
@@ -174,9 +207,73 @@ class IndexManager:
         Free indexes from a given variable `var_name`.
         """
 
+        mask = self._masks[var_name]
         idxs = self._free_var(var_name)
-        self._available.extend(idxs)
+        self._available.add_mask(mask)
         self._num_allocated -= len(idxs)
+        self._stats["frees"] += 1
+
+    def free_many(self, var_names: Iterable[WorkingData]) -> None:
+        """
+        Free indexes from many variables at once, e.g. all the variables of a
+        scope going out of scope.
+        """
+
+        mask, num, count = 0, 0, 0
+
+        for var_name in var_names:
+            mask |= self._masks.pop(var_name)
+            num += len(self._in_use_by.pop(var_name))
+            self._resets.pop(var_name, None)
+            count += 1
+
+        self._allocated.remove_mask(mask)
+        self._available.add_mask(mask)
+        self._num_allocated -= num
+        self._stats["frees"] += count
+
+    def recycle(self, var_name: WorkingData) -> None:
+        """
+        Free indexes from a variable `var_name` consumed by a cast (measured)
+        while the circuit goes on. Its indexes go back to the pool, but must be
+        reset before being used again in the same circuit; `resets` gives them to
+        the variable that gets them next, until `end_circuit`.
+        """
+
+        mask = self._masks[var_name]
+        self.free(var_name)
+        self._dirty.add_mask(mask)
+        self._stats["recycled"] += mask.bit_count()
+
+    def resets(self, var_name: WorkingData) -> tuple[int, ...]:
+        """Indexes of variable `var_name` that must be reset before using them."""
+
+        return self._resets.get(var_name, ())
+
+    def end_circuit(self) -> None:
+        """
+        The current circuit ended (it was executed). Every index starts the next
+        circuit in its initial state, so recycled indexes need no reset anymore.
+        """
+
+        self._dirty = IndexSet()
+        self._resets.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Allocation statistics: number of allocated and available indexes, the
+        peak of allocated indexes, the largest contiguous range available, and
+        the number of requests, frees, failed requests and recycled indexes
+        so far.
+        """
+
+        return {
+            "max_number": self._max_num_index,
+            "allocated": self._num_allocated,
+            "available": self._max_num_index - self._num_allocated,
+            "largest_range": self._available.largest_run(),
+            **self._stats,
+        }
 
 
 #########################
@@ -184,38 +281,123 @@ class IndexManager:
 #########################
 
 
+DEFAULT_STACK_CAPACITY = 1 << 16
+"""default maximum number of items on the stack"""
+
+
 class BaseStack(ABC):
-    _data: LifoQueue
+    _data: list
 
     @abstractmethod
-    def push(self, data: MemoryDataTypes) -> None:
+    def push(self, data: MemoryDataTypes) -> None | ErrorHandler:
         pass
 
     @abstractmethod
-    def pop(self) -> MemoryDataTypes:
+    def pop(self) -> MemoryDataTypes | ErrorHandler:
         pass
 
     @abstractmethod
-    def peek(self) -> MemoryDataTypes:
+    def peek(self) -> MemoryDataTypes | ErrorHandler:
         pass
 
 
 class Stack(BaseStack):
-    def __init__(self):
-        self._data = LifoQueue()
+    """
+    List-backed stack for a single evaluator. It is bounded by `capacity` and
+    split into frames: `new_frame` marks the start of a frame (e.g. a function
+    call) and `drop_frame` pops all of its items at once. `pop` and `peek`
+    only reach the items of the current frame.
+
+    Properties
+        - `capacity`: maximum number of items
+        - `depth`: number of open frames
+
+    Methods
+        - `push`/`push_many`: push one or many items, or `StackOverflowError`
+        - `pop`/`pop_many`: pop one or many items, or `StackEmptyError`
+        - `peek`: the last item, or `StackEmptyError`
+        - `new_frame`: open a new frame
+        - `drop_frame`: pop all the items of the current frame and close it
+    """
+
+    _capacity: int
+    _frames: list[int]
+
+    def __init__(self, capacity: int = DEFAULT_STACK_CAPACITY):
+        self._data = []
+        self._capacity = capacity
+        self._frames = []
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def _frame_start(self) -> int:
+        return self._frames[-1] if self._frames else 0
+
+    def push(self, data: MemoryDataTypes) -> None | StackOverflowError:
+        if len(self._data) >= self._capacity:
+            return StackOverflowError()
+
+        self._data.append(data)
+        return None
+
+    def push_many(self, *data: MemoryDataTypes) -> None | StackOverflowError:
+        """Push all the items or, if they do not fit, none of them."""
+
+        if len(self._data) + len(data) > self._capacity:
+            return StackOverflowError()
+
+        self._data.extend(data)
+        return None
+
+    def pop(self) -> MemoryDataTypes | StackEmptyError:
+        if len(self._data) <= self._frame_start():
+            return StackEmptyError()
+
+        return self._data.pop()
+
+    def pop_many(self, num: int) -> tuple[MemoryDataTypes, ...] | StackEmptyError:
+        """Pop the last `num` items, in the order they were pushed."""
+
+        start = len(self._data) - num
+
+        if num < 0 or start < self._frame_start():
+            return StackEmptyError()
+
+        res = tuple(self._data[start:])
+        del self._data[start:]
+        return res
+
+    def peek(self) -> MemoryDataTypes | StackEmptyError:
+        if len(self._data) <= self._frame_start():
+            return StackEmptyError()
+
+        return self._data[-1]
+
+    def new_frame(self) -> int:
+        """Open a new frame and return the number of open frames."""
 
-    def push(self, data: MemoryDataTypes) -> None:
-        self._data.put(data)
+        self._frames.append(len(self._data))
+        return len(self._frames)
 
-    def pop(self) -> MemoryDataTypes:
-        return self._data.get()
+    def drop_frame(self) -> tuple[MemoryDataTypes, ...] | StackEmptyError:
+        """Close the current frame, popping all of its items at once."""
 
-    def peek(self) -> MemoryDataTypes:
-        """Expensive method to 'peek' the last item from the stack."""
+        if not self._frames:
+            return StackEmptyError()
 
-        last_item = self._data.get()
-        self._data.put(last_item)
-        return last_item
+        start = self._frames.pop()
+        res = tuple(self._data[start:])
+        del self._data[start:]
+        return res
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 class BaseHeap(ABC):
@@ -251,6 +433,92 @@ class Heap(BaseHeap):
         return var_data
 
 
+GLOBAL_SCOPE = "0"
+"""name of the global scope"""
+
+MAIN_SCOPE = "main"
+"""name of the `main` scope"""
+
+
+class Scope:
+    """
+    Arena frame for a scope (global, `main` or a function call): it holds the
+    scope's heap data and the variables that got indexes on it, so the whole
+    scope is released at once when it ends.
+
+    Properties
+        - `name`: scope name, e.g. `0`, `main` or `fn#1` for a function call
+        - `data`: heap data of the scope
+        - `idx_vars`: variables with indexes allocated on the scope
+    """
+
+    _name: str
+    _data: dict[Symbol, BaseDataContainer]
+    _idx_vars: list[WorkingData]
+
+    def __init__(self, name: str):
+        self._name = name
+        self._data = dict()
+        self._idx_vars = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def data(self) -> dict[Symbol, BaseDataContainer]:
+        return self._data
+
+    @property
+    def idx_vars(self) -> list[WorkingData]:
+        return self._idx_vars
+
+    def __repr__(self) -> str:
+        return f"Scope({self._name})"
+
+
+class ScopedHeap(Heap):
+    """
+    Heap split in scopes. Data is stored on the current scope, and looked up
+    on the current scope and then on the global scope only.
+    """
+
+    _scopes: list[Scope]
+
+    def __init__(self):
+        super().__init__()
+        self._scopes = [Scope(GLOBAL_SCOPE)]
+        self._data = self._scopes[0].data
+
+    @property
+    def scope(self) -> Scope:
+        return self._scopes[-1]
+
+    @property
+    def global_scope(self) -> Scope:
+        return self._scopes[0]
+
+    @property
+    def depth(self) -> int:
+        return len(self._scopes)
+
+    def get(self, key: Symbol) -> BaseDataContainer | HeapInvalidKeyError:
+        if (var_data := self._data.get(key, None)) is None:
+            if (var_data := self._scopes[0].data.get(key, None)) is None:
+                return HeapInvalidKeyError(key=key)
+
+        return var_data
+
+    def push_scope(self, scope: Scope) -> None:
+        self._scopes.append(scope)
+        self._data = scope.data
+
+    def pop_scope(self) -> Scope:
+        scope = self._scopes.pop()
+        self._data = self._scopes[-1].data
+        return scope
+
+
 ########################
 # MEMORY MANAGER CLASS #
 ########################
@@ -281,25 +549,86 @@ class BaseMemoryManager(ABC):
 
 
 class MemoryManager(BaseMemoryManager):
-    """Manages the stack, heap, pid, and index."""
+    """
+    Manages the stack, heap, pid, and index.
+
+    Memory is split in scopes, starting with the global scope (`0`). Each scope
+    (`main`, a function call) opens a stack frame and a heap `Scope`; leaving
+    it drops the stack frame, the scope data and frees the indexes requested
+    on it through `request_idx`, each in a single operation.
+    """
+
+    _heap: ScopedHeap
+    _scope_count: int
 
-    def __init__(self, max_num_index: int):
+    def __init__(self, max_num_index: int, strategy: AllocationStrategy | None = None):
         self._stack = Stack()
-        self._heap = Heap()
+        self._heap = ScopedHeap()
         self._pid = PIDManager()
-        self._idx = IndexManager(max_num_index)
+        self._idx = IndexManager(max_num_index, strategy)
+        self._scope_count = 0
 
     @property
-    def stack(self) -> BaseStack:
+    def stack(self) -> Stack:
         return self._stack
 
     @property
-    def heap(self) -> BaseHeap:
+    def heap(self) -> ScopedHeap:
         return self._heap
 
     @property
     def idx(self) -> IndexManager:
         return self._idx
 
+    @property
+    def scope(self) -> Scope:
+        return self._heap.scope
+
+    def new_scope(self, name: str) -> Scope:
+        """
+        Enter a new scope. Function scopes get an extra identifier, e.g.
+        `fn#3`, so recursive calls have distinct scopes.
+        """
+
+        if name not in (GLOBAL_SCOPE, MAIN_SCOPE):
+            self._scope_count += 1
+            name = f"{name}#{self._scope_count}"
+
+        scope = Scope(name)
+        self._stack.new_frame()
+        self._heap.push_scope(scope)
+        return scope
+
+    def exit_scope(self) -> Scope | StackEmptyError:
+        """Leave the current scope, releasing its stack, heap and indexes."""
+
+        if self._heap.depth == 1:
+            return StackEmptyError()
+
+        scope = self._heap.pop_scope()
+        self._stack.drop_frame()
+        self._idx.free_many(k for k in scope.idx_vars if k in self._idx.in_use_by)
+
+        for k in scope.idx_vars:
+            self._idx.resources.pop(k, None)
+
+        return scope
+
+    def request_idx(
+        self, var_name: WorkingData, num_idxs: int | None = None, *, contiguous: bool = False
+    ) -> deque | ErrorHandler:
+        """
+        Request indexes for `var_name` on the current scope, adding `num_idxs`
+        as its resources first if given. They are freed when the scope ends.
+        """
+
+        if num_idxs is not None and isinstance(err := self._idx.add(var_name, num_idxs), ErrorHandler):
+            return err
+
+        if isinstance(res := self._idx.request(var_name, contiguous=contiguous), deque):
+            self._heap.scope.idx_vars.append(var_name)
+
+        return res
+
 
 MemoryDataTypes = BaseDataContainer | CoreLiteral | CompositeLiteral | Symbol | CompositeMixData
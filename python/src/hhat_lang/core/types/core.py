@@ -5,7 +5,7 @@ from typing import Any
 
 from hhat_lang.core.data.core import Symbol, WorkingData, CompositeSymbol
 from hhat_lang.core.data.utils import has_same_paradigm, isquantum, VariableKind
-from hhat_lang.core.data.variable import BaseDataContainer, VariableTemplate
+from hhat_lang.core.data.variable import BaseDataContainer, DataLayout, VariableTemplate
 from hhat_lang.core.error_handlers.errors import (
     ErrorHandler,
     TypeAndMemberNoMatchError,
@@ -41,6 +41,7 @@ class SingleDS(BaseTypeDataStructure):
         self._size = size
         self._qsize = qsize
         self._type_container: OrderedDict[Symbol | CompositeSymbol, Symbol | CompositeSymbol] = OrderedDict()
+        self._layout: DataLayout | None = None
 
     def add_member(
         self, member_type: BaseTypeDataStructure, _member_name: None = None
@@ -50,6 +51,7 @@ class SingleDS(BaseTypeDataStructure):
             return TypeQuantumOnClassicalError(member_type.name, self.name)
 
         self._type_container[self.name] = member_type.name
+        self._layout = DataLayout(SymbolOrdered({member_type.name: member_type.name}))
         return self
 
     def __call__(
@@ -66,7 +68,7 @@ class SingleDS(BaseTypeDataStructure):
                 variable = VariableTemplate(
                     var_name=var_name,
                     type_name=self.name,
-                    type_ds=SymbolOrdered({Symbol(x.type): self._type_container}),
+                    type_ds=self._layout,
                     flag=flag,
                 )
                 variable(*args)
@@ -107,6 +109,16 @@ class StructDS(BaseTypeDataStructure):
         self._size = size
         self._qsize = qsize
         self._type_container: SymbolOrdered[Symbol | CompositeSymbol, Symbol | CompositeSymbol] = SymbolOrdered()
+        self._layout: DataLayout | None = None
+
+    @property
+    def layout(self) -> DataLayout:
+        """members layout shared by the struct's containers, computed once per type"""
+
+        if self._layout is None:
+            self._layout = DataLayout(self._type_container)
+
+        return self._layout
 
     def add_member(
         self, member_type: BaseTypeDataStructure, member_name: Symbol | CompositeSymbol
@@ -117,6 +129,7 @@ class StructDS(BaseTypeDataStructure):
 
             if is_valid_member(self, member_type.name):
                 self._type_container[member_name] = member_type.name
+                self._layout = None
                 return self
 
             return TypeQuantumOnClassicalError(member_type.name, self.name)
@@ -153,7 +166,7 @@ class StructDS(BaseTypeDataStructure):
         variable = VariableTemplate(
             var_name=var_name,
             type_name=self._name,
-            type_ds=self._type_container,
+            type_ds=self.layout,
             flag=flag,
         )
         variable(**container)
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections import OrderedDict
-from collections.abc import Mapping
+from collections.abc import ItemsView, Iterable, KeysView, Mapping, ValuesView
 from typing import Any, Iterator
 
 from hhat_lang.core.data.core import Symbol, CompositeSymbol
@@ -11,56 +10,159 @@ from hhat_lang.core.error_handlers.errors import ErrorHandler
 
 class SymbolOrdered(Mapping):
     """
-    A special OrderedDict that accepts Symbol as keys but transforms them
+    A special ordered dict that accepts Symbol as keys but transforms them
     as str to unpack the class. Useful for building data structures such
     as `SingleDS`, `StructDS`, etc.
+
+    It is backed by a plain dict keyed by (interned) symbols, plus a name
+    to symbol dict so str keys are looked up without creating symbols.
     """
 
-    _data: OrderedDict[Symbol, Any]
+    __slots__ = ("_data", "_names")
 
-    def __init__(self, data: dict | OrderedDict | None = None):
-        self._data = OrderedDict() if data is None else OrderedDict(data)
+    _data: dict[Symbol | CompositeSymbol, Any]
+    _names: dict[str, Symbol]
+    """str keys: only plain symbols (`Symbol(name)`) are reachable by name"""
 
-    def __setitem__(self, key: str | Symbol | CompositeSymbol, value: Any) -> None:
-        if isinstance(key, str):
-            self._data[Symbol(key)] = value
+    def __init__(self, data: Mapping | Iterable[tuple[Any, Any]] | None = None):
+        self._data = {}
+        self._names = {}
+
+        if data is not None:
+            for k, v in (data.items() if isinstance(data, Mapping) else data):
+                self._set(k, v)
+
+    def _set(self, key: str | Symbol | CompositeSymbol, value: Any) -> None:
+        if key.__class__ is str:
+            if (sym := self._names.get(key)) is None:
+                sym = self._names[key] = Symbol(key)
+
+            self._data[sym] = value
 
         elif isinstance(key, (Symbol, CompositeSymbol)):
             self._data[key] = value
 
+            if key.__class__ is Symbol and key.type == "str":
+                self._names[key.value] = key
+
         else:
             raise ValueError(f"{key} ({type(key)}) is not valid key for data structures.")
 
+    __setitem__ = _set
+
     def __getitem__(self, key: str | Symbol | CompositeSymbol) -> Any:
-        if isinstance(key, str):
-            return self._data[Symbol(key)]
+        if key.__class__ is str:
+            return self._data[self._names[key]]
 
-        if isinstance(key, (Symbol, CompositeSymbol)):
+        try:
             return self._data[key]
 
-        raise ValueError(key)
+        except KeyError:
+            if isinstance(key, (Symbol, CompositeSymbol)):
+                raise
+
+            raise ValueError(key) from None
+
+    def symbol(self, name: str) -> Symbol | None:
+        """The key for `name`, if any."""
+
+        return self._names.get(name)
+
+    def __contains__(self, key: Any) -> bool:
+        if key.__class__ is str:
+            return key in self._names
+
+        return key in self._data
 
     def __len__(self) -> int:
         return len(self._data)
 
-    def items(self) -> Iterator:
-        yield from self._data.items()
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SymbolOrdered):
+            return self._data == other._data
+
+        if isinstance(other, Mapping):
+            return self._data == other
+
+        return NotImplemented
+
+    def items(self) -> ItemsView:
+        return self._data.items()
 
-    def keys(self) -> Iterator:
-        for k in self._data.keys():
+    def keys(self) -> KeysView:
+        # str keys for unpacking, e.g. `fn(**symbol_ordered)`
+        return self._names.keys() if len(self._names) == len(self._data) else self._keys()
+
+    def _keys(self) -> Iterator:
+        for k in self._data:
             yield k.value
 
-    def values(self) -> Iterator:
-        yield from self._data.values()
+    def values(self) -> ValuesView:
+        return self._data.values()
 
     def __iter__(self) -> Iterator:
-        for k in self._data:
-            yield k  # .name
+        return iter(self._data)
 
     def __repr__(self) -> str:
         return str(self._data)
 
 
+class FrozenSymbolOrdered(SymbolOrdered):
+    """
+    Immutable and hashable `SymbolOrdered`, e.g. for types layouts that are
+    computed once and shared. Values are frozen as well: mappings become
+    `FrozenSymbolOrdered`, lists and sets become tuples and frozensets, and
+    any other unhashable value raises `TypeError`.
+    """
+
+    __slots__ = ("_hash",)
+
+    _hash: int | None
+
+    def __init__(self, data: Mapping | Iterable[tuple[Any, Any]] | None = None):
+        if data is not None:
+            data = [
+                (k, _freeze(v))
+                for k, v in (data.items() if isinstance(data, Mapping) else data)
+            ]
+
+        super().__init__(data)
+        self._hash = None
+
+    def __setitem__(self, key: str | Symbol | CompositeSymbol, value: Any) -> None:
+        raise TypeError(f"{self.__class__.__name__} does not support item assignment.")
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self._data.items()))
+
+        return self._hash
+
+
+def _freeze(value: Any) -> Any:
+    """Immutable counterpart of a `FrozenSymbolOrdered` value."""
+
+    if isinstance(value, FrozenSymbolOrdered):
+        return value
+
+    if isinstance(value, Mapping):
+        return FrozenSymbolOrdered(value)
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(k) for k in value)
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(k) for k in value)
+
+    try:
+        hash(value)
+
+    except TypeError:
+        raise TypeError(f"{value!r} cannot be a frozen value, it is not hashable.") from None
+
+    return value
+
+
 class Result(ABC):
     """The `Result` class is meant to be used for instructions execution results"""
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from weakref import WeakValueDictionary
+
 from hhat_lang.core.code.ast import AST, Node, Terminal
 
 
@@ -9,12 +11,31 @@ from hhat_lang.core.code.ast import AST, Node, Terminal
 
 
 class Id(Terminal):
-    def __init__(self, value: str):
-        self._value = (value,)
-        self._name = value
+    """
+    Identifiers are interned: creating an `Id` with the same value as an
+    existing one gives back the same object.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    _interned: WeakValueDictionary[str, Id] = WeakValueDictionary()
+
+    def __new__(cls, value: str) -> Id:
+        if (obj := cls._interned.get(value, None)) is None:
+            obj = super().__new__(cls)
+            obj._value = (value,)
+            obj._name = value
+            cls._interned[value] = obj
+
+        return obj
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self._name,)
 
 
 class CompositeId(Node):
+    __slots__ = ()
+
     def __init__(self, *names: Id):
         self._value = names
         self._name = self.__class__.__name__
@@ -32,26 +53,34 @@ class CompositeIdWithClosure(Node):
     As showed above, it can be nested.
     """
 
+    __slots__ = ()
+
     def __init__(self, *values: Id | CompositeId, name: Id | CompositeId):
         self._value = (name, values)
         self._name = self.__class__.__name__
 
 
 class ArgValuePair(Node):
+    __slots__ = ()
+
     def __init__(self, arg: Id, value: ValueType):
         self._value = (arg, value)
         self._name = self.__class__.__name__
 
 
 class OnlyValue(Node):
+    __slots__ = ()
+
     def __init__(self, value: ValueType):
         self._value = (value,)
         self._name = self.__class__.__name__
 
 
 class Modifier(Node):
+    __slots__ = ()
+
     def __init__(self, *modifiers: ArgValuePair):
-        self._values = modifiers
+        self._value = modifiers
         self._name = self.__class__.__name__
 
 
@@ -62,23 +91,41 @@ class ModifiedId(Node):
     variable, a type or a function call.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: Id | CompositeId, modifier: Modifier):
         self._value = (name, modifier)
         self._name = self.__class__.__name__
 
 
 class Literal(Terminal):
-    def __init__(self, value: str, value_type: str):
-        self._value = (value,)
-        self._name = value_type
+    """
+    Literals are interned by value and type, as `Id`.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    _interned: WeakValueDictionary[tuple[str, str], Literal] = WeakValueDictionary()
+
+    def __new__(cls, value: str, value_type: str) -> Literal:
+        if (obj := cls._interned.get((value, value_type), None)) is None:
+            obj = super().__new__(cls)
+            obj._value = (value,)
+            obj._name = value_type
+            cls._interned[(value, value_type)] = obj
+
+        return obj
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self._value[0], self._name)
 
 
 class Array(Node):
-    pass
+    __slots__ = ()
 
 
 class Hash(Node):
-    pass
+    __slots__ = ()
 
 
 class Cast(Node):
@@ -88,30 +135,40 @@ class Cast(Node):
     cast a quantum data to a classical type.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: TypeType, cast_to: TypeType):
         self._value = (name, cast_to)
         self._name = self.__class__.__name__
 
 
 class Expr(Node):
+    __slots__ = ()
+
     def __init__(self, *expr: AST):
         self._value = expr
         self._name = self.__class__.__name__
 
 
 class Declare(Node):
+    __slots__ = ()
+
     def __init__(self, var_name: Id, var_type: TypeType):
         self._value = (var_name, var_type)
         self._name = self.__class__.__name__
 
 
 class Assign(Node):
+    __slots__ = ()
+
     def __init__(self, var_name: TypeType, expr: Expr):
         self._value = (var_name, expr)
         self._name = self.__class__.__name__
 
 
 class DeclareAssign(Node):
+    __slots__ = ()
+
     def __init__(
         self,
         var_name: Id,
@@ -123,36 +180,48 @@ class DeclareAssign(Node):
 
 
 class CallArgs(Node):
+    __slots__ = ()
+
     def __init__(self, *args: ArgValuePair | OnlyValue):
-        self._values = args
+        self._value = args
         self._name = self.__class__.__name__
 
 
 class Call(Node):
+    __slots__ = ()
+
     def __init__(self, caller: TypeType, args: CallArgs):
         self._value = (caller, args)
         self._name = self.__class__.__name__
 
 
 class MethodCallArgs(Node):
+    __slots__ = ()
+
     def __init__(self, *args: ArgValuePair | OnlyValue):
-        self._values = args
+        self._value = args
         self._name = self.__class__.__name__
 
 
 class MethodCall(Node):
+    __slots__ = ()
+
     def __init__(self, self_caller: TypeType, args: CallArgs):
         self._value = (self_caller, args)
         self._name = self.__class__.__name__
 
 
 class InsideOption(Node):
+    __slots__ = ()
+
     def __init__(self, option: Expr, body: Body):
         self._value = (option, body)
         self._name = self.__class__.__name__
 
 
 class CallWithBodyOptions(Node):
+    __slots__ = ()
+
     def __init__(
         self,
         *call_options: InsideOption,
@@ -164,12 +233,16 @@ class CallWithBodyOptions(Node):
 
 
 class CallWithArgsBodyOptions(Node):
+    __slots__ = ()
+
     def __init__(self, *arg_options: InsideOption, caller: TypeType):
         self._value = (caller, arg_options)
         self._name = self.__class__.__name__
 
 
 class CallWithBody(Node):
+    __slots__ = ()
+
     def __init__(
         self, caller: TypeType, args: CallArgs, body: Body
     ):
@@ -178,18 +251,24 @@ class CallWithBody(Node):
 
 
 class ArgTypePair(Node):
+    __slots__ = ()
+
     def __init__(self, arg_name: Id, arg_type: TypeType):
         self._value = (arg_name, arg_type)
         self._name = self.__class__.__name__
 
 
 class FnArgs(Node):
+    __slots__ = ()
+
     def __init__(self, *args: ArgTypePair):
-        self._values = args
+        self._value = args
         self._name = self.__class__.__name__
 
 
 class FnDef(Node):
+    __slots__ = ()
+
     def __init__(
         self,
         fn_name: Id,
@@ -202,24 +281,32 @@ class FnDef(Node):
 
 
 class TypeMember(Node):
+    __slots__ = ()
+
     def __init__(self, member_name: Id, member_type: TypeType):
         self._value = (member_name, member_type)
         self._name = self.__class__.__name__
 
 
 class SingleTypeMember(Node):
+    __slots__ = ()
+
     def __init__(self, member_type: TypeType):
         self._value = (member_type,)
         self._name = self.__class__.__name__
 
 
 class EnumTypeMember(Node):
+    __slots__ = ()
+
     def __init__(self, member_name: Id):
         self._value = (member_name,)
         self._name = self.__class__.__name__
 
 
 class TypeDef(Node):
+    __slots__ = ()
+
     def __init__(
         self,
         *members: TypeMember | SingleTypeMember | EnumTypeMember,
@@ -231,12 +318,16 @@ class TypeDef(Node):
 
 
 class TypeImport(Node):
+    __slots__ = ()
+
     def __init__(self, type_list: tuple[Id | CompositeId | CompositeIdWithClosure]):
         self._value = type_list
         self._name = self.__class__.__name__
 
 
 class FnImport(Node):
+    __slots__ = ()
+
     def __init__(self, fn_list: tuple[Id | CompositeId | CompositeIdWithClosure]):
         self._value = fn_list
         self._name = self.__class__.__name__
@@ -247,6 +338,8 @@ class Imports(Node):
     Importing types and then functions to the program.
     """
 
+    __slots__ = ()
+
     def __init__(self, *, type_import: tuple[TypeImport, ...], fn_import: tuple[FnImport, ...]):
         self._value = (type_import, fn_import)
         self._name = self.__class__.__name__
@@ -257,8 +350,10 @@ class Body(Node):
     Body of a closure.
     """
 
+    __slots__ = ()
+
     def __init__(self, *body: BodyType):
-        self._values = body
+        self._value = body
         self._name = self.__class__.__name__
 
 
@@ -267,12 +362,16 @@ class Main(Node):
     The `main` closure, where the main execution lives.
     """
 
+    __slots__ = ()
+
     def __init__(self, *body: AST):
         self._value = body
         self._name = self.__class__.__name__
 
 
 class Program(Node):
+    __slots__ = ()
+
     def __init__(self, *, main: Main, imports: Imports):
         self._value = (imports, main)
         self._name = self.__class__.__name__
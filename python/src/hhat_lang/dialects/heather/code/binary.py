@@ -0,0 +1,323 @@
+"""
+Compact binary format for Heather ASTs and IR code, so precompiled code can be
+stored as an artifact and loaded back without parsing it again.
+
+The format is made of flat arrays of little-endian `uint32`::
+
+    magic (8 bytes)
+    header: format version, #strings, #classes, #records, #refs, root ref
+    string offsets: #strings + 1 offsets into the string blob
+    classes: string index of each record class (`module:qualname`)
+    records: (class, name, #children) for each object
+    refs: references from records to their children, in records order
+    string blob: all the strings, UTF-8 encoded
+
+Every string (symbols, names, types, literal values) is stored once in the
+string table. Records are written children first, so loading is a single pass
+over the records array. A ref packs its kind on the 2 lowest bits: a record, a
+string or `None`. Identical AST subtrees are stored once, since ASTs are
+compared structurally.
+
+Loading from a file memory-maps it and reads the arrays in place; strings are
+only decoded when a record uses them.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from enum import Enum
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Sequence
+
+from hhat_lang.core.code.ast import AST
+from hhat_lang.core.code.ir import BodyIR, InstrIRFlag
+from hhat_lang.core.data.core import Atomic, CompositeSymbol, CoreLiteral, Symbol
+from hhat_lang.dialects.heather.code import ast as heather_ast
+from hhat_lang.dialects.heather.code.ast import Id, Literal
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRArgs, IRBlock, IRInstr
+
+
+MAGIC = b"HHATBIN\x00"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<6I")
+_WORD = 4
+_RECORD_WORDS = 3
+_NO_NAME = 0xFFFFFFFF
+
+
+class _Ref(Enum):
+    RECORD = 0
+    STRING = 1
+    NONE = 2
+
+
+_Encoder = Callable[[Any], tuple[str | None, tuple]]
+_Decoder = Callable[[str | None, tuple], Any]
+
+
+def _class_key(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _decode_node(cls: type[AST]) -> _Decoder:
+    def decode(name: str | None, children: tuple) -> AST:
+        node = cls.__new__(cls)
+        node.__setstate__((name, children))
+        return node
+
+    return decode
+
+
+def _decode_block(name: str | None, children: tuple) -> IRBlock:
+    block = IRBlock()
+
+    for k in children:
+        block.add_instr(k)
+
+    return block
+
+
+def _decode_body(name: str | None, children: tuple) -> BodyIR:
+    body = BodyIR()
+
+    for k in children:
+        body.push(k)
+
+    return body
+
+
+def _ast_codecs(module: ModuleType) -> dict[type, tuple[_Encoder, _Decoder]]:
+    """Codecs for all the AST classes of a dialect's AST module."""
+
+    codecs: dict[type, tuple[_Encoder, _Decoder]] = dict()
+
+    for obj in vars(module).values():
+        if isinstance(obj, type) and issubclass(obj, AST) and obj.__module__ == module.__name__:
+            codecs[obj] = (lambda x: (x.name, x.value)), _decode_node(obj)
+
+    # interned terminals must go through their constructor
+    codecs[Id] = (lambda x: (None, x.value)), (lambda n, c: Id(c[0]))
+    codecs[Literal] = (lambda x: (x.name, x.value)), (lambda n, c: Literal(c[0], n))
+    return codecs
+
+
+_CODECS: dict[type, tuple[_Encoder, _Decoder]] = {
+    **_ast_codecs(heather_ast),
+    tuple: ((lambda x: (None, x)), (lambda n, c: c)),
+    list: ((lambda x: (None, tuple(x))), (lambda n, c: list(c))),
+    Symbol: ((lambda x: (x.value, (x.type,))), (lambda n, c: Symbol(n, c[0]))),
+    Atomic: ((lambda x: (x.value, (x.type,))), (lambda n, c: Atomic(n, c[0]))),
+    CompositeSymbol: ((lambda x: (None, x.value)), (lambda n, c: CompositeSymbol(c))),
+    CoreLiteral: ((lambda x: (x.value, (x.type,))), (lambda n, c: CoreLiteral(n, c[0]))),
+    IRArgs: ((lambda x: (None, tuple(x))), (lambda n, c: IRArgs(*c))),
+    IRInstr: (
+        (lambda x: (x.flag.name, (x.name, x.args))),
+        (lambda n, c: IRInstr(c[0], c[1], InstrIRFlag[n])),
+    ),
+    IRBlock: ((lambda x: (None, tuple(x))), _decode_block),
+    BodyIR: ((lambda x: (None, tuple(x))), _decode_body),
+}
+"""encoder and decoder for each serializable class"""
+
+_DECODERS: dict[str, _Decoder] = {_class_key(k): v[1] for k, v in _CODECS.items()}
+
+
+class _Writer:
+    """Flatten an object into the format arrays."""
+
+    def __init__(self):
+        self.strings: dict[str, int] = dict()
+        self.classes: dict[type, int] = dict()
+        self.records: list[int] = []
+        self.refs: list[int] = []
+        self._memo: dict[Any, int] = dict()
+
+        # objects memoized by identity are kept alive while writing, otherwise a
+        # temporary object id could be reused by another object, aliasing both
+        self._alive: list[Any] = []
+
+    def string(self, value: str) -> int:
+        if (idx := self.strings.get(value, None)) is None:
+            idx = self.strings[value] = len(self.strings)
+
+        return idx
+
+    def ref(self, obj: Any) -> int:
+        if obj is None:
+            return _Ref.NONE.value
+
+        if isinstance(obj, str):
+            return self.string(obj) << 2 | _Ref.STRING.value
+
+        return self.record(obj) << 2 | _Ref.RECORD.value
+
+    def record(self, obj: Any) -> int:
+        # ASTs are deduplicated structurally, anything else by identity
+        key = obj if isinstance(obj, AST) else id(obj)
+
+        if (idx := self._memo.get(key, None)) is not None:
+            return idx
+
+        if (codec := _CODECS.get(obj.__class__, None)) is None:
+            raise ValueError(f"cannot serialize '{obj.__class__.__name__}' object.")
+
+        name, children = codec[0](obj)
+        child_refs = [self.ref(k) for k in children]
+
+        if (cls := self.classes.get(obj.__class__, None)) is None:
+            cls = self.classes[obj.__class__] = len(self.classes)
+            self.string(_class_key(obj.__class__))
+
+        self.records.extend((cls, _NO_NAME if name is None else self.string(name), len(child_refs)))
+        self.refs.extend(child_refs)
+
+        idx = self._memo[key] = len(self.records) // _RECORD_WORDS - 1
+
+        if key is not obj:
+            self._alive.append(obj)
+
+        return idx
+
+    def to_bytes(self, root: int) -> bytes:
+        blob = bytearray()
+        offsets = [0]
+
+        for k in self.strings:
+            blob += k.encode("utf-8")
+            offsets.append(len(blob))
+
+        classes = [self.strings[_class_key(k)] for k in self.classes]
+        words = offsets + classes + self.records + self.refs
+        header = _HEADER.pack(
+            FORMAT_VERSION,
+            len(self.strings),
+            len(classes),
+            len(self.records) // _RECORD_WORDS,
+            len(self.refs),
+            root,
+        )
+        return MAGIC + header + struct.pack(f"<{len(words)}I", *words) + bytes(blob)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an AST or IR code (blocks, instructions, bodies) into bytes."""
+
+    writer = _Writer()
+    root = writer.ref(obj)
+    return writer.to_bytes(root)
+
+
+def _words(data: memoryview, start: int, count: int) -> memoryview | list[int]:
+    """View of `count` little-endian `uint32` from `start` position, without copying."""
+
+    view = data[start : start + count * _WORD]
+
+    if sys.byteorder == "little":
+        return view.cast("I")
+
+    return list(struct.unpack(f"<{count}I", view))
+
+
+def _read(data: memoryview) -> Any:
+    if len(data) < len(MAGIC) + _HEADER.size or data[: len(MAGIC)] != MAGIC:
+        raise ValueError("not an H-hat binary code.")
+
+    version, n_strings, n_classes, n_records, n_refs, root = _HEADER.unpack_from(
+        data, len(MAGIC)
+    )
+
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported H-hat binary code version {version}.")
+
+    pos = len(MAGIC) + _HEADER.size
+    offsets = _words(data, pos, n_strings + 1)
+    pos += (n_strings + 1) * _WORD
+    classes = _words(data, pos, n_classes)
+    pos += n_classes * _WORD
+    records = _words(data, pos, n_records * _RECORD_WORDS)
+    pos += n_records * _RECORD_WORDS * _WORD
+    refs = _words(data, pos, n_refs)
+    blob = data[pos + n_refs * _WORD :]
+
+    try:
+        return _decode(root, offsets, classes, records, refs, blob)
+
+    finally:
+        # views on a memory-mapped file must be released before closing it
+        for view in (offsets, classes, records, refs, blob):
+            if isinstance(view, memoryview):
+                view.release()
+
+
+def _decode(
+    root: int,
+    offsets: Sequence[int],
+    classes: Sequence[int],
+    records: Sequence[int],
+    refs: Sequence[int],
+    blob: memoryview,
+) -> Any:
+    strings: list[str | None] = [None] * (len(offsets) - 1)
+
+    def string(idx: int) -> str:
+        if (value := strings[idx]) is None:
+            value = strings[idx] = str(blob[offsets[idx] : offsets[idx + 1]], "utf-8")
+
+        return value
+
+    try:
+        decoders = [_DECODERS[string(k)] for k in classes]
+
+    except KeyError as e:
+        raise ValueError(f"unknown class {e} on H-hat binary code.") from None
+
+    objs: list[Any] = []
+
+    def get(ref: int) -> Any:
+        match ref & 3:
+            case _Ref.RECORD.value:
+                return objs[ref >> 2]
+
+            case _Ref.STRING.value:
+                return string(ref >> 2)
+
+            case _:
+                return None
+
+    start = 0
+
+    for n in range(0, len(records), _RECORD_WORDS):
+        cls, name, count = records[n], records[n + 1], records[n + 2]
+        children = tuple(get(refs[k]) for k in range(start, start + count))
+        objs.append(decoders[cls](None if name == _NO_NAME else string(name), children))
+        start += count
+
+    return get(root)
+
+
+def loads(data: bytes | bytearray | memoryview) -> Any:
+    """Load an AST or IR code from bytes created by `dumps`."""
+
+    with memoryview(data) as view:
+        return _read(view)
+
+
+def dump(obj: Any, path: str | Path) -> Path:
+    """Serialize an AST or IR code into a file."""
+
+    path = Path(path)
+    path.write_bytes(dumps(obj))
+    return path
+
+
+def load(path: str | Path) -> Any:
+    """Load an AST or IR code from a file, memory-mapping it instead of reading it."""
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _read(view)
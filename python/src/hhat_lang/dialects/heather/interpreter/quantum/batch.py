@@ -0,0 +1,89 @@
+"""
+Batch of quantum programs. Each cast runs its own quantum program, and so its
+own sampler job. Independent casts, i.e. casts on different quantum data, can
+instead be collected while the code is evaluated, up to the point one of their
+results is needed, and then submitted together as a single sampler job with
+one circuit (PUB) per program::
+
+    batch = ProgramBatch()
+    batch.add(Program(qdata=Symbol("@a"), ...))
+    batch.add(Program(qdata=Symbol("@b"), ...))
+    results = batch.run()  # {Symbol("@a"): {...counts...}, Symbol("@b"): {...}}
+
+Each PUB result counts are routed back to the quantum data of the program that
+generated the circuit. Programs holding different sessions run as one job per
+session.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from hhat_lang.core.data.core import WorkingData
+from hhat_lang.core.error_handlers.errors import ErrorHandler
+from hhat_lang.dialects.heather.interpreter.quantum.program import CIRCUIT_PREPARERS, Program
+from hhat_lang.low_level.target_backend.qiskit.openqasm.code_executor import sample_circuits
+from hhat_lang.low_level.target_backend.qiskit.session import QiskitSession
+
+
+class ProgramBatch:
+    """Pending quantum programs to be executed together, by their quantum data."""
+
+    __slots__ = ("_programs",)
+
+    _programs: dict[WorkingData, Program]
+
+    def __init__(self):
+        self._programs = dict()
+
+    def add(self, program: Program) -> None:
+        """Add a pending program. Its quantum data must not have a pending program already."""
+
+        if program.qdata in self._programs:
+            raise ValueError(f"quantum data {program.qdata} already has a pending program.")
+
+        self._programs[program.qdata] = program
+
+    def run(self, debug: bool = False) -> dict[WorkingData, Any | ErrorHandler]:
+        """
+        Execute all the pending programs, a single job for each session, and return
+        their results by quantum data. The batch is empty afterwards.
+        """
+
+        sessions: dict[QiskitSession | None, list[Program]] = dict()
+
+        for program in self._programs.values():
+            sessions.setdefault(program.session, []).append(program)
+
+        results: dict[WorkingData, Any | ErrorHandler] = dict()
+
+        for session, programs in sessions.items():
+            circuits, circ_keys = [], []
+
+            for program in programs:
+                code = program.gen_code(debug)
+                circuit, circ_key = CIRCUIT_PREPARERS[type(code)](code)
+                circuits.append(circuit)
+                circ_keys.append(circ_key)
+
+            qdatas = [program.qdata for program in programs]
+            layouts = [program.layout for program in programs]
+            counts = sample_circuits(
+                circuits, qdatas, session=session, circ_keys=circ_keys, layouts=layouts
+            )
+
+            for program, res in zip(programs, counts):
+                program.release()
+                results[program.qdata] = res
+
+                if debug:
+                    print(res)
+
+        self._programs.clear()
+        return results
+
+    def __contains__(self, qdata: WorkingData) -> bool:
+        return qdata in self._programs
+
+    def __len__(self) -> int:
+        return len(self._programs)
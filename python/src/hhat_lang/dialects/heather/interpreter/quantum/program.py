@@ -46,9 +46,25 @@ from hhat_lang.core.memory.core import IndexManager
 from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRBlock
 
 # TODO: the imports below must come from the config file, not hardcoded
+from hhat_lang.low_level.quantum_lang.gate_list.gates import GateProgram
+from hhat_lang.low_level.target_backend.qiskit.gate_list.code_executor import (
+    execute_program as execute_gates,
+    prepare_circuit as prepare_gates,
+)
 from hhat_lang.low_level.target_backend.qiskit.openqasm.code_executor import (
-    execute_program,
+    execute_program as execute_qasm,
+    prepare_circuit as prepare_qasm,
 )
+from hhat_lang.low_level.target_backend.qiskit.session import QiskitSession
+
+
+EXECUTORS: dict[type, Callable] = {str: execute_qasm, GateProgram: execute_gates}
+"""target backend executor for each low-level language code type, e.g. OpenQASM
+code text or a gate list lowered straight from the IR"""
+
+CIRCUIT_PREPARERS: dict[type, Callable] = {str: prepare_qasm, GateProgram: prepare_gates}
+"""target backend circuit (and its cache key) for each low-level language code type,
+so many programs can be submitted together, see `ProgramBatch`"""
 
 
 class Program(BaseProgram):
@@ -60,6 +76,7 @@ class Program(BaseProgram):
         block: IRBlock,
         executor: BaseEvaluator,
         qlang: Type[BaseLowLevelQLang[WorkingData, IRBlock | BlockIR, IndexManager, BaseEvaluator]],
+        session: QiskitSession | None = None,
     ):
         if (
             isinstance(qdata, WorkingData)
@@ -72,13 +89,51 @@ class Program(BaseProgram):
             self._executor = executor
             self._qlang = qlang(self._qdata, self._block, self._idx, self._executor)
 
+            # target backend session, reused across runs; the default one if `None`
+            self._session = session
+
         else:
             raise ValueError(f"Quantum program got invalid parameters: {qdata=} | {idx=} {block=}")
 
-    def run(self, debug: bool = False) -> Any | ErrorHandler:
+    @property
+    def qdata(self) -> WorkingData:
+        return self._qdata
+
+    @property
+    def session(self) -> QiskitSession | None:
+        return self._session
+
+    @property
+    def layout(self) -> tuple[int, ...]:
+        """The quantum data indexes, i.e. the device qubit of each program qubit."""
+
+        return tuple(self._idx.in_use_by.get(self._qdata, ()))
+
+    def gen_code(self, debug: bool = False) -> Any:
+        """Low-level language code for the quantum data instructions."""
+
         qlang_code = self._qlang.gen_program()
 
         if debug:
             print(qlang_code)
 
-        return execute_program(qlang_code, self._qdata, debug)
+        return qlang_code
+
+    def release(self) -> None:
+        """
+        The cast consumes the quantum data, so its indexes can be reused. It also
+        ends the circuit, so they are reused with no need for a reset.
+        """
+
+        if self._qdata in self._idx.in_use_by:
+            self._idx.free(self._qdata)
+
+        self._idx.end_circuit()
+
+    def run(self, debug: bool = False) -> Any | ErrorHandler:
+        qlang_code = self.gen_code(debug)
+        res = EXECUTORS[type(qlang_code)](
+            qlang_code, self._qdata, debug, session=self._session, layout=self.layout
+        )
+        self.release()
+        return res
@@ -0,0 +1,111 @@
+"""
+Precompiled Heather parser artifact. Building the arpeggio `ParserPEG` from
+`grammar.peg` is the most expensive part of a cold start, so the build step
+below pickles the parser next to the grammar file, where `get_parser` can load
+it instead. To (re)build it, run::
+
+    python -m hhat_lang.dialects.heather.parsing.artifact
+
+The artifact starts with a header holding the grammar hash, the arpeggio version
+and the python version it was built with. If any of them does not match, the
+artifact is stale and the parser is built from the grammar as usual.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import arpeggio
+from arpeggio.cleanpeg import ParserPEG
+
+
+ARTIFACT_PATH = Path(__file__).parent.parent / "grammar" / "grammar.parser.pickle"
+
+
+def _artifact_header(grammar_key: str) -> dict[str, Any]:
+    return {
+        "grammar": grammar_key,
+        "arpeggio": arpeggio.__version__,
+        "python": tuple(sys.version_info[:2]),
+    }
+
+
+class _ParserPickler(pickle.Pickler):
+    """
+    Arpeggio parsers hold the text stream used for debug printing,
+    which cannot be pickled; it is stored as a reference instead.
+    """
+
+    def persistent_id(self, obj: Any) -> str | None:
+        if isinstance(obj, io.TextIOBase):
+            return "stdout"
+
+        return None
+
+
+class _ParserUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "stdout":
+            return sys.stdout
+
+        raise pickle.UnpicklingError(f"unknown persistent id {pid}.")
+
+
+def _dump_parser(parser: ParserPEG, grammar_key: str, file: BinaryIO) -> None:
+    pickle.dump(_artifact_header(grammar_key), file, protocol=pickle.HIGHEST_PROTOCOL)
+    _ParserPickler(file, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+
+
+def save_parser_artifact(
+    parser: ParserPEG, grammar_key: str, path: str | Path | None = None
+) -> Path:
+    """
+    Pickle a freshly built `parser` for the grammar with hash `grammar_key`.
+    The file is written to a temporary path first and then moved, so workers
+    reading it concurrently never see a partial artifact.
+    """
+
+    path = ARTIFACT_PATH if path is None else Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    with open(tmp_path, "wb") as f:
+        _dump_parser(parser, grammar_key, f)
+
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_parser_artifact(grammar_key: str, path: str | Path | None = None) -> ParserPEG | None:
+    """
+    Load the precompiled parser for the grammar with hash `grammar_key`. Returns
+    `None` when there is no artifact, or when it is stale or unreadable.
+    """
+
+    path = ARTIFACT_PATH if path is None else Path(path)
+
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, "rb") as f:
+
+            if pickle.load(f) != _artifact_header(grammar_key):
+                return None
+
+            parser = _ParserUnpickler(f).load()
+
+    except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+        return None
+
+    return parser if isinstance(parser, ParserPEG) else None
+
+
+if __name__ == "__main__":
+    from hhat_lang.dialects.heather.parsing.run import build_parser_artifact
+
+    print(f"parser artifact written to {build_parser_artifact()}")
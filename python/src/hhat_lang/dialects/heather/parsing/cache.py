@@ -0,0 +1,190 @@
+"""
+On-disk AST cache for the Heather parser. ASTs are stored under the project
+directory (`<project>/.hat_cache/ast`) and are content-addressed: the entry
+for a file is keyed by its content hash, inside a namespace directory named
+after the grammar hash and the hhat_lang version. Changing a file, the grammar
+or the package version thus always misses the cache, and `prune` removes the
+namespaces left behind.
+
+The cache size is capped; once it goes over the cap the least recently used
+entries (by modification time, refreshed on every hit) are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from shutil import rmtree
+from typing import Any
+
+from hhat_lang.core.code.ast import AST
+
+
+CACHE_DIR_NAME = ".hat_cache"
+AST_CACHE_DIR_NAME = "ast"
+AST_ENTRY_SUFFIX = ".ast"
+
+DEFAULT_MAX_CACHE_SIZE = 64 * 1024 * 1024
+"""default maximum size in bytes for the AST cache on disk"""
+
+
+def hhat_version() -> str:
+    try:
+        return version("hhat-lang")
+
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ASTCache:
+    """
+    Content-addressed cache of parsed ASTs stored on disk.
+
+    Properties
+        - `path`: directory of the current namespace entries
+        - `max_size`: maximum size in bytes of all the cached entries
+        - `size`: current size in bytes of all the cached entries
+
+    Methods
+        - `get`: given the file content, return its cached AST or `default`
+        - `set`: given the file content and its AST, store it in the cache
+        - `invalidate`: given the file content, remove its entry
+        - `prune`: remove entries from other grammar hashes or hhat_lang versions
+        - `clear`: remove all the entries
+    """
+
+    _root: Path
+    _path: Path
+    _max_size: int
+    _size: int | None
+
+    def __init__(
+        self,
+        project_path: str | Path,
+        grammar_key: str,
+        max_size: int = DEFAULT_MAX_CACHE_SIZE,
+    ):
+        self._root = Path(project_path) / CACHE_DIR_NAME / AST_CACHE_DIR_NAME
+        self._path = self._root / f"{hhat_version()}-{grammar_key[:16]}"
+        self._max_size = max_size
+        self._size = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(k.stat().st_size for k in self._entries())
+
+        return self._size
+
+    def _entry(self, content: str) -> Path:
+        return self._path / f"{content_hash(content)}{AST_ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        if not self._root.exists():
+            return []
+
+        return list(self._root.glob(f"*/*{AST_ENTRY_SUFFIX}"))
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its maximum size."""
+
+        entries = []
+
+        for k in self._entries():
+            try:
+                stat = k.stat()
+
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime_ns, stat.st_size, k))
+
+        entries.sort(key=lambda x: x[0])
+        size = sum(k[1] for k in entries)
+
+        for _, entry_size, entry in entries:
+            if size <= self._max_size:
+                break
+
+            entry.unlink(missing_ok=True)
+            size -= entry_size
+
+        self._size = size
+
+    def get(self, content: str, default: Any = None) -> AST | Any:
+        """
+        Cached AST for the content, or `default` on a miss. A cached AST may be
+        `None` itself, so pass a `default` that is not to tell them apart.
+        """
+
+        entry = self._entry(content)
+
+        try:
+            with open(entry, "rb") as f:
+                ast = pickle.load(f)
+
+        except FileNotFoundError:
+            return default
+
+        except (OSError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+            # corrupted or outdated entry
+            self.invalidate(content)
+            return default
+
+        # refresh the entry for the LRU eviction
+        os.utime(entry)
+        return ast
+
+    def set(self, content: str, ast: AST) -> None:
+        entry = self._entry(content)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+
+        with open(tmp_entry, "wb") as f:
+            pickle.dump(ast, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # size before replacing the entry, discounting the entry it overwrites
+        size = self.size - (entry.stat().st_size if entry.exists() else 0)
+        os.replace(tmp_entry, entry)
+        self._size = size + entry.stat().st_size
+
+        if self._size > self._max_size:
+            self._evict()
+
+    def invalidate(self, content: str) -> None:
+        self._entry(content).unlink(missing_ok=True)
+        self._size = None
+
+    def prune(self) -> None:
+        """Remove the entries from other grammar hashes or hhat_lang versions."""
+
+        if self._root.exists():
+
+            for k in self._root.iterdir():
+
+                if k != self._path:
+                    rmtree(k, ignore_errors=True)
+
+        self._size = None
+
+    def clear(self) -> None:
+        rmtree(self._root, ignore_errors=True)
+        self._size = None
+
+    def __contains__(self, content: str) -> bool:
+        return self._entry(content).exists()
@@ -1,47 +1,526 @@
-"""To handle the `imports` part, for both types and functions"""
+"""
+To handle the `imports` part, for both types and functions.
+
+Imports are resolved against the project layout (see `parsing.project`): types
+live in `src/hat_types/` and functions in `src/`. An import name is mapped to
+the file of its longest existing prefix, so `geometry.point` is the
+`hat_types/geometry/point.hat` file or, if there is none, the `point` type
+inside `hat_types/geometry.hat`.
+
+The `ImportResolver` builds the module dependency graph once, loading (parsing)
+each module exactly once no matter how many modules import it. Modules found
+at the same depth of the graph do not depend on each other's loading, so each
+depth is loaded concurrently by a pool of processes.
+"""
 
 from __future__ import annotations
 
-import os
-from functools import reduce
-from operator import iconcat
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from enum import Enum, auto
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
+
+from arpeggio import NonTerminal, ParseTreeNode, visit_parse_tree
 
 from hhat_lang.core.code.ast import AST
+from hhat_lang.core.error_handlers.errors import (
+    ErrorHandler,
+    ImportCycleError,
+    ImportNotFoundError,
+)
 
 from hhat_lang.dialects.heather.code.ast import (
+    Id,
     Imports,
     CompositeId,
-    CompositeIdWithClosure
+    CompositeIdWithClosure,
+    FnImport,
+    TypeImport,
+)
+from hhat_lang.dialects.heather.parsing.project import (
+    HAT_FILE_SUFFIX,
+    PROJECT_SRC_DIR,
+    PROJECT_TYPES_DIR,
+    module_name,
 )
+from hhat_lang.dialects.heather.parsing.run import parse_to_tree
+from hhat_lang.dialects.heather.parsing.visitor import ParserVisitor
+from hhat_lang.toolchain.project.utils import str_to_path
+
+
+class ImportKind(Enum):
+    TYPE = auto()
+    FN = auto()
+
+
+ImportName = tuple[str, ...]
+"""an import name split by its `.`, e.g. `geometry.point` is `("geometry", "point")`"""
+
+
+################
+# IMPORT NAMES #
+################
+
+def _tree_import_names(node: ParseTreeNode) -> tuple[ImportName, ...]:
+    match node.rule_name:
+
+        case "simple_id":
+            return (node.value,),
+
+        case "composite_id":
+            return tuple(k.value for k in node if k.rule_name == "simple_id"),
+
+        case "composite_id_with_closure":
+            prefix, *members = (k for k in node if k.rule_name)
+            (prefix_name,) = _tree_import_names(prefix)
+            return tuple(
+                prefix_name + k for member in members for k in _tree_import_names(member)
+            )
+
+        case _:
+            if isinstance(node, NonTerminal):
+                return tuple(
+                    k for child in node if child.rule_name for k in _tree_import_names(child)
+                )
+
+            return ()
+
+
+def tree_imports(tree: ParseTreeNode) -> tuple[tuple[ImportKind, ImportName], ...]:
+    """All the imports from a parse tree, in the order they appear in the code."""
+
+    res: tuple[tuple[ImportKind, ImportName], ...] = ()
+
+    if not isinstance(tree, NonTerminal):
+        return res
+
+    for k in tree:
+
+        match k.rule_name:
+
+            case "typeimport":
+                res += tuple((ImportKind.TYPE, n) for n in _tree_import_names(k))
+
+            case "fnimport":
+                res += tuple((ImportKind.FN, n) for n in _tree_import_names(k))
+
+            case "imports":
+                res += tree_imports(k)
+
+    return res
+
+
+def import_names(code: Id | CompositeId | CompositeIdWithClosure) -> tuple[ImportName, ...]:
+    """Import names from the AST import nodes."""
+
+    match code:
+
+        case Id():
+            return (code.name,),
+
+        case CompositeId():
+            return tuple(k.name for k in code),
+
+        case CompositeIdWithClosure():
+            name, members = code.value
+            (prefix,) = import_names(name)
+            return tuple(prefix + k for member in members for k in import_names(member))
+
+        case _:
+            raise ValueError(f"invalid import syntax\n  =>\n{code}\n")
+
+
+###########
+# MODULES #
+###########
+
+class ImportedModule:
+    """
+    A loaded module, i.e. an H-hat file already parsed.
+
+    Properties
+        - `name`: module name
+        - `path`: module file path
+        - `ast`: the module AST
+        - `imports`: the imports, as pairs of `ImportKind` and `ImportName`
+    """
+
+    _name: str
+    _path: Path
+    _ast: AST
+    _imports: tuple[tuple[ImportKind, ImportName], ...]
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        ast: AST,
+        imports: tuple[tuple[ImportKind, ImportName], ...],
+    ):
+        self._name = name
+        self._path = path
+        self._ast = ast
+        self._imports = imports
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def ast(self) -> AST:
+        return self._ast
+
+    @property
+    def imports(self) -> tuple[tuple[ImportKind, ImportName], ...]:
+        return self._imports
+
+    def __repr__(self) -> str:
+        return f"ImportedModule({self._name})"
+
+
+def load_module(name: str, path: Path) -> ImportedModule:
+    """Read and parse a module file; runs inside the pool worker processes."""
+
+    with open(path, "r") as f:
+        tree = parse_to_tree(f.read())
+
+    return ImportedModule(name, path, visit_parse_tree(tree, ParserVisitor()), tree_imports(tree))
+
+
+class ImportGraph:
+    """
+    Module dependency graph from some entry modules.
+
+    Properties
+        - `modules`: dictionary with module name as key and `ImportedModule` as value
+        - `graph`: dictionary with module name as key and the modules it imports as value
+        - `order`: module names in dependency order, i.e. each one after its imports
+    """
+
+    _modules: dict[str, ImportedModule]
+    _graph: dict[str, tuple[str, ...]]
+    _order: tuple[str, ...]
+
+    def __init__(
+        self,
+        modules: dict[str, ImportedModule],
+        graph: dict[str, tuple[str, ...]],
+        order: tuple[str, ...],
+    ):
+        self._modules = modules
+        self._graph = graph
+        self._order = order
+
+    @property
+    def modules(self) -> dict[str, ImportedModule]:
+        return self._modules
+
+    @property
+    def graph(self) -> dict[str, tuple[str, ...]]:
+        return self._graph
+
+    @property
+    def order(self) -> tuple[str, ...]:
+        return self._order
+
+    def __getitem__(self, module: str) -> ImportedModule:
+        return self._modules[module]
+
+    def __contains__(self, module: str) -> bool:
+        return module in self._modules
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+
+def _sort_modules(
+    entries: Iterable[str], graph: dict[str, tuple[str, ...]]
+) -> tuple[str, ...] | ImportCycleError:
+    """Depth-first topological sort of the modules reachable from `entries`."""
+
+    order: list[str] = []
+    done: set[str] = set()
+
+    for entry in entries:
+
+        if entry in done:
+            continue
+
+        path: list[str] = [entry]
+        stack: list[Iterable[str]] = [iter(graph[entry])]
+
+        while stack:
+
+            if (dep := next(stack[-1], None)) is None:
+                stack.pop()
+                done.add(module := path.pop())
+                order.append(module)
+
+            elif dep in path:
+                return ImportCycleError(tuple(path[path.index(dep):]) + (dep,))
+
+            elif dep not in done:
+                path.append(dep)
+                stack.append(iter(graph[dep]))
+
+    return tuple(order)
+
+
+############
+# RESOLVER #
+############
+
+class ImportResolver:
+    """
+    Resolves the imports of a project into a module dependency graph. Found
+    modules, loaded modules and built modules are all memoized, so a module
+    imported by many others is resolved, parsed and built once.
+
+    Methods
+        - `find`: given the import kind and name, return the module name it refers to
+        - `resolve`: given the entry modules, load them and all their imports into an `ImportGraph`
+        - `build`: given an `ImportGraph` and a builder function, build each module once
+    """
+
+    _src_path: Path
+    _workers: int
+    _found: dict[tuple[ImportKind, ImportName], str]
+    _paths: dict[str, Path]
+    _modules: dict[str, ImportedModule]
+    _graph: dict[str, tuple[str, ...]]
+    _built: dict[str, Any]
+
+    def __init__(self, project_path: str | Path, workers: int = 1):
+        self._src_path = str_to_path(project_path) / PROJECT_SRC_DIR
+        self._workers = workers
+        self._found = dict()
+        self._paths = dict()
+        self._modules = dict()
+        self._graph = dict()
+        self._built = dict()
+
+    @property
+    def modules(self) -> dict[str, ImportedModule]:
+        """All the modules loaded so far."""
+
+        return self._modules
+
+    def _base_path(self, kind: ImportKind) -> Path:
+        return self._src_path / PROJECT_TYPES_DIR if kind == ImportKind.TYPE else self._src_path
+
+    def find(
+        self, kind: ImportKind, name: ImportName, importer: str | None = None
+    ) -> str | ImportNotFoundError:
+        if (module := self._found.get((kind, name), None)) is not None:
+            return module
+
+        base_path = self._base_path(kind)
+
+        for n in range(len(name), 0, -1):
+            path = base_path.joinpath(*name[:n]).with_suffix(HAT_FILE_SUFFIX)
+
+            if path.is_file():
+                module = module_name(self._src_path, path)
+                self._found[(kind, name)] = module
+                self._paths[module] = path
+                return module
+
+        return ImportNotFoundError(name, importer)
+
+    def _entry(self, entry: str | Path) -> str | ImportNotFoundError:
+        if isinstance(entry, Path):
+            path = entry.resolve()
+
+            if not path.is_relative_to(src_path := self._src_path.resolve()):
+                return ImportNotFoundError(str(entry))
+
+            entry = module_name(src_path, path)
+
+        else:
+            path = self._src_path.joinpath(*entry.split(".")).with_suffix(HAT_FILE_SUFFIX)
+
+        if not path.is_file():
+            return ImportNotFoundError(entry)
+
+        self._paths[entry] = path
+        return entry
+
+    def _load(self, modules: list[str], pool: ProcessPoolExecutor | None) -> Iterable[ImportedModule]:
+        paths = [self._paths[k] for k in modules]
+
+        if pool is None or len(modules) == 1:
+            return map(load_module, modules, paths)
+
+        return pool.map(load_module, modules, paths)
+
+    def resolve(self, *entries: str | Path) -> ImportGraph | ErrorHandler:
+        """
+        Load the entry modules (module names or file paths; `main` by default)
+        and, transitively, everything they import.
+        """
+
+        names: list[str] = []
+
+        for entry in entries or ("main",):
+
+            if isinstance(name := self._entry(entry), ErrorHandler):
+                return name
+
+            names.append(name)
+
+        # only modules whose imports were all found have graph edges; the others
+        # are (re)visited, without loading again the ones already loaded
+        frontier = [k for k in dict.fromkeys(names) if k not in self._graph]
+        added: list[str] = []
+        use_pool = self._workers > 1
+
+        with ProcessPoolExecutor(self._workers) if use_pool else nullcontext() as pool:
+
+            while frontier:
+                new_frontier: dict[str, None] = dict()
+
+                # the whole frontier is stored before looking at its imports, so a
+                # module imported by a sibling in the frontier is not loaded again
+                for module in self._load([k for k in frontier if k not in self._modules], pool):
+                    self._modules[module.name] = module
+
+                for module in (self._modules[k] for k in frontier):
+                    deps: dict[str, None] = dict()
+
+                    for kind, name in module.imports:
+
+                        if isinstance(dep := self.find(kind, name, module.name), ErrorHandler):
+                            # drop this call's edges, so modules depending on the
+                            # missing one are not taken as resolved later on
+                            for k in added:
+                                del self._graph[k]
+
+                            return dep
+
+                        deps[dep] = None
+
+                        if dep not in self._graph and dep not in frontier:
+                            new_frontier[dep] = None
+
+                    self._graph[module.name] = tuple(deps)
+                    added.append(module.name)
+
+                frontier = list(new_frontier)
+
+        if isinstance(order := _sort_modules(names, self._graph), ErrorHandler):
+            return order
+
+        return ImportGraph(
+            {k: self._modules[k] for k in order},
+            {k: self._graph[k] for k in order},
+            order,
+        )
+
+    def build(
+        self, graph: ImportGraph, builder: Callable[[ImportedModule], Any]
+    ) -> dict[str, Any]:
+        """
+        Build the graph modules in dependency order with `builder`. Each module is
+        built once per resolver; later calls reuse the previous result.
+        """
+
+        for k in graph.order:
+
+            if k not in self._built:
+                self._built[k] = builder(graph[k])
+
+        return {k: self._built[k] for k in graph.order}
+
+
+_DEFAULT_RESOLVERS: dict[Path, ImportResolver] = dict()
+
+
+def default_resolver() -> ImportResolver:
+    """Import resolver for the project at the current working directory."""
+
+    project_path = Path(".").resolve()
+
+    if (resolver := _DEFAULT_RESOLVERS.get(project_path, None)) is None:
+        resolver = ImportResolver(project_path)
+        _DEFAULT_RESOLVERS[project_path] = resolver
+
+    return resolver
+
+
+#####################
+# AST IMPORTS NODES #
+#####################
+
+def _find_imports(
+    kind: ImportKind, names: tuple[ImportName, ...], resolver: ImportResolver | None
+) -> tuple[str, ...] | ErrorHandler:
+    resolver = default_resolver() if resolver is None else resolver
+    res: tuple[str, ...] = ()
+
+    for name in names:
+
+        if isinstance(module := resolver.find(kind, name), ErrorHandler):
+            return module
+
+        res += module,
+
+    return res
+
+
+def parse_types(
+    code: TypeImport, resolver: ImportResolver | None = None
+) -> tuple[str, ...] | ErrorHandler:
+    names = tuple(n for k in code for n in import_names(k))
+    return _find_imports(ImportKind.TYPE, names, resolver)
+
+
+def parse_types_compositeid(
+    code: CompositeId, resolver: ImportResolver | None = None
+) -> tuple[str, ...] | ErrorHandler:
+    return _find_imports(ImportKind.TYPE, import_names(code), resolver)
+
+
+def parse_types_compositeidwithclosure(
+    code: CompositeIdWithClosure, resolver: ImportResolver | None = None
+) -> tuple[str, ...] | ErrorHandler:
+    return _find_imports(ImportKind.TYPE, import_names(code), resolver)
 
 
-def parse_types(code: Any) -> Any:
-    pass
+def parse_fns(
+    code: FnImport, resolver: ImportResolver | None = None
+) -> tuple[str, ...] | ErrorHandler:
+    names = tuple(n for k in code for n in import_names(k))
+    return _find_imports(ImportKind.FN, names, resolver)
 
 
-def parse_types_compositeid(code: CompositeId) -> Any:
-    # get the type path from the code
-    type_path = Path(*reduce(iconcat, code.value, ()))
-    # join the type path with its full path from the project path
-    type_path = Path(".").resolve() / "hhat_types" / type_path
-    # add .hat for the type file name (which should be the last item in the tuple)
-    file_name = type_path.name + ".hat"
-    full_path = type_path.parent / file_name
+def parse_imports(
+    code: Imports, resolver: ImportResolver | None = None
+) -> tuple[str, ...] | ErrorHandler:
+    """Module names from all the type and function imports."""
 
-    if full_path.exists():
-        data = open(full_path, "r").read()
+    res: tuple[str, ...] = ()
+    type_imports, fn_imports = code.value
 
+    for k in (*type_imports, *fn_imports):
 
-def parse_types_compositeidwithclosure(code: CompositeIdWithClosure) -> Any:
-    pass
+        match k:
+            case TypeImport():
+                modules = parse_types(k, resolver)
 
+            case FnImport():
+                modules = parse_fns(k, resolver)
 
-def parse_fns(code: Any) -> Any:
-    pass
+            case _:
+                raise ValueError(f"invalid import syntax\n  =>\n{k}\n")
 
+        if isinstance(modules, ErrorHandler):
+            return modules
 
-def parse_imports(code: Imports) -> Any:
-    pass
+        res += modules
 
+    return res
@@ -0,0 +1,352 @@
+"""
+Incremental parsing for notebooks and editors, where the same cell or file is
+parsed again after every small edit.
+
+The code is split into its top-level constructs (`use(...)`, `type ...`,
+`fn ...` and `main {...}`) by a light scan that tracks brackets, strings,
+comments and where each construct ends, so a keyword used as a name (e.g.
+`fn main () u64 {...}`) does not start a new construct. Constructs whose
+text did not change since the previous parse keep their previous AST; only
+the edited ones are parsed, each with a parser rooted at its grammar rule.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterator
+
+from arpeggio import NoMatch, visit_parse_tree
+
+from hhat_lang.dialects.heather.grammar import WHITESPACE
+from hhat_lang.dialects.heather.parsing.run import parse_to_tree
+from hhat_lang.dialects.heather.parsing.visitor import ParserVisitor
+
+
+TOPLEVEL_RULES: dict[str, str] = {
+    "use": "imports",
+    "type": "type_file",
+    "fn": "fns",
+    "main": "main",
+}
+"""top-level keywords and the grammar rule of the construct they start"""
+
+_TOKENS = re.compile(
+    r'"[^"]*"'
+    r"|//[^\n]*(?:\n|$)"
+    r"|/-.*?-/"
+    r"|(?P<open>[{(\[<])"
+    r"|(?P<close>[})\]>])"
+    r"|(?P<colon>:)"
+    r"|(?P<word>@?[a-zA-Z][\w\-]*(?:\.@?[\w\-]+)*)",
+    re.DOTALL,
+)
+
+# what ends the current top-level construct, see `_toplevel_starts`
+_ENDED, _GROUP, _BODY, _TYPE_NAME, _TYPE_DEF, _TYPE_VALUE = range(6)
+
+_KEYWORD_STATE = {"use": _GROUP, "type": _TYPE_NAME, "fn": _BODY, "main": _BODY}
+
+_BLANK = re.compile(rf"(?:[{re.escape(WHITESPACE)}]+|//[^\n]*(?:\n|$)|/-.*?-/)*", re.DOTALL)
+
+_PROGRAM_ORDER = re.compile(r"i*(t*|f*m?)")
+"""valid order of the top-level constructs, following the `program` grammar rule"""
+
+_RULE_LETTER = {"imports": "i", "type_file": "t", "fns": "f", "main": "m"}
+
+
+class TopLevelNode:
+    """
+    A top-level construct of the code.
+
+    Properties
+        - `rule`: grammar rule of the construct, e.g. `fns`
+        - `start`: construct start position on the code
+        - `end`: construct end position on the code
+        - `text`: construct code
+        - `ast`: construct AST
+    """
+
+    _rule: str
+    _start: int
+    _end: int
+    _text: str
+    _ast: Any
+
+    def __init__(self, rule: str, start: int, end: int, text: str, ast: Any):
+        self._rule = rule
+        self._start = start
+        self._end = end
+        self._text = text
+        self._ast = ast
+
+    @property
+    def rule(self) -> str:
+        return self._rule
+
+    @property
+    def start(self) -> int:
+        return self._start
+
+    @property
+    def end(self) -> int:
+        return self._end
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def ast(self) -> Any:
+        return self._ast
+
+    def __repr__(self) -> str:
+        return f"TopLevelNode({self._rule}[{self._start}:{self._end}])"
+
+
+def _toplevel_starts(code: str, pos: int = 0) -> Iterator[tuple[str, int]]:
+    """
+    Rule and start position of the top-level constructs from `pos` on, which must
+    be a construct boundary. A keyword only starts a construct once the previous
+    one ended, following the grammar rules:
+
+    - `use (...)` ends with its parenthesis
+    - `fn name (...) type? {...}` and `main {...}` end with their body
+    - `type name {...}` (or `type name union {...}`) ends with its braces, and
+      `type name:value` with its value (`id` or `[id]`)
+    """
+
+    depth = 0
+    opener = ""
+    state = _ENDED
+
+    for m in _TOKENS.finditer(code, pos):
+
+        if open_ := m.group("open"):
+            if depth == 0:
+                opener = open_
+
+            depth += 1
+
+        elif m.group("close"):
+            depth -= 1
+
+            if depth == 0 and (
+                state == _GROUP and opener == "("
+                or state in (_BODY, _TYPE_DEF) and opener == "{"
+                or state == _TYPE_VALUE and opener == "["
+            ):
+                state = _ENDED
+
+        elif depth != 0:
+            continue
+
+        elif m.group("colon"):
+            if state == _TYPE_DEF:
+                state = _TYPE_VALUE
+
+        elif state == _ENDED and (word := m.group("word")) in _KEYWORD_STATE:
+            state = _KEYWORD_STATE[word]
+            yield TOPLEVEL_RULES[word], m.start()
+
+        elif state == _TYPE_NAME:
+            state = _TYPE_DEF
+
+        elif state == _TYPE_VALUE:
+            state = _ENDED
+
+
+def split_toplevel(code: str) -> tuple[tuple[str, int, int], ...] | None:
+    """
+    Split the code into its top-level constructs, as `(rule, start, end)`
+    tuples. Returns `None` if the code cannot be split, for instance if
+    there is some code before the first top-level keyword.
+    """
+
+    starts = list(_toplevel_starts(code))
+    first = starts[0][1] if starts else len(code)
+
+    if _BLANK.fullmatch(code, 0, first) is None:
+        return None
+
+    ends = [k for _, k in starts[1:]] + [len(code)]
+    return tuple((rule, start, end) for (rule, start), end in zip(starts, ends))
+
+
+class IncrementalParser:
+    """
+    Keeps the top-level constructs from the last parsed code, so the next parse
+    only parses the constructs that changed.
+
+    Properties
+        - `code`: the last parsed code
+        - `nodes`: the last parsed `TopLevelNode`s
+        - `ast`: the ASTs from the last parsed top-level constructs
+        - `reused`: number of constructs reused on the last parse
+        - `reparsed`: number of constructs parsed on the last parse
+
+    Methods
+        - `parse`: parse the whole new code, reusing the unchanged constructs
+        - `edit`: replace the code between two positions and parse it
+    """
+
+    _code: str
+    _nodes: tuple[TopLevelNode, ...]
+    _reused: int
+    _reparsed: int
+
+    def __init__(self):
+        self._code = ""
+        self._nodes = ()
+        self._reused = 0
+        self._reparsed = 0
+
+    @property
+    def code(self) -> str:
+        return self._code
+
+    @property
+    def nodes(self) -> tuple[TopLevelNode, ...]:
+        return self._nodes
+
+    @property
+    def ast(self) -> tuple[Any, ...]:
+        return tuple(k.ast for k in self._nodes)
+
+    @property
+    def reused(self) -> int:
+        return self._reused
+
+    @property
+    def reparsed(self) -> int:
+        return self._reparsed
+
+    def _parse_whole(self, code: str) -> tuple[Any, ...]:
+        """
+        Parse the whole code, when its top-level constructs could not be parsed
+        on their own. It raises the parsing error, with the right position on the
+        code; otherwise the nodes are the constructs from the whole code parse.
+        """
+
+        tree = parse_to_tree(code)
+
+        if _BLANK.fullmatch(code, tree.position_end) is None:
+            raise ValueError(f"unexpected code at position {tree.position_end}.")
+
+        trees = [tree] if tree.rule_name in _RULE_LETTER else [
+            k for k in tree if k.rule_name in _RULE_LETTER
+        ]
+        ends = [k.position for k in trees[1:]] + [len(code)]
+
+        self._code = code
+        self._nodes = tuple(
+            TopLevelNode(
+                k.rule_name,
+                k.position,
+                end,
+                code[k.position : end],
+                visit_parse_tree(k, ParserVisitor()),
+            )
+            for k, end in zip(trees, ends)
+        )
+        self._reparsed = len(self._nodes)
+        self._reused = 0
+        return self.ast
+
+    @staticmethod
+    def _parse_node(rule: str, text: str, start: int) -> Any:
+        tree = parse_to_tree(text, rule)
+
+        if _BLANK.fullmatch(text, tree.position_end) is None:
+            raise ValueError(f"unexpected code at position {start + tree.position_end}.")
+
+        return visit_parse_tree(tree, ParserVisitor())
+
+    def _update(
+        self,
+        code: str,
+        head: tuple[TopLevelNode, ...],
+        split: tuple[tuple[str, int, int], ...],
+        tail: tuple[TopLevelNode, ...],
+        previous: tuple[TopLevelNode, ...],
+    ) -> tuple[Any, ...]:
+        """
+        Set the new nodes: `head` nodes are kept, `split` constructs are parsed
+        unless their text is the same as one of `previous` nodes, and `tail`
+        nodes are kept too (after `split`).
+        """
+
+        rules = [k.rule for k in head] + [k[0] for k in split] + [k.rule for k in tail]
+
+        if _PROGRAM_ORDER.fullmatch("".join(_RULE_LETTER[k] for k in rules)) is None:
+            return self._parse_whole(code)
+
+        previous_asts = {(k.rule, k.text): k.ast for k in previous}
+        nodes: list[TopLevelNode] = []
+
+        for rule, start, end in split:
+            text = code[start:end]
+
+            if (rule, text) in previous_asts:
+                ast = previous_asts[(rule, text)]
+
+            else:
+                try:
+                    ast = self._parse_node(rule, text, start)
+
+                except (NoMatch, ValueError):
+                    return self._parse_whole(code)
+
+                self._reparsed += 1
+
+            nodes.append(TopLevelNode(rule, start, end, text, ast))
+
+        self._code = code
+        self._nodes = head + tuple(nodes) + tail
+        self._reused = len(self._nodes) - self._reparsed
+        return self.ast
+
+    def parse(self, code: str) -> tuple[Any, ...]:
+        """Parse the code, returning the ASTs of its top-level constructs."""
+
+        if (split := split_toplevel(code)) is None:
+            return self._parse_whole(code)
+
+        self._reparsed = 0
+        return self._update(code, (), split, (), self._nodes)
+
+    def edit(self, start: int, end: int, text: str) -> tuple[Any, ...]:
+        """
+        Replace the code from `start` to `end` positions by `text` and parse it.
+        Only the code from the construct where the edit starts is scanned again,
+        until a construct start lines up with the previous code again.
+        """
+
+        code = self._code[:start] + text + self._code[end:]
+        nodes = self._nodes
+        first = next((n for n, k in reversed(tuple(enumerate(nodes))) if k.start < start), None)
+
+        if first is None:
+            return self.parse(code)
+
+        delta = len(text) - (end - start)
+        old_starts = {k.start + delta: n for n, k in enumerate(nodes) if k.start >= end}
+        starts: list[tuple[str, int]] = []
+        resync = len(nodes)
+
+        for rule, pos in _toplevel_starts(code, nodes[first].start):
+
+            if pos >= start + len(text) and pos in old_starts:
+                resync = old_starts[pos]
+                break
+
+            starts.append((rule, pos))
+
+        tail = tuple(
+            TopLevelNode(k.rule, k.start + delta, k.end + delta, k.text, k.ast)
+            for k in nodes[resync:]
+        )
+        ends = [k for _, k in starts[1:]] + [tail[0].start if tail else len(code)]
+        split = tuple((rule, pos, end) for (rule, pos), end in zip(starts, ends))
+
+        self._reparsed = 0
+        return self._update(code, nodes[:first], split, tail, nodes[first:resync])
@@ -0,0 +1,182 @@
+"""
+Parse a whole H-hat project, i.e. the `src/` folder created by
+`hhat_lang.toolchain.project.new.create_new_project`::
+
+    project_name/
+        src/
+            main.hat
+            hat_types/
+                ...
+
+Files are parsed in parallel by a pool of processes. Each module is named
+after its path relative to `src/`, without the `.hat` extension and with
+`.` as separator, e.g. `src/hat_types/geometry/point.hat` is the
+`hat_types.geometry.point` module.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from hhat_lang.core.code.ast import AST
+from hhat_lang.dialects.heather.parsing.cache import ASTCache, CACHE_DIR_NAME
+from hhat_lang.dialects.heather.parsing.run import get_ast_cache, parse_file
+from hhat_lang.toolchain.project.utils import str_to_path
+
+
+HAT_FILE_SUFFIX = ".hat"
+PROJECT_SRC_DIR = "src"
+PROJECT_TYPES_DIR = "hat_types"
+
+
+class ParsedProject:
+    """
+    Result of parsing a project.
+
+    Properties
+        - `asts`: dictionary with module name as key and its AST as value
+        - `files`: dictionary with module name as key and its file path as value
+        - `timings`: dictionary with module name as key and its parsing time (seconds) as value
+        - `total_time`: wall time (seconds) to parse the whole project
+    """
+
+    _asts: dict[str, AST]
+    _files: dict[str, Path]
+    _timings: dict[str, float]
+    _total_time: float
+
+    def __init__(
+        self,
+        asts: dict[str, AST],
+        files: dict[str, Path],
+        timings: dict[str, float],
+        total_time: float,
+    ):
+        self._asts = asts
+        self._files = files
+        self._timings = timings
+        self._total_time = total_time
+
+    @property
+    def asts(self) -> dict[str, AST]:
+        return self._asts
+
+    @property
+    def files(self) -> dict[str, Path]:
+        return self._files
+
+    @property
+    def timings(self) -> dict[str, float]:
+        return self._timings
+
+    @property
+    def total_time(self) -> float:
+        return self._total_time
+
+    def __getitem__(self, module: str) -> AST:
+        return self._asts[module]
+
+    def __contains__(self, module: str) -> bool:
+        return module in self._asts
+
+    def __len__(self) -> int:
+        return len(self._asts)
+
+    def __repr__(self) -> str:
+        return f"ParsedProject({len(self)} modules in {self._total_time:.3f}s)"
+
+
+def module_name(src_path: Path, file: Path) -> str:
+    """Module name of a `.hat` file given the project's `src/` path."""
+
+    return ".".join(file.relative_to(src_path).with_suffix("").parts)
+
+
+def discover_files(project_path: str | Path) -> dict[str, Path]:
+    """All the `.hat` files from the project's `src/` folder, keyed by module name."""
+
+    src_path = str_to_path(project_path) / PROJECT_SRC_DIR
+
+    if not src_path.is_dir():
+        raise ValueError(f"project '{project_path}' has no '{PROJECT_SRC_DIR}' folder.")
+
+    return {
+        module_name(src_path, k): k
+        for k in sorted(src_path.rglob(f"*{HAT_FILE_SUFFIX}"))
+        if k.is_file() and CACHE_DIR_NAME not in k.parts
+    }
+
+
+_worker_cache: ASTCache | None = None
+"""AST cache of the project being parsed, created once per worker process"""
+
+
+def _init_worker(project_path: Path | None) -> None:
+    global _worker_cache
+
+    _worker_cache = None if project_path is None else get_ast_cache(project_path)
+
+
+def _parse_project_file(file: Path, cache: ASTCache | None) -> tuple[AST, float]:
+    start = time.perf_counter()
+    ast = parse_file(file, cache=cache)
+    return ast, time.perf_counter() - start
+
+
+def _parse_worker_file(file: Path) -> tuple[AST, float]:
+    """Parse a single project file; runs inside the pool worker processes."""
+
+    return _parse_project_file(file, _worker_cache)
+
+
+def parse_project(
+    project_path: str | Path,
+    workers: int | None = None,
+    use_cache: bool = True,
+) -> ParsedProject:
+    """
+    Parse all the `.hat` files of a project.
+
+    Args:
+        project_path: the project root folder
+        workers: number of worker processes; defaults to the number of CPUs,
+            and with `1` files are parsed serially in the current process
+        use_cache: whether to use the project's on-disk AST cache
+
+    Returns:
+        A `ParsedProject` with the ASTs and parsing times keyed by module name.
+    """
+
+    start = time.perf_counter()
+    project_path = str_to_path(project_path)
+    files = discover_files(project_path)
+    cache_path = project_path if use_cache else None
+    workers = min(workers or os.cpu_count() or 1, max(len(files), 1))
+
+    asts: dict[str, AST] = dict()
+    timings: dict[str, float] = dict()
+
+    # the cache is created once per process, so its size is computed once and then
+    # kept up to date as entries are added, instead of for every file
+    if workers == 1:
+        cache = None if cache_path is None else get_ast_cache(cache_path)
+
+        for module, file in files.items():
+            asts[module], timings[module] = _parse_project_file(file, cache)
+
+    else:
+        # larger files first so the workers finish at about the same time
+        modules = sorted(files, key=lambda k: files[k].stat().st_size, reverse=True)
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(cache_path,)
+        ) as pool:
+            futures = {k: pool.submit(_parse_worker_file, files[k]) for k in modules}
+
+            for module in files:
+                asts[module], timings[module] = futures[module].result()
+
+    return ParsedProject(asts, files, timings, time.perf_counter() - start)
@@ -1,44 +1,158 @@
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
+from threading import RLock
 
-from arpeggio import visit_parse_tree
+from arpeggio import ParseTreeNode, visit_parse_tree
 from arpeggio.cleanpeg import ParserPEG
 
 from hhat_lang.core.code.ast import AST
 
 from hhat_lang.dialects.heather.grammar import WHITESPACE
+from hhat_lang.dialects.heather.parsing.artifact import (
+    load_parser_artifact,
+    save_parser_artifact,
+)
+from hhat_lang.dialects.heather.parsing.cache import ASTCache, DEFAULT_MAX_CACHE_SIZE
 from hhat_lang.dialects.heather.parsing.visitor import ParserVisitor
 
 
-def read_grammar() -> str:
-    grammar_path = Path(__file__).parent.parent / "grammar" / "grammar.peg"
+GRAMMAR_PATH = Path(__file__).parent.parent / "grammar" / "grammar.peg"
+
+_PARSER_LOCK = RLock()
+"""guards the parser cache and the parsers' usage, since an arpeggio
+parser keeps its parsing state in the instance"""
+
+_PARSER_CACHE: dict[tuple[str, str], ParserPEG] = dict()
+"""parsers built so far, keyed by their grammar content hash and root rule"""
 
-    if grammar_path.exists():
-        return open(grammar_path, "r").read()
+_GRAMMAR_SOURCE: tuple[int, str, str] | None = None
+"""last grammar read from disk: (modification time, content, content hash)"""
+
+_CACHE_MISS = object()
+"""AST cache miss marker, since a cached AST can be `None`"""
+
+
+def read_grammar() -> str:
+    if GRAMMAR_PATH.exists():
+        return open(GRAMMAR_PATH, "r").read()
 
     raise ValueError("No grammar found on the grammar directory.")
 
 
-def parse_grammar() -> ParserPEG:
-    grammar = read_grammar()
+def grammar_hash(grammar: str) -> str:
+    """Content hash of a grammar, used as the key for the parser cache."""
+
+    return hashlib.sha256(grammar.encode("utf-8")).hexdigest()
+
+
+def _grammar_source() -> tuple[str, str]:
+    """
+    Grammar content and its hash. The grammar file is only read again
+    when its modification time changes.
+    """
+
+    global _GRAMMAR_SOURCE
+
+    if not GRAMMAR_PATH.exists():
+        raise ValueError("No grammar found on the grammar directory.")
+
+    mtime = GRAMMAR_PATH.stat().st_mtime_ns
+
+    if _GRAMMAR_SOURCE is None or _GRAMMAR_SOURCE[0] != mtime:
+        grammar = read_grammar()
+        _GRAMMAR_SOURCE = (mtime, grammar, grammar_hash(grammar))
+
+    return _GRAMMAR_SOURCE[1], _GRAMMAR_SOURCE[2]
+
+
+def parse_grammar(grammar: str | None = None, root_rule: str = "program") -> ParserPEG:
+    """Build a new parser from the grammar. Prefer `get_parser` to reuse it."""
+
+    grammar = read_grammar() if grammar is None else grammar
     return ParserPEG(
         language_def=grammar,
-        root_rule_name="program",
+        root_rule_name=root_rule,
         comment_rule_name="comment",
         reduce_tree=True,
         ws=WHITESPACE
     )
 
 
+def get_parser(root_rule: str = "program") -> ParserPEG:
+    """
+    Get the process-wide Heather parser. It is built lazily on the first call
+    and cached by the grammar content hash, so the grammar is only compiled
+    again if `grammar.peg` changes. A precompiled parser artifact is used
+    instead of compiling the grammar whenever it is up-to-date.
+
+    Parsers for a single construct (e.g. `fns`) are given by `root_rule`.
+    """
+
+    with _PARSER_LOCK:
+        grammar, key = _grammar_source()
+
+        if (parser := _PARSER_CACHE.get((key, root_rule), None)) is None:
+            if root_rule != "program" or (parser := load_parser_artifact(key)) is None:
+                parser = parse_grammar(grammar, root_rule)
+
+            _PARSER_CACHE[(key, root_rule)] = parser
+
+        return parser
+
+
+def build_parser_artifact(path: str | Path | None = None) -> Path:
+    """Compile the grammar and store it as a precompiled parser artifact."""
+
+    grammar, key = _grammar_source()
+    return save_parser_artifact(parse_grammar(grammar), key, path)
+
+
+def reset_parser_cache() -> None:
+    """Drop all the cached parsers; the next `get_parser` call builds a new one."""
+
+    global _GRAMMAR_SOURCE
+
+    with _PARSER_LOCK:
+        _PARSER_CACHE.clear()
+        _GRAMMAR_SOURCE = None
+
+
+def parse_to_tree(raw_code: str, root_rule: str = "program") -> ParseTreeNode:
+    """Parse the code into arpeggio's parse tree, i.e. without building the AST."""
+
+    with _PARSER_LOCK:
+        return get_parser(root_rule).parse(raw_code)
+
+
 def parse(raw_code: str) -> AST:
-    parser = parse_grammar()
-    parse_tree = parser.parse(raw_code)
-    return visit_parse_tree(parse_tree, ParserVisitor())
+    return visit_parse_tree(parse_to_tree(raw_code), ParserVisitor())
+
 
+def get_ast_cache(
+    project_path: str | Path, max_size: int = DEFAULT_MAX_CACHE_SIZE
+) -> ASTCache:
+    """On-disk AST cache of a project for the current grammar."""
+
+    _, key = _grammar_source()
+    return ASTCache(project_path, key, max_size)
+
+
+def parse_file(file: str | Path, cache: ASTCache | None = None) -> AST:
+    """
+    Parse a Heather file. If an AST `cache` is given, files whose content
+    was already parsed are loaded from it instead of being parsed again.
+    """
 
-def parse_file(file: str | Path) -> AST:
     with open(file, "r") as f:
         data = f.read()
 
-    return parse(data)
+    if cache is None:
+        return parse(data)
+
+    if (ast := cache.get(data, _CACHE_MISS)) is _CACHE_MISS:
+        ast = parse(data)
+        cache.set(data, ast)
+
+    return ast
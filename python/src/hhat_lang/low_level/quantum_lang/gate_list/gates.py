@@ -0,0 +1,70 @@
+"""
+Backend-neutral gate list: quantum programs lowered straight from the IR, so
+target backends can build their own circuits without parsing any text code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import cache
+from typing import Iterator, NamedTuple
+
+
+class Gate(NamedTuple):
+    """A gate, by its (OpenQASM/qiskit) name, on the given indexes"""
+
+    name: str
+    idxs: tuple[int, ...]
+
+
+@cache
+def _gate_token(gate: Gate) -> bytes:
+    return f"{gate.name} {','.join(map(str, gate.idxs))};".encode("utf-8")
+
+
+class GateProgram:
+    """
+    Quantum program as a list of gates on `num_idxs` indexes. All the indexes
+    are measured at the end.
+    """
+
+    __slots__ = ("num_idxs", "gates")
+
+    num_idxs: int
+    gates: list[Gate]
+
+    def __init__(self, num_idxs: int, gates: list[Gate] | None = None):
+        self.num_idxs = num_idxs
+        self.gates = [] if gates is None else gates
+
+    def key(self) -> str:
+        """Canonical hash of the program structure, e.g. to cache its transpiled circuit."""
+
+        content = hashlib.sha256(f"gates:{self.num_idxs};".encode("utf-8"))
+        content.update(b"".join(map(_gate_token, self.gates)))
+        return content.hexdigest()
+
+    def iter_qasm(self) -> Iterator[str]:
+        """Export the program as OpenQASM v2 code lines."""
+
+        yield "OPENQASM 2.0;"
+        yield 'include "qelib1.inc";'
+        yield f"qreg q[{self.num_idxs}];"
+        yield f"creg c[{self.num_idxs}];"
+
+        for gate in self.gates:
+            yield f"{gate.name} " + ", ".join(f"q[{k}]" for k in gate.idxs) + ";"
+
+        yield "measure q -> c;"
+
+    def qasm(self) -> str:
+        return "\n".join(self.iter_qasm()) + "\n"
+
+    def __len__(self) -> int:
+        return len(self.gates)
+
+    def __iter__(self) -> Iterator[Gate]:
+        yield from self.gates
+
+    def __repr__(self) -> str:
+        return f"GateProgram({self.num_idxs}, {self.gates})"
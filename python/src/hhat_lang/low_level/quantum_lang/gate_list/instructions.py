@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from functools import cache
+from typing import Any
+
+from hhat_lang.core.code.instructions import InstrRegistry, QInstr
+from hhat_lang.core.code.utils import InstrStatus
+from hhat_lang.core.execution.abstract_base import BaseEvaluator
+from hhat_lang.low_level.quantum_lang.gate_list.gates import Gate
+
+
+GATE_INSTRS = InstrRegistry()
+"""gate list instructions, by name"""
+
+
+########################
+# QUANTUM INSTRUCTIONS #
+########################
+
+@GATE_INSTRS.register
+class QRedim(QInstr):
+    name = "@redim"
+
+    @staticmethod
+    @cache
+    def _instr(idx: int) -> Gate:
+        return Gate("h", (idx,))
+
+    def _translate_instrs(
+        self,
+        idxs: tuple[int, ...]
+    ) -> tuple[tuple[Gate, ...], InstrStatus]:
+        return tuple(self._instr(k) for k in idxs), InstrStatus.DONE
+
+    def __call__(
+        self,
+        *,
+        idxs: tuple[int, ...],
+        **_kwargs: Any
+    ) -> tuple[tuple[Gate, ...], InstrStatus]:
+        """Transforms `@redim` instruction to gates"""
+
+        self._instr_status = InstrStatus.RUNNING
+        instrs, status = self._translate_instrs(idxs)
+        self._instr_status = status
+        return instrs, status
+
+
+@GATE_INSTRS.register
+class QSync(QInstr):
+    name = "@sync"
+
+    @staticmethod
+    @cache
+    def _instr(idxs: tuple[int, ...]) -> Gate:
+        return Gate("cx", (idxs[0], idxs[1]))
+
+    def _translate_instrs(
+        self,
+        idxs: tuple[tuple[int, ...], ...]
+    ) -> tuple[tuple[Gate, ...], InstrStatus]:
+        return tuple(self._instr(k) for k in idxs), InstrStatus.DONE
+
+    def __call__(
+        self,
+        *,
+        idxs: tuple[tuple[int, ...], ...],
+        executor: BaseEvaluator,
+        **_kwargs: Any
+    ) -> tuple[tuple[Gate, ...], InstrStatus]:
+        """Transforms `@sync` instruction to gates."""
+
+        self._instr_status = InstrStatus.RUNNING
+
+        # TODO: implement this instruction with all the range of capabilities;
+        #  check documentation
+
+        instrs, status = self._translate_instrs(idxs)
+
+        self._instr_status = status
+        return instrs, status
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from hhat_lang.core.data.core import CoreLiteral
+from hhat_lang.core.error_handlers.errors import ErrorHandler
+from hhat_lang.core.utils import Ok, Error
+from hhat_lang.low_level.quantum_lang.gate_list.gates import Gate, GateProgram
+from hhat_lang.low_level.quantum_lang.gate_list.instructions import GATE_INSTRS
+from hhat_lang.low_level.quantum_lang.openqasm.v2.qlang import LowLeveQLang
+
+
+class GateListQLang(LowLeveQLang):
+    """
+    Lowers the IR straight into a backend-neutral `GateProgram`, instead of
+    OpenQASM v2 code. Variables, arguments and instructions are handled as in
+    `LowLeveQLang`, only producing gates instead of code lines.
+    """
+
+    _instrs = GATE_INSTRS
+
+    def init_qlang(self) -> tuple[Gate, ...]:
+        return ()
+
+    def end_qlang(self) -> tuple[Gate, ...]:
+        # measurements are implicit in a `GateProgram`
+        return ()
+
+    def gen_resets(self) -> tuple[Gate, ...]:
+        """
+        Reset the indexes recycled from variables consumed by previous casts in
+        the same circuit, as register-relative indexes
+        """
+
+        resets = set(self._idx.resets(self._qdata))
+        idxs = self._idx.in_use_by.get(self._qdata, ())
+        return tuple(Gate("reset", (n,)) for n, k in enumerate(idxs) if k in resets)
+
+    def gen_literal(self, literal: CoreLiteral, **_kwargs: Any) -> tuple[Gate, ...] | ErrorHandler:
+        """Generate gates from literal data"""
+
+        # `bin` is most significant bit first; index `n` holds bit `n`
+        return tuple(Gate("x", (n,)) for n, k in enumerate(reversed(literal.bin)) if k == "1")
+
+    def iter_program(self, **kwargs: Any) -> Iterator[Gate]:
+        """
+        Produces the program gates, one instruction at a time.
+
+        Args:
+            **kwargs: any metadata that can be useful
+
+        Returns:
+            An iterator of the program gates.
+        """
+
+        yield from self.gen_resets()
+
+        for instr in self._code:
+
+            if instr.args:
+
+                match gen_args := self.gen_args(instr.args):
+
+                    case Ok():
+                        yield from gen_args.result()
+
+                    # TODO: implement it better
+                    case Error():
+                        raise ValueError(gen_args.result())
+
+                    case ErrorHandler():
+                        raise gen_args
+
+            match gen_instr := self.gen_instrs(
+                    instr=instr,
+                    idx=self._idx,
+                    executor=self._executor
+                ):
+
+                case Ok():
+                    yield from gen_instr.result()
+
+                case Error():
+                    raise gen_instr.result()
+
+                # TODO: implement it better
+                case ErrorHandler():
+                    raise gen_instr
+
+    def emit(self, sink: TextIO | str | Path, **kwargs: Any) -> int:
+        """
+        Exports the program as OpenQASM v2 code to a text sink, or to a file
+        when given a path.
+
+        Args:
+            sink: object with a `write` method, or a file path
+            **kwargs: any metadata that can be useful
+
+        Returns:
+            The number of characters written.
+        """
+
+        if isinstance(sink, (str, Path)):
+            with open(sink, "w", encoding="utf-8") as file:
+                return self.emit(file, **kwargs)
+
+        write = sink.write
+        return sum(write(line + "\n") or 0 for line in self.gen_program(**kwargs).iter_qasm())
+
+    def gen_program(self, **kwargs: Any) -> GateProgram:
+        """
+        Produces the program as a list of gates.
+
+        Args:
+            **kwargs: any metadata that can be useful
+
+        Returns:
+            A `GateProgram` with the gates.
+        """
+
+        return GateProgram(self._num_idxs, list(self.iter_program(**kwargs)))
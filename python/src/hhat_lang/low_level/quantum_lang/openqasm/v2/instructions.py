@@ -2,15 +2,20 @@ from __future__ import annotations
 
 from typing import Any
 
-from hhat_lang.core.code.instructions import QInstr, CInstr
+from hhat_lang.core.code.instructions import InstrRegistry, QInstr, CInstr
 from hhat_lang.core.code.utils import InstrStatus
 from hhat_lang.core.execution.abstract_base import BaseEvaluator
 
 
+QASM2_INSTRS = InstrRegistry()
+"""OpenQASM v2 instructions, by name"""
+
+
 ##########################
 # CLASSICAL INSTRUCTIONS #
 ##########################
 
+@QASM2_INSTRS.register
 class If(CInstr):
     name = "if"
 
@@ -54,6 +59,7 @@ class If(CInstr):
 # QUANTUM INSTRUCTIONS #
 ########################
 
+@QASM2_INSTRS.register
 class QRedim(QInstr):
     name = "@redim"
 
@@ -81,6 +87,7 @@ class QRedim(QInstr):
         return instrs, status
 
 
+@QASM2_INSTRS.register
 class QSync(QInstr):
     name = "@sync"
 
@@ -114,6 +121,7 @@ class QSync(QInstr):
         return instrs, status
 
 
+@QASM2_INSTRS.register
 class QIf(QInstr):
     name = "@if"
 
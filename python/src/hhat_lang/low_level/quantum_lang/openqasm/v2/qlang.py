@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Callable
-
-import importlib
-import inspect
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
 
 from hhat_lang.core.code.ir import BlockIR, InstrIR, TypeIR, InstrIRFlag
 from hhat_lang.core.code.utils import InstrStatus
@@ -11,6 +10,7 @@ from hhat_lang.core.data.core import (
     Symbol, CoreLiteral, CompositeSymbol, CompositeLiteral,
     CompositeMixData
 )
+from hhat_lang.core.data.instr_log import QInstrLog
 from hhat_lang.core.data.variable import BaseDataContainer
 from hhat_lang.core.error_handlers.errors import ErrorHandler, InstrNotFoundError, InstrStatusError
 from hhat_lang.core.execution.abstract_base import BaseEvaluator
@@ -20,9 +20,12 @@ from hhat_lang.core.utils import Result, Ok, Error
 from hhat_lang.dialects.heather.code.ast import Literal
 
 from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRBlock, IRInstr, IRArgs
+from hhat_lang.low_level.quantum_lang.openqasm.v2.instructions import QASM2_INSTRS
 
 
 class LowLeveQLang(BaseLowLevelQLang):
+    _instrs = QASM2_INSTRS
+
     def init_qlang(self) -> tuple[str, ...]:
         code_list = (
             "OPENQASM 2.0;",
@@ -33,6 +36,16 @@ class LowLeveQLang(BaseLowLevelQLang):
 
         return code_list
 
+    def gen_resets(self) -> tuple[str, ...]:
+        """
+        Reset the indexes recycled from variables consumed by previous casts in
+        the same circuit, as register-relative indexes
+        """
+
+        resets = set(self._idx.resets(self._qdata))
+        idxs = self._idx.in_use_by.get(self._qdata, ())
+        return tuple(f"reset q[{n}];" for n, k in enumerate(idxs) if k in resets)
+
     def end_qlang(self) -> tuple[str, ...]:
         """Provides the end of the code"""
 
@@ -44,7 +57,8 @@ class LowLeveQLang(BaseLowLevelQLang):
     def gen_literal(self, literal: CoreLiteral, **_kwargs: Any) -> tuple[str, ...] | ErrorHandler:
         """Generate QASM code from literal data"""
 
-        return tuple(f"x q[{n}];" for n, k in enumerate(literal.bin) if k == "1")
+        # `bin` is most significant bit first; qubit `n` holds bit `n`
+        return tuple(f"x q[{n}];" for n, k in enumerate(reversed(literal.bin)) if k == "1")
 
     def gen_var(
         self,
@@ -54,55 +68,60 @@ class LowLeveQLang(BaseLowLevelQLang):
         """Generate QASM code from variable data"""
 
         var_data = executor.mem.heap[var.name]
-        code_tuple = ()
+        code_list: list[str] = []
 
         for member, data in var_data:
 
-            match data:
-                case Symbol():
-                    code_tuple += self.gen_var(data, executor=self._executor)
+            # quantum data is streamed from its instruction log, entry by entry
+            entries = data.stream() if isinstance(data, QInstrLog) else ((data, ()),)
 
-                case CoreLiteral():
-                    code_tuple += self.gen_literal(data)
+            for item, operands in entries:
 
-                case CompositeSymbol():
-                    # TODO: implement it
-                    raise NotImplementedError()
+                match item:
+                    case Symbol():
+                        code_list.extend(self.gen_var(item, executor=self._executor))
 
-                case CompositeLiteral():
-                    # TODO: implement it
-                    raise NotImplementedError()
+                    case CoreLiteral():
+                        code_list.extend(self.gen_literal(item))
 
-                case CompositeMixData():
-                    # TODO: implement it
-                    raise NotImplementedError()
+                    case CompositeSymbol():
+                        # TODO: implement it
+                        raise NotImplementedError()
 
-                case InstrIR():
+                    case CompositeLiteral():
+                        # TODO: implement it
+                        raise NotImplementedError()
 
-                    match res := self.gen_instrs(data, executor=self._executor):
-                        case Ok():
-                            code_tuple += res.result()
+                    case CompositeMixData():
+                        # TODO: implement it
+                        raise NotImplementedError()
 
-                        case Error():
-                            return res.result()
+                    case InstrIR():
 
-                        case ErrorHandler():
-                            return res
+                        match res := self.gen_instrs(item, operands=operands):
+                            case Ok():
+                                code_list.extend(res.result())
+
+                            case Error():
+                                return res.result()
 
-        return code_tuple
+                            case ErrorHandler():
+                                return res
+
+        return tuple(code_list)
 
 
     def gen_args(self, args: tuple[Any, ...], **kwargs: Any) -> Result:
-        code_tuple = ()
+        code_list: list[str] = []
 
         for k in args:
 
             match k:
                 case Symbol():
-                    code_tuple += self.gen_var(k, executor=self._executor)
+                    code_list.extend(self.gen_var(k, executor=self._executor))
 
                 case CoreLiteral():
-                    code_tuple += self.gen_literal(k)
+                    code_list.extend(self.gen_literal(k))
 
                 case CompositeSymbol():
                     # TODO: implement it
@@ -120,7 +139,7 @@ class LowLeveQLang(BaseLowLevelQLang):
 
                     match res := self.gen_instrs(k, **kwargs):
                         case Ok():
-                            code_tuple += res.result()
+                            code_list.extend(res.result())
 
                         case Error():
                             return res.result()
@@ -132,11 +151,12 @@ class LowLeveQLang(BaseLowLevelQLang):
                     # unknown case, needs investigation
                     raise NotImplementedError()
 
-        return Ok(code_tuple)
+        return Ok(tuple(code_list))
 
     def gen_instrs(
         self,
         instr: InstrIR | BlockIR,
+        operands: tuple[int, ...] = (),
         **kwargs: Any
     ) -> Result | ErrorHandler:
         """
@@ -146,53 +166,54 @@ class LowLeveQLang(BaseLowLevelQLang):
 
         Args:
             instr: InstrIR or BlockIR
+            operands: the quantum data indexes (relative to the variable) the
+                instruction acts on; empty means all of them
             **kwargs: anything else
 
         Returns:
             A tuple with OpenQASM v2 code strings
         """
 
-        instr_module = importlib.import_module(
-            name="hhat_lang.low_level.quantum_lang.openqasm.v2.instructions",
-        )
-
-        for name, obj in inspect.getmembers(instr_module, inspect.isclass):
+        # the circuit register only holds the quantum data indexes, so they are
+        # lowered relative to it: register qubit `n` is `in_use_by[qdata][n]`
+        idxs = tuple(operands) if operands else tuple(range(self._num_idxs))
 
-            if (x:= getattr(obj, "name", False)) and x == instr.name:
-                res_instr, res_status = obj()(
-                    idxs=self._idx.in_use_by[self._qdata],
-                    executor=self._executor,
-                )
+        if (instr_obj := self._instrs.get(instr.name)) is not None:
+            res_instr, res_status = instr_obj(
+                idxs=idxs,
+                executor=self._executor,
+            )
 
-                if res_status == InstrStatus.DONE:
-                    return Ok(res_instr)
+            if res_status == InstrStatus.DONE:
+                return Ok(res_instr)
 
-                return InstrStatusError(instr.name)
+            return InstrStatusError(instr.name)
 
-            # if openQASMv2.0 does not have the instruction, then falls
-            # back to H-hat dialect to execute it
-            else:
-                # TODO: falls back to dialect execution
-                pass
+        # TODO: if openQASMv2.0 does not have the instruction, then falls
+        #  back to H-hat dialect to execute it
 
         return InstrNotFoundError(instr.name)
 
-    def gen_program(
-        self,
-        **kwargs: Any
-    ) -> str:
+    def iter_program(self, **kwargs: Any) -> Iterator[str]:
         """
-        Produces the program as a string code written in OpenQASM v2.
+        Produces the program in OpenQASM v2 as a stream of code chunks, one
+        instruction at a time, so the whole program is never held in memory.
 
         Args:
             **kwargs: any metadata that can be useful
 
         Returns:
-            A string with the OpenQASM v2 code.
+            An iterator of OpenQASM v2 code strings that add up to the program.
         """
 
-        code = ""
-        code += "\n".join(self.init_qlang()) + "\n"
+        for line in self.init_qlang():
+            yield line + "\n"
+
+        for line in self.gen_resets():
+            yield line + "\n"
+
+        # instructions chunks are only ended once the next chunk comes
+        pending = ""
 
         for instr in self._code:
 
@@ -201,7 +222,8 @@ class LowLeveQLang(BaseLowLevelQLang):
                 match gen_args := self.gen_args(instr.args):
 
                     case Ok():
-                        code += "\n".join(gen_args.result()) + "\n"
+                        yield pending + "\n".join(gen_args.result()) + "\n"
+                        pending = ""
 
                     # TODO: implement it better
                     case Error():
@@ -217,7 +239,9 @@ class LowLeveQLang(BaseLowLevelQLang):
                 ):
 
                 case Ok():
-                    code += "\n".join(gen_instr.result())
+                    if lines := gen_instr.result():
+                        yield pending + "\n".join(lines)
+                        pending = "\n"
 
                 case Error():
                     raise gen_instr.result()
@@ -226,9 +250,48 @@ class LowLeveQLang(BaseLowLevelQLang):
                 case ErrorHandler():
                     raise gen_instr
 
-        code += "\n"
-        code += "\n".join(self.end_qlang()) + "\n"
-        return code
+        yield "\n"
+
+        for line in self.end_qlang():
+            yield line + "\n"
+
+    def emit(self, sink: TextIO | str | Path, **kwargs: Any) -> int:
+        """
+        Writes the program in OpenQASM v2 to a text sink (buffer, file, socket
+        file object, etc.) as it is generated. A path writes it to that file.
+
+        Args:
+            sink: object with a `write` method, or a file path
+            **kwargs: any metadata that can be useful
+
+        Returns:
+            The number of characters written.
+        """
+
+        if isinstance(sink, (str, Path)):
+            with open(sink, "w", encoding="utf-8") as file:
+                return self.emit(file, **kwargs)
+
+        write = sink.write
+        return sum(write(chunk) or 0 for chunk in self.iter_program(**kwargs))
+
+    def gen_program(
+        self,
+        **kwargs: Any
+    ) -> str:
+        """
+        Produces the program as a string code written in OpenQASM v2.
+
+        Args:
+            **kwargs: any metadata that can be useful
+
+        Returns:
+            A string with the OpenQASM v2 code.
+        """
+
+        buffer = StringIO()
+        self.emit(buffer, **kwargs)
+        return buffer.getvalue()
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         pass
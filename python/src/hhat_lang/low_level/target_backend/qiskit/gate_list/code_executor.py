@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import CircuitInstruction
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+from hhat_lang.core.data.core import WorkingData
+from hhat_lang.core.error_handlers.errors import (
+    InvalidQuantumComputedResult,
+    ErrorHandler
+)
+from hhat_lang.low_level.quantum_lang.gate_list.gates import GateProgram
+from hhat_lang.low_level.target_backend.qiskit.openqasm.code_executor import sample_circuit
+from hhat_lang.low_level.target_backend.qiskit.session import QiskitSession
+
+
+QISKIT_GATES = get_standard_gate_name_mapping()
+"""qiskit's standard gates (and reset, measure, etc.), by name"""
+
+
+def to_circuit(program: GateProgram) -> QuantumCircuit:
+    """Build a qiskit's QuantumCircuit straight from the gates."""
+
+    circuit = QuantumCircuit(program.num_idxs, program.num_idxs)
+    qubits = circuit.qubits
+
+    # gates are known to be valid, so they skip `QuantumCircuit.append` checks
+    append = circuit._append
+
+    for gate in program.gates:
+        append(CircuitInstruction(QISKIT_GATES[gate.name], tuple(qubits[k] for k in gate.idxs)))
+
+    circuit.measure(range(program.num_idxs), range(program.num_idxs))
+    return circuit
+
+
+def prepare_circuit(code: GateProgram) -> tuple[QuantumCircuit, str]:
+    """The circuit from the program gates, and its key for the transpiled circuits cache."""
+
+    return to_circuit(code), code.key()
+
+
+def execute_program(
+    code: GateProgram,
+    qdata: str | WorkingData,
+    debug: bool = False,
+    session: QiskitSession | None = None,
+    layout: Sequence[int] | None = None,
+) -> Any | ErrorHandler:
+    """
+    Execute the quantum program from a quantum data `qdata`. The program gates are
+    turned into a qiskit's QuantumCircuit, with no code text in between, to be
+    executed on a sampler instance to retrieve the bitstring distribution or an error.
+    The `layout` holds the device qubit of each program index, i.e. the `qdata` indexes.
+    """
+
+    circ, circ_key = prepare_circuit(code)
+    res = sample_circuit(circ, qdata, session=session, circ_key=circ_key, layout=layout)
+
+    match res:
+
+        # in case it had an error
+        case InvalidQuantumComputedResult():
+            # TODO: define properly what to do next
+            return res
+
+        # should contain the counts with bitstrings as keys (`Counter`?)
+        case _:
+
+            if debug:
+                print(res)
+
+            return res
@@ -1,70 +1,111 @@
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+from typing import Any, Sequence
 
-from qiskit import qasm2, QuantumCircuit, transpile
+from qiskit import qasm2, QuantumCircuit
 from qiskit.primitives.containers.pub_result import PubResult, DataBin
 
-# TODO: to set the configuration's simulator instead of a fixed simulator
-from qiskit_aer import AerSimulator
-from qiskit_aer.primitives import SamplerV2 as Sampler
-
 from hhat_lang.core.data.core import Symbol, WorkingData
 from hhat_lang.core.error_handlers.errors import (
     InvalidQuantumComputedResult,
     ErrorHandler
 )
+from hhat_lang.low_level.target_backend.qiskit.session import QiskitSession, default_session
 
 
 def load_qasm(code: str) -> QuantumCircuit:
     return qasm2.loads(code)
 
 
-def sample_circuit(
-    circuit: QuantumCircuit,
-    qdata: str | Symbol,
+def code_key(code: str) -> str:
+    """Hash of the OpenQASM code, standing for its circuit structure."""
+
+    return hashlib.sha256(f"qasm:{code}".encode("utf-8")).hexdigest()
+
+
+def prepare_circuit(code: str) -> tuple[QuantumCircuit, str]:
+    """The circuit from the OpenQASM code, and its key for the transpiled circuits cache."""
+
+    return load_qasm(code), code_key(code)
+
+
+def _get_counts(pub_res: PubResult) -> dict[str, int]:
+    databin: DataBin = pub_res.data
+    return (getattr(databin, "c", None) or getattr(databin, "meas", None)).get_counts()
+
+
+def sample_circuits(
+    circuits: Sequence[QuantumCircuit],
+    qdatas: Sequence[str | Symbol],
     metadata: dict[str, Any] | None = None,
-) -> Any | ErrorHandler:
+    session: QiskitSession | None = None,
+    circ_keys: Sequence[str | None] | None = None,
+    layouts: Sequence[Sequence[int] | None] | None = None,
+) -> list[Any | ErrorHandler]:
     """
-    Generate the counts from a given qdata containing instructions turned into a circuit.
+    Generate the counts for each of the circuits, from its respective qdata, submitting
+    them all as a single sampler job, one PUB per circuit. The counts are in the same
+    order as the circuits. Each circuit layout is the device qubit of each of its
+    qubits, e.g. the qdata indexes, see `QiskitSession.transpile`.
     """
 
     metadata = metadata or dict()
+    session = session or default_session()
+    circ_keys = circ_keys or (None,) * len(circuits)
+    layouts = layouts or (None,) * len(circuits)
+
+    pubs = [
+        (
+            session.transpile(circuit, circ_key, layout),
+            None,
+            metadata.get("shots", None) or session.shots or (len(circuit.qregs) * 888),
+        )
+        for circuit, circ_key, layout in zip(circuits, circ_keys, layouts)
+    ]
+    job_res = session.sampler.run(pubs).result()
 
-    # this should be replaced by a config backend, not a hardcoded one
-    backend = AerSimulator()
-    tcirc = transpile(circuit, backend=backend)
+    if job_res:
+        return [_get_counts(pub_res) for pub_res in job_res]
 
-    sample = Sampler()
-    n_shots = metadata.get("shots", None) or (len(circuit.qregs) * 888)
-    job = sample.run([tcirc], shots=n_shots)
+    # job_res is None, then something went wrong
+    return [InvalidQuantumComputedResult(qdata) for qdata in qdatas]
 
-    job_res = job.result()
 
-    if job_res:
-        pub_res: PubResult = job_res[0]
-        databin: DataBin = pub_res.data
-        res = (getattr(databin, "c", None) or getattr(databin, "meas", None)).get_counts()
-        return res
+def sample_circuit(
+    circuit: QuantumCircuit,
+    qdata: str | Symbol,
+    metadata: dict[str, Any] | None = None,
+    session: QiskitSession | None = None,
+    circ_key: str | None = None,
+    layout: Sequence[int] | None = None,
+) -> Any | ErrorHandler:
+    """
+    Generate the counts from a given qdata containing instructions turned into a circuit.
+    It runs on the session's simulator and sampler, or on the default session's. The
+    transpiled circuit is cached by `circ_key`, or by the circuit structure hash.
+    """
 
-    # job_res is None, then something went wrong
-    return InvalidQuantumComputedResult(qdata)
+    return sample_circuits([circuit], [qdata], metadata, session, [circ_key], [layout])[0]
 
 
 def execute_program(
     code: str,
     qdata: str | WorkingData,
-    debug: bool = False
+    debug: bool = False,
+    session: QiskitSession | None = None,
+    layout: Sequence[int] | None = None,
 ) -> Any | ErrorHandler:
     """
     Execute the quantum program from a quantum data `qdata`. First, it is passed as a
     string of code as a plain OpenQASM v2.0 code, then transformed into a qiskit's
     QuantumCircuit to be executed on a sampler instance to retrieve the bitstring
-    distribution or an error.
+    distribution or an error. The `layout` holds the device qubit of each register
+    qubit, i.e. the `qdata` indexes.
     """
 
-    circ = load_qasm(code)
-    res = sample_circuit(circ, qdata)
+    circ, circ_key = prepare_circuit(code)
+    res = sample_circuit(circ, qdata, session=session, circ_key=circ_key, layout=layout)
 
     match res:
 
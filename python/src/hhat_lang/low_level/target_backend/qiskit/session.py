@@ -0,0 +1,209 @@
+"""
+Backend session for qiskit target backends: the simulator and its sampler are
+created once, when the session opens, and reused by every quantum program run
+until it closes, instead of being created again for each cast.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+from qiskit import QuantumCircuit
+from qiskit.transpiler import PassManager, generate_preset_pass_manager
+
+# TODO: to set the configuration's simulator instead of a fixed simulator
+from qiskit_aer import AerSimulator
+from qiskit_aer.primitives import SamplerV2 as Sampler
+
+from hhat_lang.low_level.target_backend.qiskit.transpile_cache import (
+    DEFAULT_MAX_TRANSPILE_CACHE_ENTRIES,
+    TranspileCache,
+    target_key,
+)
+
+
+class QiskitSession:
+    """
+    Holds the simulator and sampler instances (and so their thread pools and
+    warm state), and the transpiler pass manager built for the simulator target,
+    between quantum program runs. Use `open`/`close` or a `with` block::
+
+        with QiskitSession.from_config({"backend_options": {"max_parallel_threads": 4}}) as session:
+            Program(..., session=session).run()
+
+    Configuration keys (all optional):
+
+    - `backend_options`: options for the simulator
+    - `seed`: the sampler seed
+    - `shots`: default number of shots
+    - `optimization_level`: the transpiler optimization level
+    - `transpile_cache_size`: maximum number of transpiled circuits kept in memory
+    - `transpile_cache_path`: directory to persist the transpiled circuits across runs
+
+    The simulator follows the device connectivity given by `backend_options`'s
+    `coupling_map` (a list of `[qubit, qubit]` edges). Circuits can then be
+    transpiled with a layout, the device qubit of each circuit qubit, such as the
+    indexes picked for the quantum data by `CouplingMapStrategy`.
+
+    The transpiled circuits cache outlives closing the session.
+    """
+
+    __slots__ = (
+        "_config",
+        "_backend",
+        "_sampler",
+        "_pass_manager",
+        "_target_key",
+        "_layouts",
+        "_transpile_cache",
+    )
+
+    _config: dict[str, Any]
+    _backend: AerSimulator | None
+    _sampler: Sampler | None
+    _pass_manager: PassManager | None
+    _target_key: str | None
+    _layouts: dict[tuple[int, ...], tuple[PassManager, str]]
+    """pass manager and target key for each initial layout used so far"""
+
+    _transpile_cache: TranspileCache
+
+    def __init__(self, config: Mapping[str, Any] | None = None):
+        self._config = dict(config or {})
+        self._backend = None
+        self._sampler = None
+        self._pass_manager = None
+        self._target_key = None
+        self._layouts = dict()
+        self._transpile_cache = TranspileCache(
+            self._config.get("transpile_cache_size", DEFAULT_MAX_TRANSPILE_CACHE_ENTRIES),
+            self._config.get("transpile_cache_path", None),
+        )
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> QiskitSession:
+        """Create and open a session from the configuration."""
+
+        return cls(config).open()
+
+    @property
+    def config(self) -> dict[str, Any]:
+        return self._config
+
+    @property
+    def is_open(self) -> bool:
+        return self._sampler is not None
+
+    @property
+    def shots(self) -> int | None:
+        return self._config.get("shots", None)
+
+    @property
+    def backend(self) -> AerSimulator:
+        if self._backend is None:
+            raise RuntimeError("qiskit session is closed.")
+
+        return self._backend
+
+    @property
+    def sampler(self) -> Sampler:
+        if self._sampler is None:
+            raise RuntimeError("qiskit session is closed.")
+
+        return self._sampler
+
+    @property
+    def pass_manager(self) -> PassManager:
+        if self._pass_manager is None:
+            raise RuntimeError("qiskit session is closed.")
+
+        return self._pass_manager
+
+    @property
+    def transpile_cache(self) -> TranspileCache:
+        return self._transpile_cache
+
+    def _target_settings(self) -> dict[str, Any]:
+        return {
+            "optimization_level": self._config.get("optimization_level", 2),
+            "backend_options": self._config.get("backend_options", {}),
+        }
+
+    def _layout(self, layout: tuple[int, ...]) -> tuple[PassManager, str]:
+        """Pass manager and target key to transpile with the given initial layout."""
+
+        if (res := self._layouts.get(layout, None)) is None:
+            settings = self._target_settings()
+            pass_manager = generate_preset_pass_manager(
+                optimization_level=settings["optimization_level"],
+                target=self.backend.target,
+                initial_layout=list(layout),
+            )
+            key = target_key(
+                self.backend.name, self.backend.num_qubits, initial_layout=layout, **settings
+            )
+            res = self._layouts[layout] = (pass_manager, key)
+
+        return res
+
+    def transpile(
+        self,
+        circuit: QuantumCircuit,
+        circ_key: str | None = None,
+        layout: Sequence[int] | None = None,
+    ) -> QuantumCircuit:
+        """
+        Transpile the circuit for the session's simulator, through the transpiled circuits
+        cache. The `layout` is only used when the simulator has a coupling map, as the
+        transpiler initial layout; with no coupling map, every layout is the same.
+        """
+
+        if layout is None or self.backend.coupling_map is None:
+            return self._transpile_cache.transpile(
+                circuit, self.pass_manager, self._target_key, circ_key
+            )
+
+        pass_manager, key = self._layout(tuple(layout))
+        return self._transpile_cache.transpile(circuit, pass_manager, key, circ_key)
+
+    def open(self) -> QiskitSession:
+        if not self.is_open:
+            self._backend = AerSimulator(**self._config.get("backend_options", {}))
+            self._sampler = Sampler.from_backend(self._backend, seed=self._config.get("seed", None))
+            settings = self._target_settings()
+            self._pass_manager = generate_preset_pass_manager(
+                optimization_level=settings["optimization_level"],
+                target=self._backend.target,
+            )
+            self._target_key = target_key(
+                self._backend.name, self._backend.num_qubits, **settings
+            )
+
+        return self
+
+    def close(self) -> None:
+        self._backend = None
+        self._sampler = None
+        self._pass_manager = None
+        self._target_key = None
+        self._layouts.clear()
+
+    def __enter__(self) -> QiskitSession:
+        return self.open()
+
+    def __exit__(self, *_args: Any) -> None:
+        self.close()
+
+
+_default_session: QiskitSession | None = None
+
+
+def default_session() -> QiskitSession:
+    """The session used when none is given; opened on first use and then reused."""
+
+    global _default_session
+
+    if _default_session is None or not _default_session.is_open:
+        _default_session = QiskitSession().open()
+
+    return _default_session
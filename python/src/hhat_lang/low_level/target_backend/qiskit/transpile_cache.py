@@ -0,0 +1,209 @@
+"""
+Transpiled circuits cache. Casting quantum data inside a loop produces the same
+circuit over and over, so the transpiled circuit is cached by a canonical hash
+of the circuit structure (registers, operations, parameters and the bits they
+act on) together with a key for the backend target and transpiler settings.
+
+The cache keeps the most recently used entries in memory, up to a maximum
+number of entries. Given a `path`, entries are also stored on disk as QPY
+files, so they survive across runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from qiskit import QuantumCircuit, __version__ as qiskit_version, qpy
+from qiskit.transpiler import PassManager
+
+
+TRANSPILE_ENTRY_SUFFIX = ".qpy"
+
+DEFAULT_MAX_TRANSPILE_CACHE_ENTRIES = 1024
+"""default maximum number of transpiled circuits kept in memory"""
+
+
+def circuit_key(circuit: QuantumCircuit) -> str:
+    """Canonical hash of the circuit structure."""
+
+    qubits = {k: n for n, k in enumerate(circuit.qubits)}
+    clbits = {k: n for n, k in enumerate(circuit.clbits)}
+    structure = [
+        tuple((k.name, k.size) for k in circuit.qregs),
+        tuple((k.name, k.size) for k in circuit.cregs),
+    ]
+
+    for instr in circuit.data:
+        structure.append(
+            (
+                instr.operation.name,
+                tuple(str(k) for k in instr.operation.params),
+                tuple(qubits[k] for k in instr.qubits),
+                tuple(clbits[k] for k in instr.clbits),
+            )
+        )
+
+    return hashlib.sha256(repr(structure).encode("utf-8")).hexdigest()
+
+
+def target_key(backend_name: str, num_qubits: int | None, **settings: Any) -> str:
+    """Hash of the backend target and the transpiler settings."""
+
+    key = (qiskit_version, backend_name, num_qubits, sorted((k, repr(v)) for k, v in settings.items()))
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+class TranspileCache:
+    """
+    Bounded LRU cache of transpiled circuits, optionally persisted on disk.
+
+    Properties
+        - `hits`: number of lookups found in memory or on disk
+        - `misses`: number of lookups that had to transpile the circuit
+        - `path`: directory of the on-disk entries, if any
+
+    Methods
+        - `get`: given the circuit and target keys, return the transpiled circuit or `None`
+        - `set`: given the circuit and target keys, store the transpiled circuit
+        - `transpile`: transpile a circuit with a pass manager, through the cache
+        - `stats`: cache counters
+        - `clear`: remove all the entries (in memory and on disk)
+    """
+
+    _entries: OrderedDict[tuple[str, str], QuantumCircuit]
+    _max_entries: int
+    _path: Path | None
+    _hits: int
+    _disk_hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_TRANSPILE_CACHE_ENTRIES,
+        path: str | Path | None = None,
+    ):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._path = None if path is None else Path(path)
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def _entry(self, key: tuple[str, str]) -> Path:
+        return self._path / key[1][:16] / f"{key[0]}{TRANSPILE_ENTRY_SUFFIX}"
+
+    def _load(self, key: tuple[str, str]) -> QuantumCircuit | None:
+        entry = self._entry(key)
+
+        try:
+            with open(entry, "rb") as f:
+                return qpy.load(f)[0]
+
+        except FileNotFoundError:
+            return None
+
+        except Exception:
+            # corrupted or from an unsupported QPY version
+            entry.unlink(missing_ok=True)
+            return None
+
+    def _store(self, key: tuple[str, str], circuit: QuantumCircuit) -> None:
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+
+        with open(tmp_entry, "wb") as f:
+            qpy.dump(circuit, f)
+
+        os.replace(tmp_entry, entry)
+
+    def _put(self, key: tuple[str, str], circuit: QuantumCircuit) -> None:
+        self._entries[key] = circuit
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, circ_key: str, tgt_key: str) -> QuantumCircuit | None:
+        key = (circ_key, tgt_key)
+
+        if (circuit := self._entries.get(key, None)) is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return circuit
+
+        if self._path is not None and (circuit := self._load(key)) is not None:
+            self._put(key, circuit)
+            self._hits += 1
+            self._disk_hits += 1
+            return circuit
+
+        self._misses += 1
+        return None
+
+    def set(self, circ_key: str, tgt_key: str, circuit: QuantumCircuit) -> None:
+        key = (circ_key, tgt_key)
+        self._put(key, circuit)
+
+        if self._path is not None:
+            self._store(key, circuit)
+
+    def transpile(
+        self,
+        circuit: QuantumCircuit,
+        pass_manager: PassManager,
+        tgt_key: str,
+        circ_key: str | None = None,
+    ) -> QuantumCircuit:
+        """
+        Transpiled circuit from the cache, or transpiled with `pass_manager` and cached.
+        `circ_key` can be given when the circuit structure hash is known beforehand,
+        e.g. from the program it was built from, to skip `circuit_key`.
+        """
+
+        circ_key = circuit_key(circuit) if circ_key is None else circ_key
+
+        if (tcirc := self.get(circ_key, tgt_key)) is None:
+            tcirc = pass_manager.run(circuit)
+            self.set(circ_key, tgt_key, tcirc)
+
+        return tcirc
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+        if self._path is not None:
+
+            for entry in self._path.glob(f"*/*{TRANSPILE_ENTRY_SUFFIX}"):
+                entry.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
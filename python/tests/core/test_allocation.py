@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.core.memory.allocation import (
+    BestFit,
+    ContiguousBlock,
+    CouplingMapStrategy,
+    IndexSet,
+)
+from hhat_lang.core.memory.core import IndexManager
+
+
+def test_index_set() -> None:
+    s = IndexSet(IndexSet.mask((0, 1, 4, 5, 6, 9)))
+
+    assert len(s) == 6 and list(s) == [0, 1, 4, 5, 6, 9]
+    assert list(s.ranges()) == [(0, 2), (4, 3), (9, 1)]
+    assert s.largest_run() == 3
+    assert s.lowest(3) == (0, 1, 4)
+
+
+def test_contiguous_and_best_fit() -> None:
+    free = IndexSet(IndexSet.mask((0, 1, 2, 4, 5, 7, 8, 9, 10)))
+
+    assert ContiguousBlock().select(free, 2) == (0, 1)
+    assert BestFit().select(free, 2) == (4, 5)
+    assert BestFit().select(free, 4) == (7, 8, 9, 10)
+    assert BestFit().select(free, 5) is None
+
+
+def test_coupling_map(tmp_path) -> None:
+    # 0 - 1 - 2
+    # |       |
+    # 3 - 4 - 5 - 6
+    edges = [[0, 1], [1, 2], [0, 3], [2, 5], [3, 4], [4, 5], [5, 6]]
+    path = tmp_path / "device.json"
+    path.write_text(json.dumps({"coupling_map": edges}))
+
+    strategy = CouplingMapStrategy.from_json(path)
+    im = IndexManager(7, strategy)
+    a, b, c = Symbol("@a"), Symbol("@b"), Symbol("@c")
+    im.add(a, 3)
+    im.add(b, 1)
+    im.add(c, 3)
+
+    assert list(im.request(b)) == [0]
+    idxs = list(im.request(a))
+
+    # connected group of 3 qubits
+    assert len(idxs) == 3
+    assert all(strategy.neighbors[k] & set(idxs) for k in idxs)
+
+    # 4 free qubits but no 3 of them connected: a linked pair and one more
+    strategy = CouplingMapStrategy([(0, 1), (2, 3)])
+    im = IndexManager(4, strategy)
+    im.add(c, 3)
+
+    assert strategy.max_fit(IndexSet(IndexSet.mask(range(4)))) == 4
+    assert list(im.request(c)) == [0, 1, 2]
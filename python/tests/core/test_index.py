@@ -46,3 +46,73 @@ def test_index_request_eq() -> None:
     assert len(im1._available) == 0
     assert len(im1._allocated) == 7
     assert im1._in_use_by.get(q, False) is not False
+
+
+def test_index_request_contiguous() -> None:
+    a, b, c = Symbol("@a"), Symbol("@b"), Symbol("@c")
+
+    im1 = IndexManager(6)
+    im1.add(a, 2)
+    im1.add(b, 2)
+    im1.add(c, 3)
+
+    im1.request(a)
+    im1.request(b)
+    im1.free(a)
+
+    # indexes 0, 1, 4, 5 are free, but no 3 of them in a row
+    assert isinstance(im1.request(c, contiguous=True), IndexAllocationError)
+    assert list(im1.request(c)) == [0, 1, 4]
+
+    im1.free(b)
+    im1.free(c)
+
+    assert list(im1.request(c, contiguous=True)) == [0, 1, 2]
+    assert 1 in im1.allocated and 1 not in im1.available
+
+
+def test_index_stats() -> None:
+    q = Symbol("@q")
+
+    im1 = IndexManager(7)
+    im1.add(q, 5)
+    im1.request(q)
+    im1.free(q)
+    im1.request(q)
+
+    stats = im1.stats()
+
+    assert stats["allocated"] == 5 and stats["available"] == 2
+    assert stats["largest_range"] == 2
+    assert stats["requests"] == 2 and stats["frees"] == 1 and stats["peak"] == 5
+
+
+def test_index_recycle() -> None:
+    a, b, c = Symbol("@a"), Symbol("@b"), Symbol("@c")
+
+    im1 = IndexManager(4)
+    im1.add(a, 2)
+    im1.add(b, 2)
+    im1.request(a)
+    im1.request(b)
+
+    assert isinstance(im1.add(c, 2), IndexAllocationError)
+
+    im1.recycle(a)
+    im1.add(c, 2)
+
+    assert list(im1.request(c)) == [0, 1]
+    assert im1.resets(c) == (0, 1)
+    assert im1.stats()["recycled"] == 2
+
+    # the lowest free indexes are reused, recycled or not
+    im1.free(b)
+    im1.recycle(c)
+
+    assert list(im1.request(b)) == [0, 1]
+    assert im1.resets(b) == (0, 1)
+
+    # a new circuit starts with every index in its initial state
+    im1.end_circuit()
+
+    assert im1.resets(b) == ()
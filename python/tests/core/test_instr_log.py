@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from hhat_lang.core.data.core import CoreLiteral, Symbol
+from hhat_lang.core.data.instr_log import QInstrLog
+from hhat_lang.core.types.builtin import QU3
+from hhat_lang.core.types.core import SingleDS
+
+
+def test_instr_log_append() -> None:
+    lit_q1, lit_q2 = CoreLiteral("@1", "@u3"), CoreLiteral("@2", "@u3")
+    log = QInstrLog([lit_q1, lit_q2])
+
+    assert log.append(lit_q1, operands=(0, 2)) == 2
+    assert len(log) == 3 and log == [lit_q1, lit_q2, lit_q1]
+    assert log[-1] is lit_q1 and log.operands(2) == (0, 2)
+    assert list(log.stream(1)) == [(lit_q2, ()), (lit_q1, (0, 2))]
+
+    # repeated items share the same opcode
+    assert len(log._table) == 2 and list(log._opcodes) == [0, 1, 0]
+
+
+def test_instr_log_snapshot() -> None:
+    lit_q1, lit_q2 = CoreLiteral("@1", "@u3"), CoreLiteral("@2", "@u3")
+    log = QInstrLog([lit_q1])
+    snap = log.snapshot()
+
+    assert snap._opcodes is log._opcodes
+
+    log.append(lit_q2)
+    snap.append(lit_q1, operands=(1,))
+
+    assert log == [lit_q1, lit_q2] and list(log.stream()) == [(lit_q1, ()), (lit_q2, ())]
+    assert list(snap.stream()) == [(lit_q1, ()), (lit_q1, (1,))]
+    assert snap._opcodes is not log._opcodes
+
+
+def test_instr_log_quantum_variable() -> None:
+    lit_q2, lit_q3 = CoreLiteral("@2", "@u3"), CoreLiteral("@3", "@u3")
+    qtype = SingleDS(name=Symbol("@type"))
+    qtype.add_member(QU3)
+    qvar = qtype(lit_q2, var_name=Symbol("@var"))
+    qarg = qvar.borrow(Symbol("@arg"))
+
+    qarg(lit_q3)
+
+    assert isinstance(qvar.get(), QInstrLog) and qvar.get() == [lit_q2]
+    assert qarg.get() == [lit_q2, lit_q3] and qarg.counter == 2
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from hhat_lang.core.data.core import CoreLiteral
+
+
+def test_literal_py_value() -> None:
+    assert CoreLiteral("3", "u64").py_value == 3
+    assert CoreLiteral("2.5", "float").py_value == 2.5
+    assert CoreLiteral("true", "bool").py_value is True
+    assert CoreLiteral("@5", "@u3").py_value == 5
+    assert CoreLiteral("3", "u64") < 5
+
+
+def test_literal_bin() -> None:
+    assert CoreLiteral("@1", "@u3").bin == "001"
+    assert CoreLiteral("@5", "@u3").bin == "101"
+    assert CoreLiteral("@true", "@bool").bin == "1"
+    assert CoreLiteral("@6", "@int").bin == "110"
+    assert CoreLiteral("@0", "@int").bin == "0"
+
+
+def test_literal_shared() -> None:
+    lit = CoreLiteral("@1", "@u2")
+
+    assert lit is CoreLiteral("@1", "@u2")
+    assert not hasattr(lit, "__dict__")
+    assert pickle.loads(pickle.dumps(lit)) is lit
+    assert CoreLiteral("1" * 20, "int") == CoreLiteral("1" * 20, "int")
+
+    with pytest.raises(ValueError):
+        CoreLiteral("@1", "int")
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from hhat_lang.core.data.core import CoreLiteral, Symbol
+from hhat_lang.core.error_handlers.errors import HeapInvalidKeyError, StackEmptyError
+from hhat_lang.core.memory.core import GLOBAL_SCOPE, MAIN_SCOPE, MemoryManager
+from hhat_lang.core.types.builtin import U32
+from hhat_lang.core.types.core import SingleDS
+
+
+def _var(name: str):
+    user_type = SingleDS(name=Symbol("user_type"))
+    user_type.add_member(U32)
+    return user_type(CoreLiteral("1", "u32"), var_name=Symbol(name))
+
+
+def test_scope_lookup() -> None:
+    mem = MemoryManager(5)
+    g, a, b = _var("g"), _var("a"), _var("b")
+
+    assert mem.scope.name == GLOBAL_SCOPE
+
+    mem.heap.set(g.name, g)
+    mem.new_scope(MAIN_SCOPE)
+    mem.heap.set(a.name, a)
+
+    assert mem.heap[g.name] is g and mem.heap[a.name] is a
+
+    fn_scope = mem.new_scope("fn")
+    mem.heap.set(b.name, b)
+
+    assert fn_scope.name == "fn#1"
+    assert mem.heap[b.name] is b and mem.heap[g.name] is g
+
+    # only the current and the global scopes are visible
+    assert isinstance(mem.heap[a.name], HeapInvalidKeyError)
+
+    mem.exit_scope()
+
+    assert isinstance(mem.heap[b.name], HeapInvalidKeyError)
+    assert mem.heap[a.name] is a
+
+    mem.exit_scope()
+
+    assert isinstance(mem.exit_scope(), StackEmptyError)
+
+
+def test_scope_release() -> None:
+    mem = MemoryManager(4)
+    qa, qb = Symbol("@a"), Symbol("@b")
+
+    mem.new_scope(MAIN_SCOPE)
+    mem.request_idx(qa, 1)
+    mem.new_scope("fn")
+    mem.stack.push_many(1, 2, 3)
+    mem.request_idx(qb, 3)
+
+    assert len(mem.idx.available) == 0
+
+    mem.exit_scope()
+
+    assert len(mem.idx.available) == 3 and len(mem.stack) == 0
+    assert qb not in mem.idx.in_use_by and qa in mem.idx.in_use_by
+
+    # the same function can be called again
+    mem.new_scope("fn")
+
+    assert list(mem.request_idx(qb, 3)) == [1, 2, 3]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.core.error_handlers.errors import StackEmptyError, StackOverflowError
+from hhat_lang.core.memory.core import Stack
+
+
+def test_stack_push_pop() -> None:
+    a, b = Symbol("a"), Symbol("b")
+    stack = Stack(capacity=2)
+
+    assert isinstance(stack.pop(), StackEmptyError)
+    assert isinstance(stack.peek(), StackEmptyError)
+
+    stack.push(a)
+    stack.push(b)
+
+    assert isinstance(stack.push(a), StackOverflowError)
+    assert stack.peek() is b and len(stack) == 2
+    assert stack.pop() is b and stack.pop() is a
+    assert len(stack) == 0
+
+
+def test_stack_bulk() -> None:
+    stack = Stack(capacity=4)
+
+    assert stack.push_many(1, 2, 3) is None
+    assert isinstance(stack.push_many(4, 5), StackOverflowError)
+    assert len(stack) == 3
+    assert stack.pop_many(2) == (2, 3)
+    assert isinstance(stack.pop_many(2), StackEmptyError)
+
+
+def test_stack_frames() -> None:
+    stack = Stack()
+    stack.push_many(1, 2)
+
+    assert stack.new_frame() == 1
+
+    stack.push_many(3, 4, 5)
+
+    assert stack.pop() == 5
+    assert stack.drop_frame() == (3, 4)
+    assert stack.depth == 0
+
+    stack.new_frame()
+
+    # the frame below is not reachable from the current frame
+    assert isinstance(stack.pop(), StackEmptyError)
+    assert isinstance(stack.peek(), StackEmptyError)
+    assert stack.drop_frame() == ()
+    assert stack.peek() == 2
+    assert isinstance(stack.drop_frame(), StackEmptyError)
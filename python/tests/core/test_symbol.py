@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import pickle
+
+from hhat_lang.core.data.core import Atomic, Symbol
+
+
+def test_symbol_interned() -> None:
+    assert Symbol("@v") is Symbol("@v")
+    assert Symbol.intern("@v") is Symbol("@v")
+    assert Symbol("v", "str") is Symbol("v")
+    assert Symbol("v", "int") is not Symbol("v")
+    assert Atomic("v") is not Symbol("v")
+    assert pickle.loads(pickle.dumps(Symbol("@v"))) is Symbol("@v")
+
+
+def test_symbol_eq_hash() -> None:
+    v = Symbol("@v")
+
+    assert v == Symbol("@v") and hash(v) == hash(Symbol("@v"))
+    assert v != Symbol("@w")
+    assert v == "@v" and v != "@w"
+    assert {v: 1}[Symbol.intern("@v")] == 1
+    assert v.is_quantum and not Symbol("v").is_quantum
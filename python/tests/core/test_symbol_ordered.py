@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import pytest
+
+from hhat_lang.core.data.core import Symbol
+from hhat_lang.core.utils import FrozenSymbolOrdered, SymbolOrdered
+
+
+def test_symbol_ordered_str_keys() -> None:
+    x, y = Symbol("x"), Symbol("y")
+    so = SymbolOrdered({"x": 1})
+    so[y] = 2
+
+    assert so["x"] == 1 and so[x] == 1 and so["y"] == 2
+    assert "x" in so and x in so and "z" not in so and Symbol("x", "int") not in so
+    assert so.symbol("y") is y and so.symbol("z") is None
+    assert list(so) == [x, y] and list(so.keys()) == ["x", "y"]
+    assert dict(**so) == {"x": 1, "y": 2}
+    assert so == OrderedDict({x: 1, y: 2}) and so == SymbolOrdered(so)
+
+    with pytest.raises(KeyError):
+        so["z"]
+
+    with pytest.raises(ValueError):
+        so[1]
+
+
+def test_symbol_ordered_frozen() -> None:
+    fso = FrozenSymbolOrdered({"x": Symbol("u32"), "y": Symbol("u32")})
+
+    assert fso == SymbolOrdered({"x": Symbol("u32"), "y": Symbol("u32")})
+    assert hash(fso) == hash(FrozenSymbolOrdered(fso))
+    assert {fso: 1}[FrozenSymbolOrdered(fso)] == 1
+
+    with pytest.raises(TypeError):
+        fso["z"] = Symbol("u32")
+
+
+def test_symbol_ordered_frozen_values() -> None:
+    inner = OrderedDict({Symbol("x"): Symbol("u32")})
+    fso = FrozenSymbolOrdered({"a": inner, "b": [Symbol("u32"), [1, 2]]})
+
+    assert isinstance(fso["a"], FrozenSymbolOrdered) and fso["b"] == (Symbol("u32"), (1, 2))
+    hash(fso)
+
+    # the frozen values do not alias the mutable ones
+    inner[Symbol("y")] = Symbol("u64")
+    assert len(fso["a"]) == 1
+
+    with pytest.raises(TypeError):
+        FrozenSymbolOrdered({"a": bytearray(b"u32")})
@@ -32,6 +32,18 @@ def test_single_ds() -> None:
     assert isinstance(var1.get(Symbol("x")), VariableWrongMemberError)
 
 
+def test_single_ds_layout() -> None:
+    user_type1 = SingleDS(name=Symbol("user_type1"))
+    user_type1.add_member(U32)
+    var1 = user_type1(CoreLiteral("108", "u32"), var_name=Symbol("var1"))
+    var2 = user_type1(CoreLiteral("7", "u32"), var_name=Symbol("var2"))
+
+    # one frozen, hashable layout shared by the type's variables
+    assert var1._layout is var2._layout
+    assert hash(var1._layout.ds) == hash(var2._layout.ds)
+    assert var1._layout.members == (U32.name,)
+
+
 def test_single_ds_quantum() -> None:
     lit_q2 = CoreLiteral("@2", "@u3")
 
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from hhat_lang.core.data.core import CoreLiteral, Symbol
+from hhat_lang.core.data.utils import VariableKind
+from hhat_lang.core.error_handlers.errors import ContainerVarError, VariableFreeingBorrowedError
+from hhat_lang.core.types.builtin import QU3, U32
+from hhat_lang.core.types.core import StructDS
+
+
+def _point() -> StructDS:
+    point = StructDS(name=Symbol("point"))
+    point.add_member(U32, Symbol("x")).add_member(U32, Symbol("y"))
+    return point
+
+
+def test_borrow_copy_on_write() -> None:
+    lit_1, lit_2, lit_3 = CoreLiteral("1", "u32"), CoreLiteral("2", "u32"), CoreLiteral("3", "u32")
+    p = _point()(lit_1, lit_2, var_name=Symbol("p"), flag=VariableKind.MUTABLE)
+    q = p.borrow(Symbol("q"))
+
+    assert q.name == Symbol("q") and q._data is p._data
+    assert p.is_shared and q.is_shared
+
+    q.assign(x=lit_3, y=lit_2)
+
+    assert q.get(Symbol("x")) == lit_3 and p.get(Symbol("x")) == lit_1
+    assert not p.is_shared and not q.is_shared
+
+    assert isinstance(p.free(), VariableFreeingBorrowedError)
+    assert q.free() is None
+    assert p.free() is None
+
+
+def test_borrow_quantum_append() -> None:
+    lit_q2, lit_q3 = CoreLiteral("@2", "@u3"), CoreLiteral("@3", "@u3")
+    qsample = StructDS(name=Symbol("@sample"))
+    qsample.add_member(QU3, Symbol("@d"))
+    qvar = qsample(lit_q2, var_name=Symbol("@var"))
+    qarg = qvar.borrow(Symbol("@arg"))
+
+    qarg.assign(**{"@d": lit_q3})
+
+    assert qarg.get(Symbol("@d")) == [lit_q2, lit_q3]
+    assert qvar.get(Symbol("@d")) == [lit_q2]
+
+
+def test_transfer() -> None:
+    lit_1, lit_2 = CoreLiteral("1", "u32"), CoreLiteral("2", "u32")
+    p = _point()(lit_1, lit_2, var_name=Symbol("p"))
+    data = p._data
+    r = p.transfer(Symbol("r"))
+
+    assert r.name == Symbol("r") and r._data is data
+    assert len(p.data) == 0
+    assert isinstance(p.transfer(), ContainerVarError)
+    assert isinstance(r.borrow(Symbol("s")), type(r)) and isinstance(r.transfer(), VariableFreeingBorrowedError)
+
+
+def test_container_layout() -> None:
+    lit_1, lit_2 = CoreLiteral("1", "u32"), CoreLiteral("2", "u32")
+    point = _point()
+    p = point(lit_1, lit_2, var_name=Symbol("p"))
+    q = point(lit_2, lit_1, var_name=Symbol("q"), flag=VariableKind.MUTABLE)
+
+    assert p._layout is q._layout is point.layout
+    assert point.layout.members == (Symbol("x"), Symbol("y"))
+    assert p._data == [lit_1, lit_2] and q._data == [lit_2, lit_1]
+    assert not hasattr(p, "__dict__") and not hasattr(q, "__dict__")
+    assert p.get("y") == lit_2 and dict(q) == {Symbol("x"): lit_2, Symbol("y"): lit_1}
+
+    point.add_member(U32, Symbol("z"))
+
+    assert point.layout is not p._layout and len(point.layout) == 3 and len(p._ds) == 2
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pickle
+
+from hhat_lang.dialects.heather.code.ast import (
+    ArgValuePair,
+    Call,
+    CallArgs,
+    Id,
+    Literal,
+    Modifier,
+    OnlyValue,
+)
+
+
+def _call() -> Call:
+    return Call(Id("print"), CallArgs(OnlyValue(Literal("1", "int")), OnlyValue(Id("a"))))
+
+
+def test_terminals_interned() -> None:
+    assert Id("x") is Id("x")
+    assert Id("x") is not Id("y")
+    assert Literal("1", "int") is Literal("1", "int")
+    assert Literal("1", "int") is not Literal("1", "u64")
+
+
+def test_structural_eq_hash() -> None:
+    c1, c2 = _call(), _call()
+
+    assert c1 is not c2
+    assert c1 == c2 and hash(c1) == hash(c2)
+    assert {c1: 1}[c2] == 1
+    assert c1 != Call(Id("print"), CallArgs(OnlyValue(Id("a"))))
+
+
+def test_no_instance_dict() -> None:
+    assert not hasattr(Id("x"), "__dict__")
+    assert not hasattr(Literal("1", "int"), "__dict__")
+    assert not hasattr(_call(), "__dict__")
+
+
+def test_iter_nodes() -> None:
+    pair = ArgValuePair(Id("a"), Literal("1", "int"))
+
+    assert list(Modifier(pair)) == [pair]
+    assert len(list(_call().value[1])) == 2
+
+
+def test_pickle_roundtrip() -> None:
+    call = _call()
+    res = pickle.loads(pickle.dumps(call))
+
+    assert res == call and hash(res) == hash(call)
+    assert res.value[0] is Id("print")
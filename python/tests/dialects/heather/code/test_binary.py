@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from hhat_lang.core.code.ir import BodyIR, InstrIRFlag
+from hhat_lang.core.data.core import CompositeSymbol, CoreLiteral, Symbol
+from hhat_lang.dialects.heather.code.ast import (
+    ArgTypePair,
+    Body,
+    Call,
+    CallArgs,
+    FnArgs,
+    FnDef,
+    Id,
+    Literal,
+    Main,
+    OnlyValue,
+    TypeDef,
+    TypeMember,
+)
+from hhat_lang.dialects.heather.code import binary
+from hhat_lang.dialects.heather.code.binary import dump, dumps, load, loads
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRArgs, IRBlock, IRInstr
+
+
+def _fn(n: int) -> FnDef:
+    return FnDef(
+        Id(f"f{n}"),
+        Id("u64"),
+        FnArgs(ArgTypePair(Id("a"), Id("u64"))),
+        Body(Call(Id("print"), CallArgs(OnlyValue(Literal(str(n), "int")), OnlyValue(Id("a"))))),
+    )
+
+
+def test_ast_roundtrip() -> None:
+    code = Main(*(_fn(k) for k in range(10)))
+    res = loads(dumps(code))
+
+    assert res == code
+    assert res.value[0].value[0] is Id("f0")
+
+    type_def = TypeDef(TypeMember(Id("x"), Id("u64")), type_name=Id("point"), type_ds=Id("struct"))
+    assert loads(dumps(type_def)) == type_def
+
+
+def test_ast_dedup() -> None:
+    single = len(dumps(Main(_fn(0))))
+    assert len(dumps(Main(*(_fn(0) for _ in range(100))))) < single + 100 * 8
+
+
+def test_ir_roundtrip() -> None:
+    block = IRBlock()
+    block.add_instr(
+        IRInstr(
+            Symbol("print"),
+            IRArgs(CoreLiteral("1", "int"), Symbol("@a"), CompositeSymbol(("a", "b"))),
+            InstrIRFlag.CALL,
+        )
+    )
+    body = BodyIR()
+    body.push(block)
+
+    instr = list(loads(dumps(body)))[0][0]
+
+    assert instr.name == Symbol("print") and instr.flag == InstrIRFlag.CALL
+    assert list(instr.args) == [CoreLiteral("1", "int"), Symbol("@a"), CompositeSymbol(("a", "b"))]
+
+
+class _Pair:
+    def __init__(self, first: str, second: str):
+        self.first, self.second = first, second
+
+
+def test_temporaries_not_aliased(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the encoder children are temporaries, freed once each pair is written
+    codec = (
+        (lambda x: (None, ((x.first,), (x.second,)))),
+        (lambda n, c: _Pair(c[0][0], c[1][0])),
+    )
+    monkeypatch.setitem(binary._CODECS, _Pair, codec)
+    monkeypatch.setitem(binary._DECODERS, binary._class_key(_Pair), codec[1])
+
+    pairs = loads(dumps([_Pair(str(k), str(k + 1)) for k in range(0, 100, 2)]))
+
+    assert [(k.first, k.second) for k in pairs] == [(str(k), str(k + 1)) for k in range(0, 100, 2)]
+
+
+def test_file_roundtrip(tmp_path) -> None:
+    code = Main(_fn(0), _fn(1))
+    assert load(dump(code, tmp_path / "code.hbin")) == code
+
+
+def test_invalid_data() -> None:
+    with pytest.raises(ValueError):
+        loads(b"not a binary code")
+
+    with pytest.raises(ValueError):
+        dumps(object())
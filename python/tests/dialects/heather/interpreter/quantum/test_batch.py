@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from itertools import product
+
+import pytest
+
+from hhat_lang.core.code.ir import TypeIR, InstrIRFlag
+from hhat_lang.core.data.core import Symbol, CoreLiteral
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRBlock, FnIR, IRInstr, IRArgs
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.dialects.heather.interpreter.quantum.batch import ProgramBatch
+from hhat_lang.dialects.heather.interpreter.quantum.program import Program
+from hhat_lang.low_level.quantum_lang.gate_list.qlang import GateListQLang
+from hhat_lang.low_level.quantum_lang.openqasm.v2.qlang import LowLeveQLang
+from hhat_lang.low_level.target_backend.qiskit.session import QiskitSession
+
+
+def test_program_batch() -> None:
+    qa, qv, ql = Symbol("@a"), Symbol("@v"), CoreLiteral("@2", "@u2")
+
+    # the programs quantum data share the memory, none of them starting at index 0
+    mem = MemoryManager(5)
+
+    for data, num_idxs in ((qa, 1), (ql, 2), (qv, 1)):
+        mem.idx.add(data, num_idxs)
+        mem.idx.request(data)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    qv_block = IRBlock()
+    qv_block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+    ql_block = IRBlock()
+    ql_block.add_instr(IRInstr(Symbol("@redim"), IRArgs(ql), InstrIRFlag.CALL))
+
+    with QiskitSession.from_config({"seed": 7, "shots": 100}) as session:
+        jobs = []
+        sampler_run = session.sampler.run
+        session.sampler.run = lambda pubs, **kw: jobs.append(pubs) or sampler_run(pubs, **kw)
+
+        batch = ProgramBatch()
+        batch.add(
+            Program(
+                qdata=qv, idx=mem.idx, block=qv_block, qlang=LowLeveQLang, executor=ex,
+                session=session,
+            )
+        )
+        batch.add(
+            Program(
+                qdata=ql, idx=mem.idx, block=ql_block, qlang=GateListQLang, executor=ex,
+                session=session,
+            )
+        )
+        assert len(batch) == 2 and qv in batch
+
+        with pytest.raises(ValueError):
+            batch.add(
+                Program(
+                    qdata=qv, idx=mem.idx, block=qv_block, qlang=LowLeveQLang, executor=ex
+                )
+            )
+
+        results = batch.run()
+
+    assert len(jobs) == 1 and len(jobs[0]) == 2
+    assert len(batch) == 0
+    assert set(results[qv].keys()) == {"0", "1"} and sum(results[qv].values()) == 100
+    assert set(results[ql].keys()) == {"".join(k) for k in product("01", repeat=2)}
+    assert sum(results[ql].values()) == 100
+    assert list(mem.idx.in_use_by) == [qa]
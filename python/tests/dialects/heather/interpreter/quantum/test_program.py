@@ -6,14 +6,18 @@ import pytest
 
 from hhat_lang.core.code.ir import TypeIR, InstrIRFlag
 from hhat_lang.core.data.core import Symbol, CoreLiteral
+from hhat_lang.core.memory.allocation import CouplingMapStrategy
 from hhat_lang.core.memory.core import MemoryManager
 from hhat_lang.dialects.heather.code.simple_ir_builder.ir import IRBlock, FnIR, IRInstr, IRArgs
 from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
 from hhat_lang.dialects.heather.interpreter.quantum.program import Program
+from hhat_lang.low_level.quantum_lang.gate_list.qlang import GateListQLang
 from hhat_lang.low_level.quantum_lang.openqasm.v2.qlang import LowLeveQLang
+from hhat_lang.low_level.target_backend.qiskit.session import QiskitSession
 
 
-def test_simple_empty_redim_program(MAX_ATOL_STATES_GATE: float) -> None:
+@pytest.mark.parametrize("qlang", [LowLeveQLang, GateListQLang])
+def test_simple_empty_redim_program(qlang: type, MAX_ATOL_STATES_GATE: float) -> None:
     qv = Symbol("@v")
 
     mem = MemoryManager(5)
@@ -25,17 +29,18 @@ def test_simple_empty_redim_program(MAX_ATOL_STATES_GATE: float) -> None:
     block = IRBlock()
     block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
 
-    program = Program(qdata=qv, idx=mem.idx, block=block, qlang=LowLeveQLang, executor=ex)
+    program = Program(qdata=qv, idx=mem.idx, block=block, qlang=qlang, executor=ex)
 
     res = program.run(debug=False)
     assert (abs(res["1"] - res["0"])/(res["1"] + res["0"])) < MAX_ATOL_STATES_GATE
 
 
+@pytest.mark.parametrize("qlang", [LowLeveQLang, GateListQLang])
 @pytest.mark.parametrize(
     "ql",
     [CoreLiteral("@0", "@u2"), CoreLiteral("@2", "@u2")]
 )
-def test_simple_literal_redim_program(ql: CoreLiteral, MAX_ATOL_STATES_GATE: float) -> None:
+def test_simple_literal_redim_program(ql: CoreLiteral, qlang: type, MAX_ATOL_STATES_GATE: float) -> None:
     mem = MemoryManager(5)
     mem.idx.add(ql, 2)
     mem.idx.request(ql)
@@ -45,9 +50,107 @@ def test_simple_literal_redim_program(ql: CoreLiteral, MAX_ATOL_STATES_GATE: flo
     block = IRBlock()
     block.add_instr(IRInstr(Symbol("@redim"), IRArgs(ql), InstrIRFlag.CALL))
 
-    program = Program(qdata=ql, idx=mem.idx, block=block, qlang=LowLeveQLang, executor=ex)
+    program = Program(qdata=ql, idx=mem.idx, block=block, qlang=qlang, executor=ex)
 
     res = program.run(debug=False)
 
     assert {"".join(k) for k in product("01", repeat=2)} == set(res.keys())
     assert all(abs(1/4 - k/sum(res.values())) < MAX_ATOL_STATES_GATE for k in res.values())
+
+
+def test_program_session() -> None:
+    qv = Symbol("@v")
+
+    with QiskitSession.from_config({"seed": 7, "shots": 100}) as session:
+        backend, sampler, pm = session.backend, session.sampler, session.pass_manager
+        results = []
+
+        for _ in range(2):
+            mem = MemoryManager(5)
+            mem.idx.add(qv, 1)
+            mem.idx.request(qv)
+
+            ex = Evaluator(mem, TypeIR(), FnIR())
+
+            block = IRBlock()
+            block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+            program = Program(
+                qdata=qv, idx=mem.idx, block=block, qlang=LowLeveQLang, executor=ex, session=session
+            )
+            results.append(program.run())
+
+        assert session.backend is backend and session.sampler is sampler and session.pass_manager is pm
+        assert results[0] == results[1] and sum(results[0].values()) == 100
+        assert session.transpile_cache.misses == 1 and session.transpile_cache.hits == 1
+
+    assert not session.is_open
+
+    with pytest.raises(RuntimeError):
+        session.sampler
+
+
+@pytest.mark.parametrize("qlang", [LowLeveQLang, GateListQLang])
+def test_program_sequential_casts(qlang: type) -> None:
+    qa, qb, qc = Symbol("@a"), Symbol("@b"), Symbol("@c")
+
+    mem = MemoryManager(2)
+    mem.idx.add(qa, 1)
+    mem.idx.request(qa)
+    mem.idx.add(qb, 1)
+    mem.idx.request(qb)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    program = Program(qdata=qa, idx=mem.idx, block=block, qlang=qlang, executor=ex)
+    assert set(program.run()) == {"0", "1"}
+
+    # `@c` reuses the lowest free index, from `@a`, in a new circuit: no reset is needed
+    mem.idx.add(qc, 1)
+    assert list(mem.idx.request(qc)) == [0]
+    assert mem.idx.resets(qc) == ()
+
+    for qdata in (qb, qc):
+        program = Program(qdata=qdata, idx=mem.idx, block=block, qlang=qlang, executor=ex)
+        assert set(program.run()) == {"0", "1"}
+
+    assert not mem.idx.in_use_by
+
+
+@pytest.mark.parametrize("qlang", [LowLeveQLang, GateListQLang])
+def test_program_coupling_map_layout(qlang: type) -> None:
+    qa, qv = Symbol("@a"), Symbol("@v")
+    strategy = CouplingMapStrategy([[0, 3], [3, 1], [1, 4], [4, 2]])
+
+    mem = MemoryManager(5, strategy)
+    mem.idx.add(qa, 1)
+    mem.idx.request(qa)
+    mem.idx.add(qv, 2)
+    mem.idx.request(qv)
+
+    # neighbouring indexes on the device, not the lowest ones
+    assert tuple(mem.idx.in_use_by[qv]) == (1, 3)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    config = {"seed": 7, "shots": 100, "backend_options": {"coupling_map": strategy.edges}}
+
+    with QiskitSession.from_config(config) as session:
+        pubs = []
+        sampler_run = session.sampler.run
+        session.sampler.run = lambda ps, **kw: pubs.extend(ps) or sampler_run(ps, **kw)
+
+        program = Program(
+            qdata=qv, idx=mem.idx, block=block, qlang=qlang, executor=ex, session=session
+        )
+        res = program.run()
+
+    # the program qubits are transpiled onto the indexes `@v` got
+    assert pubs[0][0].layout.initial_index_layout(filter_ancillas=True) == [1, 3]
+    assert sum(res.values()) == 100
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from hhat_lang.dialects.heather.code.ast import Id, TypeMember
+from hhat_lang.dialects.heather.parsing import run
+from hhat_lang.dialects.heather.parsing.cache import ASTCache
+
+
+def test_ast_cache_get_set(tmp_path: Path) -> None:
+    cache = ASTCache(tmp_path, "grammar-hash")
+    code = "type point { x:u32 y:u32 }"
+    ast = TypeMember(Id("x"), Id("u32"))
+
+    assert cache.get(code) is None
+
+    cache.set(code, ast)
+
+    assert code in cache
+    assert repr(cache.get(code)) == repr(ast)
+    assert cache.get(code + " ") is None
+
+    cache.invalidate(code)
+    assert cache.get(code) is None
+
+
+def test_ast_cache_namespaces(tmp_path: Path) -> None:
+    code = "type natural:u64"
+    old_cache = ASTCache(tmp_path, "old-grammar-hash")
+    old_cache.set(code, Id("natural"))
+
+    cache = ASTCache(tmp_path, "new-grammar-hash")
+    assert cache.get(code) is None
+
+    cache.set(code, Id("natural"))
+    cache.prune()
+
+    assert code not in old_cache
+    assert code in cache
+
+
+def test_ast_cache_lru_eviction(tmp_path: Path) -> None:
+    codes = [f"type t{k}:u64" for k in range(4)]
+    cache = ASTCache(tmp_path, "grammar-hash")
+
+    for n, code in enumerate(codes):
+        cache.set(code, Id(f"t{n}"))
+        os.utime(cache._entry(code), ns=(n, n))
+
+    entry_size = cache._entry(codes[0]).stat().st_size
+    cache._max_size = 3 * entry_size
+
+    # refresh the oldest entry, so the second one is evicted next
+    assert cache.get(codes[0]) is not None
+
+    cache.set("type t4:u64", Id("t4"))
+
+    assert cache.size <= cache.max_size
+    assert codes[0] in cache
+    assert codes[1] not in cache
+
+
+@pytest.mark.parametrize("ast", [None, Id("natural")])
+def test_parse_file_cache_hit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, ast) -> None:
+    file = tmp_path / "natural.hat"
+    file.write_text("type natural:u64")
+    parsed: list[str] = []
+
+    def counted_parse(data: str):
+        parsed.append(data)
+        return ast
+
+    monkeypatch.setattr(run, "parse", counted_parse)
+    cache = ASTCache(tmp_path, "grammar-hash")
+
+    assert repr(run.parse_file(file, cache=cache)) == repr(ast)
+    assert repr(run.parse_file(file, cache=cache)) == repr(ast)
+    assert parsed == ["type natural:u64"]
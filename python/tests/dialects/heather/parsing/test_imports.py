@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hhat_lang.core.error_handlers.errors import ImportCycleError, ImportNotFoundError
+from hhat_lang.dialects.heather.code.ast import CompositeId, CompositeIdWithClosure, Id
+from hhat_lang.dialects.heather.parsing import imports
+from hhat_lang.dialects.heather.parsing.imports import (
+    ImportKind,
+    ImportResolver,
+    import_names,
+    tree_imports,
+)
+from hhat_lang.dialects.heather.parsing.run import parse_to_tree
+from hhat_lang.toolchain.project.new import create_new_project
+
+
+def _write(project: Path, file: str, code: str) -> None:
+    path = project / "src" / file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code)
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    project_path = tmp_path / "proj"
+    create_new_project(project_path)
+    _write(project_path, "main.hat", "use(type:[geometry.{point} geometry.line natural] fn:math)")
+    _write(project_path, "hat_types/geometry/point.hat", "use(type:natural)")
+    _write(project_path, "hat_types/geometry/line.hat", "use(type:[geometry.point natural])")
+    _write(project_path, "hat_types/natural.hat", "type natural:u64")
+    _write(project_path, "math.hat", "use(type:natural)")
+    return project_path
+
+
+def test_import_names() -> None:
+    assert import_names(Id("point")) == (("point",),)
+    assert import_names(CompositeId(Id("geometry"), Id("point"))) == (("geometry", "point"),)
+    assert import_names(
+        CompositeIdWithClosure(Id("point"), Id("line"), name=Id("geometry"))
+    ) == (("geometry", "point"), ("geometry", "line"))
+
+
+def test_tree_imports() -> None:
+    tree = parse_to_tree("use(type:[geometry.{point} geometry.line natural] fn:math.add)")
+
+    assert tree_imports(tree) == (
+        (ImportKind.TYPE, ("geometry", "point")),
+        (ImportKind.TYPE, ("geometry", "line")),
+        (ImportKind.TYPE, ("natural",)),
+        (ImportKind.FN, ("math", "add")),
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_resolve(project: Path, workers: int) -> None:
+    resolver = ImportResolver(project, workers=workers)
+    graph = resolver.resolve()
+
+    assert graph.graph["main"] == (
+        "hat_types.geometry.point", "hat_types.geometry.line", "hat_types.natural", "math"
+    )
+    assert graph.order.index("hat_types.natural") < graph.order.index("hat_types.geometry.point")
+    assert graph.order.index("hat_types.geometry.point") < graph.order.index(
+        "hat_types.geometry.line"
+    )
+    assert graph.order[-1] == "main"
+
+    # each module is built once, even though `natural` is imported by 4 modules
+    built: list[str] = []
+    resolver.build(graph, lambda m: built.append(m.name))
+    resolver.build(resolver.resolve("math"), lambda m: built.append(m.name))
+
+    assert sorted(built) == sorted(graph.order)
+
+
+def test_resolve_parses_once(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    loaded: list[str] = []
+    load_module = imports.load_module
+
+    def counted_load_module(name: str, path: Path) -> imports.ImportedModule:
+        loaded.append(name)
+        return load_module(name, path)
+
+    monkeypatch.setattr(imports, "load_module", counted_load_module)
+
+    # `point` and `natural` are imported by `main` and by its other imports in the
+    # same frontier
+    resolver = ImportResolver(project)
+    graph = resolver.resolve()
+    resolver.resolve("math")
+
+    assert sorted(loaded) == sorted(graph.order)
+
+
+def test_resolve_cycle(project: Path) -> None:
+    _write(project, "hat_types/natural.hat", "use(type:geometry.line)")
+
+    assert isinstance(ImportResolver(project).resolve(), ImportCycleError)
+
+
+def test_resolve_not_found(project: Path) -> None:
+    _write(project, "math.hat", "use(type:complex)")
+
+    assert isinstance(ImportResolver(project).resolve(), ImportNotFoundError)
+
+
+def test_resolve_after_not_found(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    loaded: list[str] = []
+    load_module = imports.load_module
+
+    def counted_load_module(name: str, path: Path) -> imports.ImportedModule:
+        loaded.append(name)
+        return load_module(name, path)
+
+    monkeypatch.setattr(imports, "load_module", counted_load_module)
+    _write(project, "math.hat", "use(type:complex)")
+    resolver = ImportResolver(project)
+
+    assert isinstance(resolver.resolve(), ImportNotFoundError)
+    assert isinstance(resolver.resolve(), ImportNotFoundError)
+
+    _write(project, "hat_types/complex.hat", "type complex:u64")
+    graph = resolver.resolve()
+
+    assert graph.graph["math"] == ("hat_types.complex",)
+    assert graph.order[-1] == "main"
+
+    # modules loaded before the error are not loaded again
+    assert sorted(loaded) == sorted(graph.order)
+
+
+def test_resolve_entry_outside_src(project: Path) -> None:
+    outside = project / "other.hat"
+    outside.write_text("type other:u64")
+
+    assert isinstance(ImportResolver(project).resolve(outside), ImportNotFoundError)
+    assert ImportResolver(project).resolve(project / "src" / "math.hat").order[-1] == "math"
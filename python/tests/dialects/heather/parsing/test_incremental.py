@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pytest
+from arpeggio import NoMatch
+
+from hhat_lang.dialects.heather.parsing import incremental
+from hhat_lang.dialects.heather.parsing.incremental import IncrementalParser, split_toplevel
+
+CODE = """// sample
+use(type:point)
+fn sum (a:u64 b:u64) u64 { add(a b) }
+fn @sum (@a:@u3 @b:@u3) @u3 { @add(@a @b) }
+main {
+    print(sum(1 2))
+}
+"""
+
+
+def test_split_toplevel() -> None:
+    split = split_toplevel(CODE)
+
+    assert [rule for rule, _, _ in split] == ["imports", "fns", "fns", "main"]
+    assert CODE[split[1][1]:split[1][2]].startswith("fn sum")
+    assert split_toplevel("x " + CODE) is None
+
+
+@pytest.mark.parametrize(
+    "code, rules",
+    [
+        ("fn main () u64 { x() }", ["fns"]),
+        ("fn type (use:fn) main { fn(use) }\nmain { type(1 2) }", ["fns", "main"]),
+        ("type main:u64\ntype fn:[use]\ntype use { main:u64 }", ["type_file"] * 3),
+        ("type fn union { a:u64 }\ntype main:point.use", ["type_file"] * 2),
+    ]
+)
+def test_split_toplevel_keyword_names(code: str, rules: list[str]) -> None:
+    assert [rule for rule, _, _ in split_toplevel(code)] == rules
+
+    parser = IncrementalParser()
+    parser.parse(code)
+
+    assert [k.rule for k in parser.nodes] == rules
+
+
+def test_incremental_parse(monkeypatch: pytest.MonkeyPatch) -> None:
+    parse_to_tree = incremental.parse_to_tree
+    parsed: list[str] = []
+
+    def counting_parse_to_tree(code: str, root_rule: str = "program"):
+        parsed.append(root_rule)
+        return parse_to_tree(code, root_rule)
+
+    monkeypatch.setattr(incremental, "parse_to_tree", counting_parse_to_tree)
+
+    parser = IncrementalParser()
+    parser.parse(CODE)
+
+    assert parser.reparsed == 4 and parser.reused == 0
+    assert parsed == ["imports", "fns", "fns", "main"]
+
+    fns = parser.nodes[1]
+    start = CODE.index("print(sum(1 2))")
+    parsed.clear()
+    parser.edit(start, start + len("print(sum(1 2))"), "print(sum(3 4))")
+
+    assert parser.reparsed == 1 and parser.reused == 3
+    assert parsed == ["main"]
+    assert parser.nodes[1] is fns
+    assert "sum(3 4)" in parser.nodes[-1].text
+
+
+def test_incremental_parse_error() -> None:
+    parser = IncrementalParser()
+
+    with pytest.raises((ValueError, NoMatch)):
+        parser.parse("fn sum (a:u64 b:u64) u64 { add(a b) } }")
+
+    with pytest.raises((ValueError, NoMatch)):
+        parser.parse("main {} fn sum (a:u64 b:u64) u64 { add(a b) }")
+
+
+def test_incremental_parse_whole_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    code = CODE[CODE.index("fn sum"):]
+    expected = IncrementalParser()
+    expected.parse(code)
+
+    monkeypatch.setattr(incremental, "split_toplevel", lambda _code: None)
+    parser = IncrementalParser()
+    parser.parse(code)
+
+    assert parser.reparsed == 3 and parser.reused == 0
+    assert [(k.rule, k.start, k.end, k.text) for k in parser.nodes] == [
+        (k.rule, k.start, k.end, k.text) for k in expected.nodes
+    ]
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("fn @sum", "fn @sub"),
+        ("add(a b) }\nfn @sum", "add(a b) }\nfn @sum0 () @u3 { @add(@a) }\nfn @sum"),
+        ("main {", "fn x () u64 { x() }\nmain {"),
+    ]
+)
+def test_incremental_edit_same_as_parse(old: str, new: str) -> None:
+    parser = IncrementalParser()
+    parser.parse(CODE)
+    start = CODE.index(old)
+    parser.edit(start, start + len(old), new)
+
+    fresh = IncrementalParser()
+    fresh.parse(CODE.replace(old, new))
+
+    assert [(k.rule, k.start, k.end, k.text) for k in parser.nodes] == [
+        (k.rule, k.start, k.end, k.text) for k in fresh.nodes
+    ]
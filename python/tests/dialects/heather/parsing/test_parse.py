@@ -3,10 +3,16 @@ from __future__ import annotations
 import pytest
 from pathlib import Path
 
+from hhat_lang.dialects.heather.parsing.artifact import load_parser_artifact
 from hhat_lang.dialects.heather.parsing.run import (
+    _grammar_source,
+    build_parser_artifact,
+    get_parser,
+    grammar_hash,
     parse_grammar,
     parse,
     parse_file,
+    reset_parser_cache,
 )
 
 THIS = Path(__file__).parent
@@ -16,6 +22,16 @@ def test_parse_grammar() -> None:
     assert parse_grammar()
 
 
+def test_get_parser_cached() -> None:
+    reset_parser_cache()
+    parser = get_parser()
+
+    assert parser is get_parser()
+
+    reset_parser_cache()
+    assert parser is not get_parser()
+
+
 @pytest.mark.parametrize(
     "hat_file",
     ["ex_type01.hat", "ex_type02.hat"]
@@ -41,3 +57,15 @@ def test_parse_fn_sample_file(hat_file) -> None:
 def test_parse_main_sample_file(hat_file) -> None:
     hat_file = (THIS / hat_file).resolve()
     assert parse_file(hat_file)
+
+
+def test_parser_artifact(tmp_path: Path) -> None:
+    grammar, key = _grammar_source()
+    artifact = build_parser_artifact(tmp_path / "parser.pickle")
+    parser = load_parser_artifact(key, artifact)
+
+    assert parser is not None
+    assert parser.parse((THIS / "ex_fn01.hat").read_text())
+
+    # stale artifact, i.e. built from another grammar
+    assert load_parser_artifact(grammar_hash(grammar + "\n"), artifact) is None
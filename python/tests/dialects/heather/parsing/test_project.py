@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from hhat_lang.dialects.heather.parsing.cache import ASTCache
+from hhat_lang.dialects.heather.parsing.project import discover_files, parse_project
+from hhat_lang.toolchain.project.new import create_new_project, create_new_type_file
+
+THIS = Path(__file__).parent
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    project_path = tmp_path / "proj"
+    create_new_project(project_path)
+    (project_path / "src" / "main.hat").write_text((THIS / "ex_main02.hat").read_text())
+
+    for hat_file in ["ex_type01.hat", "ex_type02.hat"]:
+        create_new_type_file(project_path, Path(hat_file))
+        (project_path / "src" / "hat_types" / hat_file).write_text(
+            (THIS / hat_file).read_text()
+        )
+
+    return project_path
+
+
+def test_discover_files(project: Path) -> None:
+    files = discover_files(project)
+
+    assert set(files) == {"main", "hat_types.ex_type01", "hat_types.ex_type02"}
+    assert files["main"] == project / "src" / "main.hat"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_project(project: Path, workers: int) -> None:
+    res = parse_project(project, workers=workers)
+
+    assert set(res.asts) == set(discover_files(project))
+    assert set(res.timings) == set(res.asts)
+    assert all(k >= 0 for k in res.timings.values())
+    assert res.total_time > 0
+
+
+def test_parse_project_cache_size(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scans: list[Path] = []
+    entries = ASTCache._entries
+
+    def counted_entries(self: ASTCache) -> list[Path]:
+        scans.append(self.path)
+        return entries(self)
+
+    monkeypatch.setattr(ASTCache, "_entries", counted_entries)
+
+    # the cache folder is scanned for its size once, not once per file
+    parse_project(project, workers=1)
+
+    assert len(scans) == 1
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from qiskit import qasm2
+
+from hhat_lang.core.code.ir import TypeIR, InstrIRFlag
+from hhat_lang.core.data.core import Symbol, CoreLiteral
+from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.dialects.heather.code.simple_ir_builder.ir import FnIR, IRBlock, IRInstr, IRArgs
+from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
+from hhat_lang.low_level.quantum_lang.gate_list.gates import Gate, GateProgram
+from hhat_lang.low_level.quantum_lang.gate_list.qlang import GateListQLang
+from hhat_lang.low_level.target_backend.qiskit.gate_list.code_executor import to_circuit
+
+
+def test_gen_program_gates() -> None:
+    ql = CoreLiteral("@2", "@u2")
+
+    mem = MemoryManager(5)
+    mem.idx.add(ql, 2)
+    mem.idx.request(ql)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(ql), InstrIRFlag.CALL))
+
+    program = GateListQLang(ql, block, mem.idx, ex).gen_program()
+
+    assert isinstance(program, GateProgram) and program.num_idxs == 2
+    assert program.gates == [Gate("x", (1,)), Gate("h", (0,)), Gate("h", (1,))]
+    assert program.qasm() == """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+x q[1];
+h q[0];
+h q[1];
+measure q -> c;
+"""
+
+
+def test_to_circuit() -> None:
+    program = GateProgram(2, [Gate("reset", (0,)), Gate("h", (0,)), Gate("cx", (0, 1))])
+    circuit = to_circuit(program)
+
+    assert [k.operation.name for k in circuit.data] == ["reset", "h", "cx", "measure", "measure"]
+    assert circuit == qasm2.loads(program.qasm())
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+from typing import Any
+
+from hhat_lang.core.code.instructions import InstrRegistry, QInstr
 from hhat_lang.core.code.ir import TypeIR, InstrIRFlag
+from hhat_lang.core.code.utils import InstrStatus
 from hhat_lang.core.data.core import Symbol, CoreLiteral
+from hhat_lang.core.error_handlers.errors import InstrNotFoundError
 from hhat_lang.core.memory.core import MemoryManager
+from hhat_lang.core.types.builtin import QU3
+from hhat_lang.core.types.core import SingleDS
 from hhat_lang.dialects.heather.interpreter.classical.executor import Evaluator
 from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
     FnIR,
@@ -10,6 +17,7 @@ from hhat_lang.dialects.heather.code.simple_ir_builder.ir import (
     IRInstr,
     IRArgs,
 )
+from hhat_lang.low_level.quantum_lang.openqasm.v2.instructions import QASM2_INSTRS
 from hhat_lang.low_level.quantum_lang.openqasm.v2.qlang import LowLeveQLang
 
 
@@ -68,3 +76,149 @@ measure q -> c;
     res = qlang.gen_program()
     print(res)
     # assert res == code_snippet
+
+
+def test_gen_program_recycled_reset() -> None:
+    code_snippet = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[1];
+creg c[1];
+reset q[0];
+
+h q[0];
+measure q -> c;
+"""
+
+    qa, qb, qv = Symbol("@a"), Symbol("@b"), Symbol("@v")
+
+    # `@b` is consumed within the circuit, and `@v` reuses its index 1 as qubit 0
+    mem = MemoryManager(3)
+    mem.idx.add(qa, 1)
+    mem.idx.request(qa)
+    mem.idx.add(qb, 1)
+    mem.idx.request(qb)
+    mem.idx.recycle(qb)
+    mem.idx.add(qv, 1)
+    mem.idx.request(qv)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    qlang = LowLeveQLang(qv, block, mem.idx, ex)
+    res = qlang.gen_program()
+
+    assert res == code_snippet
+
+
+def test_gen_var_instr_log() -> None:
+    qv = Symbol("@v")
+
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 3)
+    mem.idx.request(qv)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    qtype = SingleDS(name=Symbol("@type"))
+    qtype.add_member(QU3)
+    qvar = qtype(CoreLiteral("@5", "@u3"), var_name=qv)
+    qvar.get().append(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL), operands=(1,))
+    mem.heap.set(qv, qvar)
+
+    qlang = LowLeveQLang(qv, IRBlock(), mem.idx, ex)
+
+    assert qlang.gen_var(qvar, ex) == ("x q[0];", "x q[2];", "h q[1];")
+
+
+def test_gen_instrs_registry() -> None:
+    registry = InstrRegistry()
+
+    @registry.register
+    class QFlip(QInstr):
+        name = "@flip"
+
+        def __call__(self, *, idxs: tuple[int, ...], **_kwargs: Any) -> tuple[tuple[str, ...], InstrStatus]:
+            return tuple(f"x q[{k}];" for k in idxs), InstrStatus.DONE
+
+    class FlipQLang(LowLeveQLang):
+        _instrs = registry
+
+    qv = Symbol("@v")
+
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 2)
+    mem.idx.request(qv)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    flip = IRInstr(Symbol("@flip"), IRArgs(), InstrIRFlag.CALL)
+    redim = IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL)
+
+    assert Symbol("@redim") in QASM2_INSTRS and "@flip" not in QASM2_INSTRS
+    assert registry.get(Symbol("@flip")) is registry.get("@flip") and list(registry) == ["@flip"]
+    assert FlipQLang(qv, IRBlock(), mem.idx, ex).gen_instrs(flip).result() == ("x q[0];", "x q[1];")
+    assert isinstance(FlipQLang(qv, IRBlock(), mem.idx, ex).gen_instrs(redim), InstrNotFoundError)
+    assert LowLeveQLang(qv, IRBlock(), mem.idx, ex).gen_instrs(redim).result() == ("h q[0];", "h q[1];")
+
+
+def test_emit_program(tmp_path) -> None:
+    code_snippet = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[1];
+creg c[1];
+
+h q[0];
+
+h q[0];
+measure q -> c;
+"""
+
+    qv = Symbol("@v")
+
+    mem = MemoryManager(5)
+    mem.idx.add(qv, 1)
+    mem.idx.request(qv)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    qlang = LowLeveQLang(qv, block, mem.idx, ex)
+    path = tmp_path / "program.qasm"
+
+    assert qlang.gen_program() == code_snippet
+    assert qlang.emit(path) == len(code_snippet)
+    assert path.read_text() == code_snippet
+
+
+def test_gen_program_relative_idxs() -> None:
+    code_snippet = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+
+h q[0];
+h q[1];
+measure q -> c;
+"""
+
+    qa, qv = Symbol("@a"), Symbol("@v")
+
+    mem = MemoryManager(5)
+    mem.idx.add(qa, 2)
+    mem.idx.request(qa)
+    mem.idx.add(qv, 2)
+    mem.idx.request(qv)
+
+    ex = Evaluator(mem, TypeIR(), FnIR())
+
+    block = IRBlock()
+    block.add_instr(IRInstr(Symbol("@redim"), IRArgs(), InstrIRFlag.CALL))
+
+    # `@v` holds memory indexes 2 and 3, lowered as the register qubits 0 and 1
+    assert tuple(mem.idx.in_use_by[qv]) == (2, 3)
+    assert LowLeveQLang(qv, block, mem.idx, ex).gen_program() == code_snippet
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from qiskit import QuantumCircuit
+from qiskit.transpiler import generate_preset_pass_manager
+from qiskit_aer import AerSimulator
+
+from hhat_lang.low_level.target_backend.qiskit.transpile_cache import (
+    TranspileCache,
+    circuit_key,
+    target_key,
+)
+
+
+def _circuit(qubit: int = 0, angle: float = 0.5) -> QuantumCircuit:
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(qubit)
+    circuit.rz(angle, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_circuit_key() -> None:
+    assert circuit_key(_circuit()) == circuit_key(_circuit())
+    assert circuit_key(_circuit()) != circuit_key(_circuit(qubit=1))
+    assert circuit_key(_circuit()) != circuit_key(_circuit(angle=0.25))
+    assert target_key("aer", 2, optimization_level=2) != target_key("aer", 2, optimization_level=1)
+
+
+def test_transpile_cache_lru() -> None:
+    pm = generate_preset_pass_manager(optimization_level=1, target=AerSimulator().target)
+    cache = TranspileCache(max_entries=1)
+
+    tcirc = cache.transpile(_circuit(), pm, "target")
+
+    assert cache.transpile(_circuit(), pm, "target") is tcirc
+    assert cache.transpile(_circuit(), pm, "other") is not tcirc
+    assert cache.transpile(_circuit(), pm, "target") is not tcirc
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 3, "evictions": 2, "entries": 1}
+
+
+def test_transpile_cache_disk(tmp_path) -> None:
+    pm = generate_preset_pass_manager(optimization_level=1, target=AerSimulator().target)
+    tcirc = TranspileCache(path=tmp_path).transpile(_circuit(), pm, "target")
+
+    cache = TranspileCache(path=tmp_path)
+
+    assert cache.get(circuit_key(_circuit()), "target") == tcirc
+    assert cache.hits == 1 and cache.misses == 0 and cache.stats()["disk_hits"] == 1
+
+    cache.clear()
+
+    assert cache.get(circuit_key(_circuit()), "target") is None and len(cache) == 0